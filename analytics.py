@@ -0,0 +1,203 @@
+"""Facilitator cohort analytics page.
+
+Renders only from the store's precomputed aggregates and quantile sketches,
+so the cost of a rerun does not grow with the number of stored respondents.
+"""
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from banks import SCORED_COMPONENTS, current_bank, get_bank
+from store import SCALE_BIN_WIDTH, TOTAL_BIN_WIDTH, bin_start
+
+QUANTILES = {"P10": 0.1, "P25": 0.25, "Median": 0.5, "P75": 0.75, "P90": 0.9}
+
+# Sub-score group prefix, dashboard title and the bank attribute ordering it.
+SUBDIM_GROUPS = [
+    ("mindset", "Mindset", "MINDSET_SUBDIMS"),
+    ("skills", "Skills", "SKILL_AREAS"),
+    ("resources", "Resources", "RESOURCE_SUBDIMS"),
+    ("acumen", "Entrepreneurship / Business Acumen", "ACUMEN_SUBDIMS"),
+]
+
+
+def metric_groups(metrics, bank):
+    """Dashboard groups of metric names. Subdims are listed in ``bank``'s
+    order, followed by any stored metrics it no longer has (renamed or
+    dropped in a later version), so no stored metric is hidden."""
+    groups = {"Total & components": ["total"] + list(SCORED_COMPONENTS)}
+    for prefix, title, attr in SUBDIM_GROUPS:
+        known = [f"{prefix}.{sd}" for sd in getattr(bank, attr)]
+        others = sorted(m for m in metrics if m.startswith(f"{prefix}.") and m not in known)
+        groups[title] = known + others
+    return groups
+
+
+_LABELS = {}
+
+
+def question_labels(bank):
+    """Map each answer key of ``bank`` to a readable prompt and, where known,
+    option texts. Built once per bank version."""
+    labels = _LABELS.get(bank.VERSION)
+    if labels is not None:
+        return labels
+    labels = {}
+    for questions in (bank.MINDSET_QUESTIONS, bank.SKILL_QUESTIONS, bank.ACUMEN_QUESTIONS):
+        for qid, q in questions.items():
+            labels[f"{qid}_choice"] = (q["prompt"], q["options"])
+    for sc in bank.OPP_SCENARIOS:
+        labels[sc["key"]] = (sc["text"], None)
+    for f in bank.VALUE_FEATURES:
+        labels[f["key"]] = (f["name"], None)
+    for key in list(bank.SKILL_SLIDER_MAP.values()) + list(bank.RESOURCE_LEVEL_KEYS.values()):
+        labels[key] = (key, None)
+    for key in bank.SUPPORT_KEYS:
+        labels[key] = (bank.SUPPORT_PROMPTS[key], None)
+    labels["res_time_pattern"] = ("Time pattern", None)
+    labels["sup_reaction"] = ("Typical reaction to an ambitious plan", None)
+    _LABELS[bank.VERSION] = labels
+    return labels
+
+
+def _version_bank(version):
+    """The compiled bank for a stored version, or None if this process has
+    never loaded it (or the responses predate versioning)."""
+    try:
+        return get_bank(version)
+    except KeyError:
+        return None
+
+
+def _version_label(version):
+    if version is None:
+        return "Before versioning"
+    bank = _version_bank(version)
+    return f"{bank.LABEL} ({version})" if bank is not None and bank.LABEL else version
+
+
+def _metric_label(metric):
+    if metric == "total":
+        return "Readiness score (0–100)"
+    return metric.split(".", 1)[1] if "." in metric else metric
+
+
+def render_analytics_page(aggregates, bank=None):
+    """``bank`` (default: the current one) orders the score groups."""
+    bank = bank or current_bank()
+    st.subheader("Cohort Analytics")
+    metrics = aggregates["metrics"]
+    n = metrics.get("total", (0, 0.0, 0.0))[0]
+    st.metric("Stored respondents", n)
+    if not n:
+        st.info("No submissions have been stored yet.")
+        return
+
+    st.metric("Mean readiness score", f"{metrics['total'][1]:.1f} / 100")
+
+    st.markdown("### Score Distributions")
+    groups = metric_groups(metrics, bank)
+    group = st.selectbox("Scores", list(groups), key="analytics_group")
+    group_metrics = [m for m in groups[group] if m in metrics]
+    scale_metrics = [m for m in group_metrics if m != "total"]
+    df_summary = pd.DataFrame({
+        "Metric": [_metric_label(m) for m in scale_metrics],
+        "Mean (1–5)": [round(metrics[m][1], 2) for m in scale_metrics],
+        "SD": [round(metrics[m][2], 2) for m in scale_metrics],
+        "N": [metrics[m][0] for m in scale_metrics],
+    })
+    chart = (
+        alt.Chart(df_summary)
+        .mark_bar()
+        .encode(
+            x=alt.X("Mean (1–5):Q", scale=alt.Scale(domain=[0, 5])),
+            y=alt.Y("Metric:N", sort="-x"),
+            tooltip=["Metric", "Mean (1–5)", "SD", "N"],
+        )
+        .properties(height=40 * len(scale_metrics) + 40)
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+    sketches = aggregates.get("sketches", {})
+    sketched = [m for m in group_metrics if m in sketches]
+    if sketched:
+        rows = []
+        for m in sketched:
+            row = {"Metric": _metric_label(m)}
+            row.update(zip(QUANTILES, (round(v, 2) for v in sketches[m].quantiles(QUANTILES.values()))))
+            rows.append(row)
+        st.caption("Quantiles (streaming estimates)")
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+    if not group_metrics:
+        st.info("No responses yet.")
+        return
+    metric = st.selectbox("Histogram", group_metrics, format_func=_metric_label, key="analytics_metric")
+    width = TOTAL_BIN_WIDTH if metric == "total" else SCALE_BIN_WIDTH
+    hist = aggregates["histograms"].get(metric, {})
+    df_hist = pd.DataFrame({
+        "From": [bin_start(metric, b) for b in sorted(hist)],
+        "To": [bin_start(metric, b) + width for b in sorted(hist)],
+        "Respondents": [hist[b] for b in sorted(hist)],
+    })
+    hist_chart = (
+        alt.Chart(df_hist)
+        .mark_bar()
+        .encode(
+            x=alt.X("From:Q", bin="binned", title=_metric_label(metric)),
+            x2="To:Q",
+            y=alt.Y("Respondents:Q"),
+            tooltip=["From", "To", "Respondents"],
+        )
+        .properties(height=260)
+    )
+    st.altair_chart(hist_chart, use_container_width=True)
+
+    st.markdown("### Answer Frequencies")
+    # Counts are per bank version: a choice index is only meaningful against
+    # the options of the version it was answered with.
+    by_version = aggregates["answers"]
+    if not by_version:
+        st.info("No responses yet.")
+        return
+    versions = sorted(by_version, key=lambda v: (v != bank.VERSION, v is None, v or ""))
+    version = versions[0]
+    if len(versions) > 1:
+        version = st.selectbox(
+            "Question bank version", versions, format_func=_version_label, key="analytics_version"
+        )
+    answers = by_version[version]
+    version_bank = _version_bank(version)
+    if version_bank is None:
+        st.caption("This server has not loaded that version; showing raw answer keys and values.")
+        labels = {k: (k, None) for k in sorted(answers)}
+    else:
+        labels = {k: v for k, v in question_labels(version_bank).items() if k in answers}
+    if not labels:
+        st.info("No responses yet.")
+        return
+    key = st.selectbox(
+        "Question",
+        list(labels),
+        format_func=lambda k: labels[k][0],
+        key="analytics_question",
+    )
+    prompt, options = labels[key]
+    counts = answers[key]
+    if options is not None:
+        rows = [(options[i], counts.get(i, 0)) for i in range(len(options))]
+    else:
+        rows = sorted(((str(v), c) for v, c in counts.items()), key=lambda r: r[0])
+    df_freq = pd.DataFrame(rows, columns=["Answer", "Count"])
+    freq_chart = (
+        alt.Chart(df_freq)
+        .mark_bar()
+        .encode(
+            x=alt.X("Count:Q"),
+            y=alt.Y("Answer:N", sort=None),
+            tooltip=["Answer", "Count"],
+        )
+        .properties(height=40 * len(rows) + 40)
+    )
+    st.altair_chart(freq_chart, use_container_width=True)
@@ -0,0 +1,153 @@
+"""Compact per-session answer storage.
+
+All of a participant's answers live in one ``array('b')``: one signed byte
+per answer key (at a fixed ordinal precomputed from the banks) followed by
+the shuffled option order of every multiple-choice question. A session
+therefore holds a single small buffer instead of dozens of session-state
+keys, and snapshotting it is one ``bytes(buf)`` copy. The layout depends on
+the bank version, so a buffer is always read with the bank its session is
+pinned to.
+
+:class:`PackedAnswers` is a read-only ``Mapping`` view keyed by the same state
+keys as before (``opp_N``, ``{qid}_choice``, ``res_time_pattern``, ...), so
+the scorers read it exactly like ``st.session_state`` or a stored dict.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+from banks import BANK
+
+UNSET = -1
+
+
+class Layout:
+    """Slot positions for one bank version.
+
+    Flags are always present (0/1); choices, levels and options use UNSET for
+    "not answered", which reads back as a missing key. Option orders follow the
+    answer slots, one byte per option.
+    """
+
+    def __init__(self, bank):
+        self.flag_keys = frozenset(
+            [sc["key"] for sc in bank.OPP_SCENARIOS]
+            + [f["key"] for f in bank.VALUE_FEATURES]
+            + list(bank.SUPPORT_KEYS)
+        )
+        self.option_labels = {
+            "res_time_pattern": list(bank.TIME_PATTERN_SCORES),
+            "sup_reaction": list(bank.SUPPORT_REACTION_SCORES),
+        }
+        self.slots = {key: i for i, key in enumerate(bank.ANSWER_KEYS)}
+        self.n_slots = len(self.slots)
+
+        self.order_offsets = {}
+        offset = self.n_slots
+        for qbank in (bank.MINDSET_QUESTIONS, bank.SKILL_QUESTIONS, bank.ACUMEN_QUESTIONS):
+            for qid, q in qbank.items():
+                self.order_offsets[qid] = (offset, len(q["options"]))
+                offset += len(q["options"])
+        self.size = offset
+
+        self.template = array("b", [UNSET]) * self.size
+        for key in self.flag_keys:
+            self.template[self.slots[key]] = 0
+        # Resource levels start at the sliders' middle position.
+        for key in bank.RESOURCE_LEVEL_KEYS.values():
+            self.template[self.slots[key]] = 3
+
+
+_LAYOUTS = {}
+
+
+def layout_for(bank=None):
+    bank = bank or BANK
+    layout = _LAYOUTS.get(bank.VERSION)
+    if layout is None:
+        layout = _LAYOUTS.setdefault(bank.VERSION, Layout(bank))
+    return layout
+
+
+def new_buffer(bank=None):
+    """A fresh buffer with the app's defaults (resource levels at 3)."""
+    return array("b", layout_for(bank).template)
+
+
+class PackedAnswers(Mapping):
+    """Mapping view over a packed answer buffer."""
+
+    __slots__ = ("buf", "layout")
+
+    def __init__(self, buf=None, bank=None):
+        self.layout = layout_for(bank)
+        self.buf = array("b", self.layout.template) if buf is None else buf
+
+    @classmethod
+    def from_bytes(cls, data, bank=None):
+        return cls(array("b", data), bank)
+
+    # ---- Mapping interface ----
+
+    def __getitem__(self, key):
+        layout = self.layout
+        raw = self.buf[layout.slots[key]]
+        if key in layout.flag_keys:
+            return bool(raw)
+        if raw == UNSET:
+            raise KeyError(key)
+        if key in layout.option_labels:
+            return layout.option_labels[key][raw]
+        return raw
+
+    def __iter__(self):
+        for key, slot in self.layout.slots.items():
+            if key in self.layout.flag_keys or self.buf[slot] != UNSET:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        slot = self.layout.slots.get(key)
+        if slot is None:
+            return False
+        return key in self.layout.flag_keys or self.buf[slot] != UNSET
+
+    # ---- writers ----
+
+    def set(self, key, value):
+        layout = self.layout
+        slot = layout.slots[key]
+        if key in layout.flag_keys:
+            self.buf[slot] = 1 if value else 0
+        elif value is None:
+            self.buf[slot] = UNSET
+        elif key in layout.option_labels:
+            self.buf[slot] = layout.option_labels[key].index(value)
+        else:
+            self.buf[slot] = int(value)
+
+    def toggle(self, key):
+        self.buf[self.layout.slots[key]] ^= 1
+
+    def order(self, qid):
+        """The stored option order for ``qid``, or None if not shuffled yet."""
+        start, n = self.layout.order_offsets[qid]
+        if self.buf[start] == UNSET:
+            return None
+        return self.buf[start:start + n].tolist()
+
+    def set_order(self, qid, order):
+        start, n = self.layout.order_offsets[qid]
+        self.buf[start:start + n] = array("b", order)
+
+    # ---- serialisation ----
+
+    def snapshot(self):
+        """Answers and orders as bytes (one copy of the buffer)."""
+        return self.buf.tobytes()
+
+    def answer_bytes(self):
+        """Just the answer slots, e.g. as a cache key for scoring."""
+        return self.buf[:self.layout.n_slots].tobytes()
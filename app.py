@@ -1,599 +1,86 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-import random
+import os
+import threading
+import uuid
+from array import array
+
+import instrumentation
+from answer_buffer import PackedAnswers, layout_for, new_buffer
+from banks import current_bank, get_bank
+from norms import MIN_NORM_GROUP, Norms, ordinal
+from orders import perm_rank, session_order
+from reports import ReportRenderer
+from scoring import (
+    IncrementalScorer,
+    compute_overall_scores,
+    extract_answers,
+    readiness_label,
+    suggestion_for_user,
+)
+from sessions import SessionStore, new_token, pack_session
+from store import ResponseStore, StoreClosed, tenant_db_path, valid_tenant
+
+instrumentation.start_rerun()
+
+# How multiple-choice questions render: "buttons" (one card per option) or
+# "radio" (one widget per question, far fewer elements on the long pages).
+CHOICE_STYLE = os.environ.get("READINESS_CHOICE_STYLE", "buttons")
+
+# Seconds between refreshes of the facilitator analytics view.
+LIVE_REFRESH = float(os.environ.get("READINESS_LIVE_REFRESH", "5"))
+
+# Response stores (one writer thread and connection each) kept open at once;
+# the least recently used tenant's store is closed beyond this.
+MAX_OPEN_STORES = int(os.environ.get("READINESS_MAX_OPEN_STORES", "32"))
 
 st.set_page_config(
     page_title="Entrepreneurial Readiness Simulation",
     layout="wide"
 )
 
-# ============== GLOBAL CONSTANTS ==============
-
-COMPONENTS = [
-    "Entrepreneurial Mindset",
-    "Entrepreneurial Skills",
-    "Resource Availability",
-    "Entrepreneurship / Business Acumen",
-]
-COMP_WEIGHTS = {c: 25 for c in COMPONENTS}
-
-MINDSET_SUBDIMS = [
-    "Opportunity Recognition",
-    "Resourcefulness",
-    "Execution Bias",
-    "Resilience & Adaptability",
-    "Value Creation Focus",
-]
-MINDSET_DESCRIPTIONS = {
-    "Opportunity Recognition": "Seeing unmet needs, behavior gaps, and potential value before others.",
-    "Resourcefulness": "Creatively acquiring, leveraging, and recombining limited resources.",
-    "Execution Bias": "Moving quickly, testing, iterating, and deciding with incomplete information.",
-    "Resilience & Adaptability": "Staying steady and adjusting intelligently when conditions change.",
-    "Value Creation Focus": "Prioritizing customers, real problems, and business impact over ego or ideas.",
-}
-
-# ============== GAME 1: CUSTOMER SIGNAL CARDS ==============
-
-OPP_SCENARIOS = [
-    {
-        "key": "opp_1",
-        "text": "20% of users export data weekly to fix errors via a manual spreadsheet workaround.",
-        "is_opportunity": True,
-    },
-    {
-        "key": "opp_2",
-        "text": "Several users comment that they would like a dark mode theme someday.",
-        "is_opportunity": False,
-    },
-    {
-        "key": "opp_3",
-        "text": "40% of users start a key workflow but never finish it.",
-        "is_opportunity": True,
-    },
-    {
-        "key": "opp_4",
-        "text": "Your product gets lots of social media likes but modest repeat usage.",
-        "is_opportunity": False,
-    },
-    {
-        "key": "opp_5",
-        "text": "Prospects say they’d “maybe use an app like this in the future.”",
-        "is_opportunity": False,
-    },
-    {
-        "key": "opp_6",
-        "text": "Support tickets repeatedly mention the same bug that forces people to redo work.",
-        "is_opportunity": True,
-    },
-    {
-        "key": "opp_7",
-        "text": "Several customers build their own scripts or integrations to work around missing functionality.",
-        "is_opportunity": True,
-    },
-    {
-        "key": "opp_8",
-        "text": "A blog post about your space gets traffic, but almost nobody tries the product.",
-        "is_opportunity": False,
-    },
-    {
-        "key": "opp_9",
-        "text": "You have a growing waitlist of people regularly following up asking when they can get access.",
-        "is_opportunity": True,
-    },
-    {
-        "key": "opp_10",
-        "text": "Conference attendees say your booth was 'interesting', but few accept a follow-up call.",
-        "is_opportunity": False,
-    },
-]
-
+# ============== SESSION STATE ==============
 
-def compute_opportunity_score():
-    tp = fp = fn = 0
-    for sc in OPP_SCENARIOS:
-        selected = st.session_state.get(sc["key"], False)
-        if sc["is_opportunity"]:
-            if selected:
-                tp += 1
-            else:
-                fn += 1
-        else:
-            if selected:
-                fp += 1
-    total_true = sum(1 for s in OPP_SCENARIOS if s["is_opportunity"])
-    if total_true == 0:
-        return 1.0
-    raw = tp - 0.5 * fp - fn
-    max_raw = total_true
-    norm = max(0.0, min(1.0, raw / max_raw))
-    return round(1 + 4 * norm, 2)
-
-# ============== GAME 5: FEATURE BUDGET (SELECT FEATURES ONLY) ==============
-
-FEATURE_BUDGET = 20  # total cost budget (cannot exceed)
-
-# A & G most important; then C/E; others much lower
-VALUE_FEATURES = [
-    {
-        "key": "feat_a",
-        "name": "Remove a bug causing 25% of users to abandon onboarding.",
-        "cost": 7,
-        "ideal_points": 5,
-    },
-    {
-        "key": "feat_b",
-        "name": "Add a dashboard theme option.",
-        "cost": 3,
-        "ideal_points": 1,
-    },
-    {
-        "key": "feat_c",
-        "name": "Add a guided checklist that helps new users complete the core workflow in their first session.",
-        "cost": 6,
-        "ideal_points": 4,
-    },
-    {
-        "key": "feat_d",
-        "name": "Ship an idea with no demand signals yet.",
-        "cost": 5,
-        "ideal_points": 1,
-    },
-    {
-        "key": "feat_e",
-        "name": "Run a small pilot with 10 ideal customers, including onboarding and follow-up.",
-        "cost": 6,
-        "ideal_points": 4,
-    },
-    {
-        "key": "feat_f",
-        "name": "Polish minor UI details that only existing power users occasionally notice.",
-        "cost": 2,
-        "ideal_points": 2,
-    },
-    {
-        "key": "feat_g",
-        "name": "Add instrumentation to capture where users drop off in key journeys.",
-        "cost": 4,
-        "ideal_points": 5,
-    },
-]
 
+@st.cache_resource
+def get_session_store():
+    return SessionStore()
 
-def compute_value_creation_score():
-    selected = [f for f in VALUE_FEATURES if st.session_state.get(f["key"], False)]
-    if not selected:
-        return 1.0
-    selected_value = sum(f["ideal_points"] for f in selected)
-    max_possible = sum(f["ideal_points"] for f in VALUE_FEATURES)
-    norm = max(0.0, min(1.0, selected_value / max_possible))
-    return round(1 + 4 * norm, 2)
-
-# ============== MINDSET GAMES 2–4 ==============
-
-MINDSET_QUESTIONS = {
-    # Resourcefulness – Game 2
-    "ms_res_1": {
-        "subdim": "Resourcefulness",
-        "prompt": "You need to understand why users churn, but have zero budget. What do you actually do first?",
-        "options": [
-            "Use existing signals (reviews, support tickets) and talk directly to a few churned users.",
-            "Wait until you have budget for a formal study.",
-            "Ask friends what they think about churn in general.",
-            "Search online for articles and case studies about churn before talking to anyone.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "ms_res_2": {
-        "subdim": "Resourcefulness",
-        "prompt": "You must launch a landing page today, but there’s no designer available.",
-        "options": [
-            "Use a no-code template tool and ship something basic.",
-            "Wait for a designer so it looks polished.",
-            "Write copy now and wait for design time later.",
-            "Mock it up in a slide deck and send screenshots only.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "ms_res_3": {
-        "subdim": "Resourcefulness",
-        "prompt": "You need to test a new feature idea and have no engineering time.",
-        "options": [
-            "Create a simple clickable mockup or fake-door test.",
-            "Wait until engineers have time to build it properly.",
-            "Write a long spec and share internally for feedback.",
-            "Look at similar tools and treat the idea as validated if they exist.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "ms_res_4": {
-        "subdim": "Resourcefulness",
-        "prompt": "You only have access to 10 potential users for early testing.",
-        "options": [
-            "Run deep interviews and observe their workflows.",
-            "Run a big quantitative survey with them.",
-            "Don’t test until you have a bigger audience.",
-            "Read industry reports instead of talking to them.",
-        ],
-        "scores": [5, 3, 1, 2],
-    },
-    # Execution bias – Game 3
-    "ms_exec_1": {
-        "subdim": "Execution Bias",
-        "prompt": "You have one afternoon to de-risk a new idea. What do you actually do?",
-        "options": [
-            "Run 5 quick user calls or a simple landing test.",
-            "Write a 20-page strategy doc mapping the next 2 years.",
-            "Brainstorm names and design a logo.",
-            "Search online for examples and save them into a doc without contacting anyone.",
-        ],
-        "scores": [5, 1, 2, 2],
-    },
-    "ms_exec_2": {
-        "subdim": "Execution Bias",
-        "prompt": "You want to test interest in a potential feature. What’s your next step?",
-        "options": [
-            "Add a 'coming soon' button and track clicks plus follow-up.",
-            "Build the full feature and launch quietly.",
-            "Survey friends who are not in your target segment.",
-            "Look at similar tools and treat that as enough validation.",
-        ],
-        "scores": [5, 2, 1, 2],
-    },
-    "ms_exec_3": {
-        "subdim": "Execution Bias",
-        "prompt": "You’re unsure between two target segments. How do you proceed?",
-        "options": [
-            "Run two tiny tests in parallel and compare response.",
-            "Pick one based purely on your intuition.",
-            "Wait until you can do a full market study.",
-            "Ask someone experienced which segment sounds more promising and choose that.",
-        ],
-        "scores": [5, 2, 1, 3],
-    },
-    "ms_exec_4": {
-        "subdim": "Execution Bias",
-        "prompt": "You’ve designed an experiment; results are noisy but lean one way. What do you do?",
-        "options": [
-            "Make a small decision in the direction of the signal and keep testing.",
-            "Ignore it and wait for perfectly clear signal.",
-            "Restart from scratch with a totally different idea.",
-            "Ask an advisor whether they think you should trust the data.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "ms_exec_5": {
-        "subdim": "Execution Bias",
-        "prompt": "A teammate suggests a quick test that could kill your favorite idea. Your move?",
-        "options": [
-            "Run the test and be ready to pivot if it fails.",
-            "Avoid the test; you don’t want to lose the idea.",
-            "Delay the test until after other work is finished.",
-            "Ask an advisor whether it is worth testing at all.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    # Resilience & adaptability – Game 4
-    "ms_resil_1": {
-        "subdim": "Resilience & Adaptability",
-        "prompt": "Shock: A contractor delays a deliverable by 3 days. What do you do?",
-        "options": [
-            "Do nothing and simply push the timeline back.",
-            "Replace the contractor entirely.",
-            "Re-scope the sprint and adjust dependent work.",
-        ],
-        "scores": [1, 2, 5],
-    },
-    "ms_resil_2": {
-        "subdim": "Resilience & Adaptability",
-        "prompt": "Shock: Your acquisition cost jumps 40% overnight.",
-        "options": [
-            "Keep campaigns running and see what happens.",
-            "Kill all paid channels immediately.",
-            "Shift spend, test new creatives, and review funnel quality.",
-        ],
-        "scores": [1, 2, 5],
-    },
-    "ms_resil_3": {
-        "subdim": "Resilience & Adaptability",
-        "prompt": "Shock: A competitor suddenly drops prices by 70% in your space.",
-        "options": [
-            "Keep your current pricing and ignore it.",
-            "Lower price slightly and hope to keep up.",
-            "Refocus on a segment or offer where you compete on value, not price.",
-        ],
-        "scores": [1, 2, 5],
-    },
-}
-
-RESOURCEFULNESS_QIDS = ["ms_res_1", "ms_res_2", "ms_res_3", "ms_res_4"]
-EXEC_QIDS = [qid for qid, q in MINDSET_QUESTIONS.items() if q["subdim"] == "Execution Bias"]
-RESIL_QIDS = ["ms_resil_1", "ms_resil_2", "ms_resil_3"]
-
-# ============== SKILLS GAME ==============
-
-SKILL_AREAS = [
-    "Market Research & Marketing",
-    "Operations",
-    "Financial Management",
-    "Product & Technical",
-    "Sales & Networking",
-    "Team & Strategy",
-]
-SKILL_DESCRIPTIONS = {
-    "Market Research & Marketing": "Finding, understanding, and reaching the right customers.",
-    "Operations": "Designing and running reliable processes and delivery.",
-    "Financial Management": "Budgeting, runway, unit economics, and trade-offs.",
-    "Product & Technical": "Designing and building solutions users can actually use.",
-    "Sales & Networking": "Selling value and building relationships that move things forward.",
-    "Team & Strategy": "Aligning people and priorities toward a coherent direction.",
-}
-
-SKILL_QUESTIONS = {
-    "sk_mkt_1": {
-        "skill": "Market Research & Marketing",
-        "prompt": "Trial users aren’t converting. What do you do first?",
-        "options": [
-            "Interview 5–10 recent trial users about their decision.",
-            "Run a broad online survey with anyone you can find.",
-            "Change the homepage headline based on your intuition.",
-            "Read marketing articles instead of talking to users.",
-        ],
-        "scores": [5, 2, 1, 2],
-    },
-    "sk_mkt_2": {
-        "skill": "Market Research & Marketing",
-        "prompt": "You want to identify the best early adopters. What’s your move?",
-        "options": [
-            "Find a niche where the pain is sharp and design messaging just for them.",
-            "Target everyone with the same message.",
-            "Copy a competitor’s positioning.",
-            "Ask an advisor who they think sounds more exciting.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "sk_prod_1": {
-        "skill": "Product & Technical",
-        "prompt": "You can only ship one change this sprint. Which do you choose?",
-        "options": [
-            "A fix for a bug that blocks a key workflow.",
-            "A 'nice to have' that a few users casually mentioned.",
-            "A flashy new thing that will look good in demos.",
-            "Ask an advisor for ideas and wait.",
-        ],
-        "scores": [5, 2, 3, 1],
-    },
-    "sk_prod_2": {
-        "skill": "Product & Technical",
-        "prompt": "You’re unsure whether a design is intuitive. What do you do?",
-        "options": [
-            "Do 5 quick usability tests with target users.",
-            "Ship it now; you’ll hear complaints if it’s bad.",
-            "Ask your team what they think.",
-            "Search for design patterns and copy one without testing.",
-        ],
-        "scores": [5, 1, 3, 2],
-    },
-    "sk_sales_1": {
-        "skill": "Sales & Networking",
-        "prompt": "You have 10 warm leads and limited time. What’s your approach?",
-        "options": [
-            "Send tailored messages and schedule 1:1 conversations.",
-            "Send a broad email blast and hope some respond.",
-            "Post about your product on social media instead.",
-            "Ask an advisor which lead to start with but delay outreach.",
-        ],
-        "scores": [5, 2, 1, 2],
-    },
-    "sk_sales_2": {
-        "skill": "Sales & Networking",
-        "prompt": "You meet someone who might be a great partner. What’s your next step?",
-        "options": [
-            "Suggest a small, concrete next step (intro, pilot, shared experiment).",
-            "Ask for a big commitment immediately.",
-            "Wait to see if they reach out to you.",
-            "Send them a deck without a clear ask.",
-        ],
-        "scores": [5, 1, 2, 2],
-    },
-    "sk_fin_1": {
-        "skill": "Financial Management",
-        "prompt": "You have 3 months of runway left. What do you prioritize?",
-        "options": [
-            "Identify and cut low-ROI spend while doubling down on proven channels.",
-            "Cut all spending, including things that fuel growth.",
-            "Ignore runway and focus purely on product polish.",
-            "Ask an advisor if they think you should be worried.",
-        ],
-        "scores": [5, 2, 1, 2],
-    },
-    "sk_fin_2": {
-        "skill": "Financial Management",
-        "prompt": "Your CAC is higher than expected but customers who close stay for years.",
-        "options": [
-            "Check payback period and LTV, then decide how much you can afford to spend.",
-            "Shut off acquisition until CAC is lower.",
-            "Ignore the numbers and focus on top-line growth.",
-            "Search benchmarks and treat them as an exact template without checking your own numbers.",
-        ],
-        "scores": [5, 2, 1, 2],
-    },
-    "sk_ops_1": {
-        "skill": "Operations",
-        "prompt": "Support tickets are piling up. What’s your first move?",
-        "options": [
-            "Look for patterns and fix the top root causes.",
-            "Hire more people immediately.",
-            "Tell the team to 'work harder' this week.",
-            "Ask an advisor if they think you need more staff.",
-        ],
-        "scores": [5, 2, 1, 2],
-    },
-    "sk_ops_2": {
-        "skill": "Operations",
-        "prompt": "A process works but only you know how to do it. What now?",
-        "options": [
-            "Document it and train someone else so it’s repeatable.",
-            "Keep doing it yourself to save time.",
-            "Pause the process entirely.",
-            "Record a quick video and hope people figure it out.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "sk_team_1": {
-        "skill": "Team & Strategy",
-        "prompt": "Traction is flat but a subset of users loves one use-case. What now?",
-        "options": [
-            "Focus your roadmap and messaging on the use-case that’s working.",
-            "Keep trying to serve everyone with the same product.",
-            "Pause all changes while you think about a new idea.",
-            "Ask an advisor whether the niche is 'big enough'.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-    "sk_team_2": {
-        "skill": "Team & Strategy",
-        "prompt": "Your team is busy, but progress on key metrics is slow.",
-        "options": [
-            "Narrow focus to a small number of high-leverage bets.",
-            "Add more projects so nobody is idle.",
-            "Let each person pick whatever they want to work on.",
-            "Share a productivity framework and hope habits shift.",
-        ],
-        "scores": [5, 1, 2, 3],
-    },
-}
-
-SKILL_SLIDER_MAP = {
-    "Market Research & Marketing": "s_skill_mkt",
-    "Operations": "s_skill_ops",
-    "Financial Management": "s_skill_fin",
-    "Product & Technical": "s_skill_prod",
-    "Sales & Networking": "s_skill_sales",
-    "Team & Strategy": "s_skill_team",
-}
-
-SKILL_SCENARIO_MAP = {
-    "Market Research & Marketing": ["sk_mkt_1", "sk_mkt_2"],
-    "Operations": ["sk_ops_1", "sk_ops_2"],
-    "Financial Management": ["sk_fin_1", "sk_fin_2"],
-    "Product & Technical": ["sk_prod_1", "sk_prod_2"],
-    "Sales & Networking": ["sk_sales_1", "sk_sales_2"],
-    "Team & Strategy": ["sk_team_1", "sk_team_2"],
-}
-
-# ============== RESOURCES ==============
-
-RESOURCE_SUBDIMS = [
-    "Financial Resources",
-    "Technology & Infrastructure",
-    "Talent / Team",
-    "Network",
-    "Time",
-    "Support",
-]
-RESOURCE_DESCRIPTIONS = {
-    "Financial Resources": "Cash, savings, or funding you could realistically apply to a venture.",
-    "Technology & Infrastructure": "Access to tools, platforms, or infrastructure to build and deliver.",
-    "Talent / Team": "People you could involve: co-founders, employees, freelancers, or advisors.",
-    "Network": "Connections to customers, partners, mentors, or gatekeepers.",
-    "Time": "Hours per week you can reliably invest.",
-    "Support": "Emotional and practical support for ambitious goals.",
-}
-
-# ============== ACUMEN QUIZ ==============
-
-ACUMEN_SUBDIMS = [
-    "Problem–Solution Fit",
-    "Market Viability",
-    "Business Model Soundness",
-    "Go-to-Market Readiness",
-    "Operational Feasibility",
-    "Scalability Potential",
-]
-ACUMEN_DESCRIPTIONS = {
-    "Problem–Solution Fit": "Real, urgent customer problem + clear solution that addresses it.",
-    "Market Viability": "Defined target segment, reachable customers, credible demand, differentiation.",
-    "Business Model Soundness": "Pricing, unit economics, cost structure, and path to profitability.",
-    "Go-to-Market Readiness": "Validated channels, messaging, acquisition strategy.",
-    "Operational Feasibility": "Ability to deliver reliably given tech, supply, and processes.",
-    "Scalability Potential": "Model, market, and operations can grow without breaking.",
-}
-
-ACUMEN_QUESTIONS = {
-    "ac_ps_fit": {
-        "subdim": "Problem–Solution Fit",
-        "prompt": "Which signal shows the strongest evidence that you’re solving a real problem?",
-        "options": [
-            "People say your idea is 'cool' in casual conversation.",
-            "A segment of users repeatedly describes the same painful problem you address.",
-            "Your landing page has a high click-through rate from ads.",
-        ],
-        "scores": [2, 5, 3],
-    },
-    "ac_ps_fit_2": {
-        "subdim": "Problem–Solution Fit",
-        "prompt": "You hear different problems from different users. What’s your next step?",
-        "options": [
-            "Pick the problem you personally like most.",
-            "Cluster users by similar jobs and pains, and focus on one tight group first.",
-            "Try to build a product that solves all of them at once.",
-        ],
-        "scores": [2, 5, 1],
-    },
-    "ac_market": {
-        "subdim": "Market Viability",
-        "prompt": "Which of these situations is most promising?",
-        "options": [
-            "Huge possible market, but you don’t know who to target first.",
-            "A smaller, clearly defined group you can reliably reach.",
-            "A big market with many competitors and no clear angle.",
-        ],
-        "scores": [3, 5, 2],
-    },
-    "ac_model": {
-        "subdim": "Business Model Soundness",
-        "prompt": "Which model is healthiest over time?",
-        "options": [
-            "High price point, but each customer costs more to serve than they pay.",
-            "Moderate price, high margin, and a clear path to repeat purchases.",
-            "Low price, unclear costs, and no idea how many customers you need.",
-        ],
-        "scores": [1, 5, 2],
-    },
-    "ac_gtm": {
-        "subdim": "Go-to-Market Readiness",
-        "prompt": "Which description sounds most ready to scale acquisition?",
-        "options": [
-            "You plan to grow mostly through word-of-mouth, but have no path to your first customers.",
-            "You’ve tested a few acquisition channels and have one that reliably brings leads.",
-            "You plan to 'go viral' but have no specific channels mapped.",
-        ],
-        "scores": [1, 5, 1],
-    },
-    "ac_ops": {
-        "subdim": "Operational Feasibility",
-        "prompt": "Which setup is most likely to deliver consistently?",
-        "options": [
-            "You rely on a manual process only you understand.",
-            "You have documented processes and can train others to deliver.",
-            "You plan to figure out delivery later once demand shows up.",
-        ],
-        "scores": [2, 5, 1],
-    },
-    "ac_scale": {
-        "subdim": "Scalability Potential",
-        "prompt": "Which of these scales best?",
-        "options": [
-            "Each new customer requires a lot of custom work from you.",
-            "Most of the value is delivered through software or repeatable systems.",
-            "You depend on rare, highly specialized human talent for every deal.",
-        ],
-        "scores": [2, 5, 1],
-    },
-}
 
-# ============== SESSION STATE ==============
+def restore_snapshot(token):
+    """Session-state values saved under ``token``, or None if there is no
+    usable snapshot (expired, already claimed, or for a bank version this
+    process lacks). The snapshot is consumed either way."""
+    restored = get_session_store().claim(token)
+    if restored is None:
+        return None
+    try:
+        layout = layout_for(get_bank(restored["bank_version"]))
+    except KeyError:
+        return None
+    if len(restored["answers"]) != layout.size:
+        return None
+    restored["answers"] = array("b", restored["answers"])
+    return restored
+
+
+# A new session whose URL carries a resume token (a reconnect after the tab
+# dropped) starts from that token's snapshot, then carries on under a fresh
+# token, since claiming the snapshot used the old one up. A fresh session
+# keeps its token out of the URL until go_to() first snapshots under it.
+if "resume_token" not in st.session_state:
+    claimed = st.query_params.get("resume")
+    restored = restore_snapshot(claimed) if claimed else None
+    token = new_token()
+    st.session_state.resume_token = token
+    if restored:
+        st.session_state.update(restored)
+        get_session_store().save(token, pack_session(
+            restored["session_id"], restored["bank_version"], restored["page"], restored["max_page"],
+            restored["res_q_idx"], restored["submitted"], restored["answers"].tobytes(),
+        ))
+        st.query_params["resume"] = token
+    elif claimed:
+        del st.query_params["resume"]
 
 if "page" not in st.session_state:
     st.session_state.page = 0
@@ -603,55 +90,260 @@ if "submitted" not in st.session_state:
     st.session_state.submitted = False
 if "res_q_idx" not in st.session_state:
     st.session_state.res_q_idx = 0
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+
+# A session keeps the question-bank version it started with, even if the
+# content file is edited (and hot-reloaded) while it is in progress.
+if "bank_version" not in st.session_state:
+    st.session_state.bank_version = current_bank().VERSION
+bank = get_bank(st.session_state.bank_version)
+
+# All answers and option orders live in one packed buffer (see answer_buffer.py),
+# which also carries the resource-level defaults.
+if "answers" not in st.session_state:
+    st.session_state.answers = new_buffer(bank)
+
+
+def session_answers():
+    return PackedAnswers(st.session_state.answers, get_bank(st.session_state.bank_version))
+
+
+answers = session_answers()
+
+# Coaching mode (?coach=1) shows running component scores in the sidebar.
+# They are kept up to date incrementally by the answer callbacks, so only
+# sessions in coaching mode carry a scorer at all.
+coach_mode = st.query_params.get("coach") == "1"
+if coach_mode and "live_scores" not in st.session_state:
+    st.session_state.live_scores = IncrementalScorer(answers, bank)
+
+
+# Cohort mode (?cohort=<id>) stores submissions in that tenant's own database.
+# The id is pinned at session start; question banks and scoring tables stay
+# shared by every tenant in the process.
+if "tenant" not in st.session_state:
+    st.session_state.tenant = st.query_params.get("cohort", "").strip().lower() or None
+tenant = st.session_state.tenant
+if tenant is not None and not valid_tenant(tenant):
+    st.error("This link has an invalid cohort id. Please check the URL with your facilitator.")
+    st.stop()
+
+
+def release_response_store(store):
+    # close() waits for the writer to commit what is queued; keep that off
+    # the script run that happened to evict the store.
+    threading.Thread(target=store.close, name="response-store-close", daemon=True).start()
+
+
+@st.cache_resource(
+    max_entries=MAX_OPEN_STORES,
+    on_release=release_response_store,
+    validate=lambda store: not store.closed,
+)
+def get_response_store(tenant=None):
+    return ResponseStore(tenant_db_path(tenant))
+
+
+def record_submission():
+    submitted = extract_answers(answers, bank)
+    orders = {}
+    for qid in answers.layout.order_offsets:
+        order = answers.order(qid)
+        if order is not None:
+            orders[qid] = perm_rank(order)
+    result = compute_overall_scores(submitted, bank)
+    for attempt in range(2):
+        try:
+            get_response_store(tenant).submit(
+                submitted,
+                result,
+                session_id=st.session_state.session_id,
+                bank_version=bank.VERSION,
+                orders=orders,
+            )
+            return
+        except StoreClosed:
+            # Evicted and closed between lookup and submit; the next lookup
+            # opens a fresh store.
+            if attempt:
+                raise
+
+
+# Keyed on the packed answer bytes, so reruns of the profile page with
+# unchanged answers skip scoring, DataFrame and chart construction.
+@st.cache_data(max_entries=1000, ttl=3600, show_spinner=False)
+def build_results_view(answer_bytes: bytes, bank_version: str):
+    # pandas/altair are imported here rather than at module top: only the
+    # results and analytics views need them, and every other page renders
+    # without paying their import cost on a cold start.
+    import altair as alt
+    import pandas as pd
+
+    bank = get_bank(bank_version)
+    total_score, comp_scores, sub_scores = compute_overall_scores(
+        PackedAnswers.from_bytes(answer_bytes, bank), bank
+    )
+    df_comp = pd.DataFrame({
+        "Component": bank.COMPONENTS,
+        "Score (1–5)": [comp_scores[c] for c in bank.COMPONENTS],
+        "Weight": [bank.COMP_WEIGHTS[c] for c in bank.COMPONENTS],
+    })
+    chart = (
+        alt.Chart(df_comp)
+        .mark_bar()
+        .encode(
+            x=alt.X("Score (1–5):Q", scale=alt.Scale(domain=[0, 5])),
+            y=alt.Y("Component:N", sort="-x"),
+            tooltip=["Component", "Score (1–5)", "Weight"],
+        )
+        .properties(height=320)
+    )
+    return total_score, comp_scores, sub_scores, chart.to_dict()
+
+
+# Rebuilt with a fresh store once the one it holds has been evicted and closed.
+@st.cache_resource(max_entries=MAX_OPEN_STORES, validate=lambda norms: not norms.store.closed)
+def get_norms(tenant=None):
+    return Norms(get_response_store(tenant))
+
+
+def percentile_text(table, metric, value):
+    pct = table.percentile(metric, value)
+    if pct is None:
+        return ""
+    return f"{ordinal(min(99, max(1, round(pct))))} percentile"
+
+
+def percentile_note(table, metric, value):
+    text = percentile_text(table, metric, value) if table is not None else ""
+    return f" ({text})" if text else ""
+
+
+@st.cache_resource
+def get_report_renderer():
+    return ReportRenderer()
+
+
+def report_download_button(report):
+    st.download_button(
+        "Download report (HTML)",
+        report,
+        file_name="readiness-report.html",
+        mime="text/html",
+        help="Open it in a browser and print to save a PDF.",
+    )
+
 
-# one-time defaults for resources/support
-if "defaults_initialized" not in st.session_state:
-    defaults = {
-        "res_fin_level": 3,
-        "res_tech_level": 3,
-        "res_talent_level": 3,
-        "res_network_level": 3,
-        "res_time_pattern": None,
-        "sup_brainstorm": False,
-        "sup_tactical": False,
-        "sup_emotional": False,
-        "sup_intros": False,
-        "sup_reaction": None,
-    }
-    for k, v in defaults.items():
-        st.session_state.setdefault(k, v)
-    st.session_state.defaults_initialized = True
+# Reports render on a worker pool. While one is pending, only this fragment
+# polls for it; once it is ready (or has failed) a full rerun shows the
+# download button (or the error).
+def wait_for_report(key):
+    renderer = get_report_renderer()
+    if renderer.get(key) is not None or not renderer.pending(key):
+        st.rerun()
+    st.caption("Preparing your downloadable report…")
+
+
+wait_for_report = st.fragment(run_every=1.0)(
+    instrumentation.fragment_run(wait_for_report, lambda: st.session_state.page)
+)
+
+
+def save_snapshot():
+    ss = st.session_state
+    get_session_store().save(
+        ss.resume_token,
+        pack_session(
+            ss.session_id, ss.bank_version, ss.page, ss.max_page, ss.res_q_idx, ss.submitted,
+            answers.snapshot(),
+        ),
+    )
+    if st.query_params.get("resume") != ss.resume_token:
+        st.query_params["resume"] = ss.resume_token
 
 
 def go_to(page_idx: int):
+    instrumentation.end_rerun(st.session_state.page, section="branch")
     st.session_state.page = page_idx
     if page_idx > st.session_state.max_page:
         st.session_state.max_page = page_idx
+    save_snapshot()
     st.rerun()
 
 # ============== UI HELPERS ==============
 
+button = instrumentation.counted(st.button, "buttons")
+
+
+def fragment(fn):
+    """Make ``fn`` an ``st.fragment``: a widget inside it reruns only ``fn``,
+    not the whole script (nav bar, preamble and the rest of the page).
+
+    Coaching mode keeps full reruns, since the live-score sidebar sits outside
+    every fragment and would otherwise go stale.
+    """
+    if coach_mode:
+        return fn
+    return st.fragment(instrumentation.fragment_run(fn, lambda: st.session_state.page))
+
+
+def note_change(state_key: str):
+    scorer = st.session_state.get("live_scores")
+    if scorer is not None:
+        scorer.update(state_key)
+
+
 def toggle_flag(state_key: str):
-    st.session_state[state_key] = not st.session_state.get(state_key, False)
+    session_answers().toggle(state_key)
+    note_change(state_key)
 
 
 def set_choice(state_key: str, value):
-    st.session_state[state_key] = value
+    session_answers().set(state_key, value)
+    note_change(state_key)
+
+
+def ensure_order(qid: str, n: int):
+    order = answers.order(qid)
+    if order is None:
+        # Seeded per session and question, so the order is reproducible.
+        order = session_order(st.session_state.session_id, qid, n)
+        answers.set_order(qid, order)
+    return order
+
+
+def answer_slider(state_key: str, label: str):
+    # The widget keeps its own key; the packed answer is what persists
+    # across pages.
+    value = st.slider(label, 1, 5, answers.get(state_key, 3), key=f"w_{state_key}")
+    if answers.get(state_key) != value:
+        answers.set(state_key, value)
+        note_change(state_key)
 
 
-def ensure_order(order_key: str, n: int):
-    if order_key not in st.session_state:
-        order = list(range(n))
-        random.shuffle(order)
-        st.session_state[order_key] = order
-    return st.session_state[order_key]
+def answer_checkbox(state_key: str, label: str):
+    value = st.checkbox(label, value=answers[state_key], key=f"w_{state_key}")
+    if answers[state_key] != value:
+        answers.set(state_key, value)
+        note_change(state_key)
+
+
+def render_live_scores(scorer):
+    with st.sidebar:
+        st.markdown("### Live scores")
+        st.caption("Coaching mode: updates as answers change. Games not yet played sit at the bottom of the scale.")
+        st.metric("Running readiness score", f"{scorer.total} / 100")
+        for comp in bank.COMPONENTS:
+            score = scorer.comp_scores[comp]
+            st.progress(min(1.0, score / 5.0), text=f"{comp}: {score:.2f} / 5")
 
 
 def render_toggle_card_multi(state_key: str, text: str, suffix: str = ""):
-    selected = st.session_state.get(state_key, False)
+    selected = answers[state_key]
     label_text = text + (f"  \n_{suffix}_" if suffix else "")
     label = f"✅ {label_text}" if selected else label_text
-    st.button(
+    button(
         label,
         key=f"btn_{state_key}",
         use_container_width=True,
@@ -660,16 +352,16 @@ def render_toggle_card_multi(state_key: str, text: str, suffix: str = ""):
     )
 
 
-def render_choice_cards(qid: str, prompt: str, options: list):
+def render_choice_buttons(qid: str, prompt: str, options: list):
     st.markdown(f"**{prompt}**")
-    order = ensure_order(f"{qid}_order", len(options))
-    current = st.session_state.get(f"{qid}_choice", None)
+    order = ensure_order(qid, len(options))
+    current = answers.get(f"{qid}_choice")
 
     for pos, opt_idx in enumerate(order):
         opt = options[opt_idx]
         selected = (current == opt_idx)
         label = f"✅ {opt}" if selected else opt
-        st.button(
+        button(
             label,
             key=f"{qid}_opt_{pos}",
             use_container_width=True,
@@ -679,169 +371,53 @@ def render_choice_cards(qid: str, prompt: str, options: list):
     st.markdown("---")
 
 
-def get_mc_score(qdict, qid: str):
-    q = qdict[qid]
-    idx = st.session_state.get(f"{qid}_choice", None)
-    if idx is None:
-        return None
-    if 0 <= idx < len(q["scores"]):
-        return float(q["scores"][idx])
-    return None
-
-# ============== SCORING FUNCTIONS ==============
-
-def compute_mindset_scores():
-    values = {s: [] for s in MINDSET_SUBDIMS}
-    values["Opportunity Recognition"].append(compute_opportunity_score())
-    values["Value Creation Focus"].append(compute_value_creation_score())
-    for qid, q in MINDSET_QUESTIONS.items():
-        s = get_mc_score(MINDSET_QUESTIONS, qid)
-        if s is None:
-            continue
-        values[q["subdim"]].append(s)
-    sub_scores = {}
-    for sd in MINDSET_SUBDIMS:
-        sub_scores[sd] = round(sum(values[sd]) / len(values[sd]), 2) if values[sd] else 1.0
-    overall = round(sum(sub_scores.values()) / len(MINDSET_SUBDIMS), 2)
-    return overall, sub_scores
-
-
-def compute_skill_scores():
-    skill_scores = {}
-    for skill in SKILL_AREAS:
-        vals = []
-        slider_key = SKILL_SLIDER_MAP.get(skill)
-        if slider_key is not None:
-            v = st.session_state.get(slider_key)
-            if v is not None:
-                vals.append(float(v))
-        for sid in SKILL_SCENARIO_MAP.get(skill, []):
-            s = get_mc_score(SKILL_QUESTIONS, sid)
-            if s is not None:
-                vals.append(s)
-        skill_scores[skill] = round(sum(vals) / len(vals), 2) if vals else 1.0
-    overall = round(sum(skill_scores.values()) / len(SKILL_AREAS), 2)
-    return overall, skill_scores
-
-
-def compute_resource_scores():
-    fin = float(st.session_state.get("res_fin_level", 3))
-    tech = float(st.session_state.get("res_tech_level", 3))
-    talent = float(st.session_state.get("res_talent_level", 3))
-    network = float(st.session_state.get("res_network_level", 3))
-
-    time_choice = st.session_state.get("res_time_pattern")
-    time_map = {
-        "25+ hours most weeks": 5,
-        "10–25 hours most weeks": 4,
-        "5–10 hours in irregular pockets": 3,
-        "Rarely have focused time": 1,
-    }
-    time_score = float(time_map.get(time_choice, 2))
-
-    support_count = 0
-    for key in ["sup_brainstorm", "sup_emotional", "sup_tactical", "sup_intros"]:
-        if st.session_state.get(key, False):
-            support_count += 1
-    support_react = st.session_state.get("sup_reaction")
-    react_map = {
-        "Mostly encouraging and try to help": 5,
-        "Neutral or politely interested": 3,
-        "Often skeptical or discouraging": 1,
-    }
-    react_score = float(react_map.get(support_react, 3))
-    support_base = 1 + (support_count / 4.0) * 4
-    support_score = round((support_base + react_score) / 2.0, 2)
-
-    sub_scores = {
-        "Financial Resources": fin,
-        "Technology & Infrastructure": tech,
-        "Talent / Team": talent,
-        "Network": network,
-        "Time": time_score,
-        "Support": support_score,
-    }
-    overall = round(sum(sub_scores.values()) / len(sub_scores), 2)
-    return overall, sub_scores
-
-
-def compute_acumen_scores():
-    values = {s: [] for s in ACUMEN_SUBDIMS}
-    for qid, q in ACUMEN_QUESTIONS.items():
-        s = get_mc_score(ACUMEN_QUESTIONS, qid)
-        if s is None:
-            continue
-        values[q["subdim"]].append(s)
-    sub_scores = {}
-    for sd in ACUMEN_SUBDIMS:
-        sub_scores[sd] = round(sum(values[sd]) / len(values[sd]), 2) if values[sd] else 1.0
-    overall = round(sum(sub_scores.values()) / len(ACUMEN_SUBDIMS), 2)
-    return overall, sub_scores
-
-
-def compute_overall_scores():
-    mindset_overall, mindset_sub = compute_mindset_scores()
-    skills_overall, skills_sub = compute_skill_scores()
-    res_overall, res_sub = compute_resource_scores()
-    ac_overall, ac_sub = compute_acumen_scores()
-    comp_scores = {
-        "Entrepreneurial Mindset": mindset_overall,
-        "Entrepreneurial Skills": skills_overall,
-        "Resource Availability": res_overall,
-        "Entrepreneurship / Business Acumen": ac_overall,
-    }
-    total = 0.0
-    for comp, score in comp_scores.items():
-        total += (score / 5.0) * COMP_WEIGHTS[comp]
-    total = round(total, 1)
-    return total, comp_scores, {
-        "mindset": mindset_sub,
-        "skills": skills_sub,
-        "resources": res_sub,
-        "acumen": ac_sub,
-    }
-
-
-def readiness_label(total_score):
-    if total_score >= 85:
-        return "High readiness to pursue or accelerate a venture."
-    elif total_score >= 70:
-        return "Strong potential — ready for more serious experiments."
-    elif total_score >= 50:
-        return "Early-stage readiness — good time to build specific muscles."
-    else:
-        return "Foundation-building phase — focus on learning and low-risk reps."
+def set_choice_from_widget(state_key: str, widget_key: str):
+    set_choice(state_key, st.session_state[widget_key])
 
 
-def suggestion_for_user(total_score, comp_scores):
-    sorted_comps = sorted(COMPONENTS, key=lambda c: comp_scores[c])
-    weakest = sorted_comps[0]
-    second_weakest = sorted_comps[1] if len(sorted_comps) > 1 else None
-    tail = (
-        f"Focus on strengthening **{weakest}**"
-        + (f" and **{second_weakest}**" if second_weakest else "")
-        + " through small, low-risk experiments."
+def render_choice_radio(qid: str, prompt: str, options: list):
+    # One widget per question instead of one button per option. The radio's
+    # values are the original option indices, in the session's shuffled order.
+    order = ensure_order(qid, len(options))
+    current = answers.get(f"{qid}_choice")
+    st.radio(
+        f"**{prompt}**",
+        order,
+        index=order.index(current) if current is not None else None,
+        format_func=lambda i: f"✅ {options[i]}" if i == current else options[i],
+        key=f"{qid}_radio",
+        on_change=set_choice_from_widget,
+        args=(f"{qid}_choice", f"{qid}_radio"),
     )
-    if total_score < 50:
-        return (
-            "You’re in a foundation-building phase; this is a good time to build skills "
-            "without heavy pressure to launch. " + tail
-        )
-    elif total_score < 70:
-        return (
-            "You’re showing early-stage readiness; you can run real experiments while deliberately "
-            "building your thinner areas. " + tail
-        )
-    elif total_score < 85:
-        return (
-            "You have strong potential and a solid base; you can keep advancing a venture while "
-            "watching for bottlenecks. " + tail
-        )
+    st.markdown("---")
+
+
+@fragment
+def render_choice_cards(qid: str, prompt: str, options: list):
+    if CHOICE_STYLE == "radio":
+        render_choice_radio(qid, prompt, options)
     else:
-        return (
-            "You’re showing high readiness; focus on building systems around your strengths and "
-            "avoiding blind spots in weaker components. " + tail
-        )
+        render_choice_buttons(qid, prompt, options)
+
+
+render_toggle_card = fragment(render_toggle_card_multi)
+
+
+@fragment
+def render_option_buttons(state_key: str, options: list, key_prefix: str, n_cols: int):
+    """Single-choice row of option buttons storing the option label."""
+    current = answers.get(state_key)
+    cols = st.columns(n_cols)
+    for i, opt in enumerate(options):
+        with cols[i % n_cols]:
+            label = f"✅ {opt}" if current == opt else opt
+            button(
+                label,
+                key=f"{key_prefix}_opt_{i}",
+                use_container_width=True,
+                on_click=set_choice,
+                args=(state_key, opt),
+            )
 
 # ============== NAVIGATION ==============
 
@@ -860,15 +436,44 @@ PAGE_LABELS = [
 
 st.title("Entrepreneurial Readiness Simulation")
 
+# Refreshes on its own while a facilitator watches submissions come in; each
+# refresh reads only the aggregate and sketch tables.
+def live_analytics():
+    from analytics import render_analytics_page
+
+    render_analytics_page(get_response_store(tenant).read_aggregates())
+
+
+live_analytics = st.fragment(run_every=LIVE_REFRESH)(
+    instrumentation.fragment_run(live_analytics, lambda: "analytics")
+)
+
+
+# Facilitator views are reached by URL (?view=...) and sit outside the participant flow.
+view = st.query_params.get("view")
+if view == "analytics":
+    if tenant is not None:
+        st.caption(f"Cohort: {tenant}")
+    live_analytics()
+    instrumentation.end_rerun("analytics")
+    st.stop()
+elif view == "diagnostics":
+    from diagnostics import render_diagnostics_page
+
+    render_diagnostics_page(PAGE_LABELS)
+    instrumentation.end_rerun("diagnostics")
+    st.stop()
+
 nav_cols = st.columns(len(PAGE_LABELS))
 for i, label in enumerate(PAGE_LABELS):
     with nav_cols[i]:
         disabled = i > st.session_state.max_page
-        if st.button(label, disabled=disabled, key=f"nav_{i}"):
+        if button(label, disabled=disabled, key=f"nav_{i}"):
             go_to(i)
 
 st.write(f"Step {st.session_state.page + 1} of {len(PAGE_LABELS)}")
 page = st.session_state.page
+instrumentation.mark("preamble")
 
 # ============== PAGES ==============
 
@@ -892,7 +497,7 @@ You’ll work through:
 - A final **Readiness Profile** with component scores and suggestions for what to build next.
         """
     )
-    if st.button("Start ▸"):
+    if button("Start ▸"):
         go_to(1)
 
 # Game 1 – customer signals
@@ -901,11 +506,11 @@ elif page == 1:
     st.caption("For each card, click if you believe it’s a **strong signal of real, fixable demand**.")
 
     cols = st.columns(3)
-    for idx, sc in enumerate(OPP_SCENARIOS):
+    for idx, sc in enumerate(bank.OPP_SCENARIOS):
         with cols[idx % 3]:
-            render_toggle_card_multi(sc["key"], sc["text"])
+            render_toggle_card(sc["key"], sc["text"])
 
-    if st.button("Next ▸"):
+    if button("Next ▸"):
         go_to(2)
 
 # Game 2 – constraint cards (one at a time)
@@ -914,29 +519,31 @@ elif page == 2:
     st.caption("You’re working under real constraints. For each situation, pick the move you would actually make.")
 
     idx = st.session_state.res_q_idx
-    idx = max(0, min(idx, len(RESOURCEFULNESS_QIDS) - 1))
+    idx = max(0, min(idx, len(bank.RESOURCEFULNESS_QIDS) - 1))
     st.session_state.res_q_idx = idx
 
-    current_qid = RESOURCEFULNESS_QIDS[idx]
-    q = MINDSET_QUESTIONS[current_qid]
-    st.markdown(f"_Decision {idx + 1} of {len(RESOURCEFULNESS_QIDS)}_")
+    current_qid = bank.RESOURCEFULNESS_QIDS[idx]
+    q = bank.MINDSET_QUESTIONS[current_qid]
+    st.markdown(f"_Decision {idx + 1} of {len(bank.RESOURCEFULNESS_QIDS)}_")
     render_choice_cards(current_qid, q["prompt"], q["options"])
 
     c1, c2, c3 = st.columns(3)
     with c1:
-        if st.button("◂ Previous decision", disabled=(idx == 0)):
+        if button("◂ Previous decision", disabled=(idx == 0)):
             st.session_state.res_q_idx -= 1
+            instrumentation.end_rerun(page, section="branch")
             st.rerun()
     with c2:
-        if st.button("Next decision ▸", disabled=(idx == len(RESOURCEFULNESS_QIDS) - 1)):
-            if st.session_state.get(f"{current_qid}_choice") is None:
+        if button("Next decision ▸", disabled=(idx == len(bank.RESOURCEFULNESS_QIDS) - 1)):
+            if answers.get(f"{current_qid}_choice") is None:
                 st.error("Please choose what you would actually do for this decision before moving on.")
             else:
                 st.session_state.res_q_idx += 1
+                instrumentation.end_rerun(page, section="branch")
                 st.rerun()
     with c3:
-        if st.button("Continue to next game ▸"):
-            missing = [qid for qid in RESOURCEFULNESS_QIDS if st.session_state.get(f"{qid}_choice") is None]
+        if button("Continue to next game ▸"):
+            missing = [qid for qid in bank.RESOURCEFULNESS_QIDS if answers.get(f"{qid}_choice") is None]
             if missing:
                 st.error("Please make a choice for each decision before continuing.")
             else:
@@ -947,17 +554,17 @@ elif page == 3:
     st.subheader("Game 3: Next-Step Choices")
     st.caption("You have limited time and information. For each situation, pick what you would actually do next.")
 
-    for qid in EXEC_QIDS:
-        q = MINDSET_QUESTIONS[qid]
+    for qid in bank.EXEC_QIDS:
+        q = bank.MINDSET_QUESTIONS[qid]
         render_choice_cards(qid, q["prompt"], q["options"])
 
     c1, c2 = st.columns(2)
     with c1:
-        if st.button("◂ Back"):
+        if button("◂ Back"):
             go_to(2)
     with c2:
-        if st.button("Next ▸"):
-            missing = [qid for qid in EXEC_QIDS if st.session_state.get(f"{qid}_choice") is None]
+        if button("Next ▸"):
+            missing = [qid for qid in bank.EXEC_QIDS if answers.get(f"{qid}_choice") is None]
             if missing:
                 st.error("Please choose what you’d actually do for each situation before continuing.")
             else:
@@ -968,17 +575,17 @@ elif page == 4:
     st.subheader("Game 4: Shock Cards")
     st.caption("Unexpected things happen. For each shock, choose how you’d respond in real life.")
 
-    for qid in RESIL_QIDS:
-        q = MINDSET_QUESTIONS[qid]
+    for qid in bank.RESIL_QIDS:
+        q = bank.MINDSET_QUESTIONS[qid]
         render_choice_cards(qid, q["prompt"], q["options"])
 
     c1, c2 = st.columns(2)
     with c1:
-        if st.button("◂ Back"):
+        if button("◂ Back"):
             go_to(3)
     with c2:
-        if st.button("Next ▸"):
-            missing = [qid for qid in RESIL_QIDS if st.session_state.get(f"{qid}_choice") is None]
+        if button("Next ▸"):
+            missing = [qid for qid in bank.RESIL_QIDS if answers.get(f"{qid}_choice") is None]
             if missing:
                 st.error("Please choose how you’d respond to each shock before continuing.")
             else:
@@ -991,7 +598,7 @@ elif page == 5:
 
     st.markdown(
         f"""
-You have a budget of **{FEATURE_BUDGET} cost units** to allocate across these possible changes.
+You have a budget of **{bank.FEATURE_BUDGET} cost units** to allocate across these possible changes.
 
 - Each card shows a **feature** and its **cost**.
 - Click to select the features you would ship in this sprint.
@@ -999,28 +606,34 @@ You have a budget of **{FEATURE_BUDGET} cost units** to allocate across these po
         """
     )
 
-    cols = st.columns(2)
-    for i, f in enumerate(VALUE_FEATURES):
-        with cols[i % 2]:
-            suffix = f"Cost: {f['cost']}"
-            render_toggle_card_multi(f["key"], f["name"], suffix=suffix)
+    # Cards, tally and navigation rerun together: toggling a card must update
+    # the tally and whether "Next" is enabled.
+    @fragment
+    def feature_budget_board():
+        cols = st.columns(2)
+        for i, f in enumerate(bank.VALUE_FEATURES):
+            with cols[i % 2]:
+                suffix = f"Cost: {f['cost']}"
+                render_toggle_card_multi(f["key"], f["name"], suffix=suffix)
+
+        total_cost = sum(
+            f["cost"] for f in bank.VALUE_FEATURES if answers[f["key"]]
+        )
+        st.markdown(f"**Total cost used:** {total_cost} / {bank.FEATURE_BUDGET}")
 
-    total_cost = sum(
-        f["cost"] for f in VALUE_FEATURES if st.session_state.get(f["key"], False)
-    )
-    st.markdown(f"**Total cost used:** {total_cost} / {FEATURE_BUDGET}")
+        over_budget = total_cost > bank.FEATURE_BUDGET
+        if over_budget:
+            st.error("You are over budget. Deselect some features to continue.")
 
-    over_budget = total_cost > FEATURE_BUDGET
-    if over_budget:
-        st.error("You are over budget. Deselect some features to continue.")
+        c1, c2 = st.columns(2)
+        with c1:
+            if button("◂ Back"):
+                go_to(4)
+        with c2:
+            if button("Next ▸", disabled=over_budget):
+                go_to(6)
 
-    c1, c2 = st.columns(2)
-    with c1:
-        if st.button("◂ Back"):
-            go_to(4)
-    with c2:
-        if st.button("Next ▸", disabled=over_budget):
-            go_to(6)
+    feature_budget_board()
 
 # Skills Game
 elif page == 6:
@@ -1030,63 +643,35 @@ elif page == 6:
     )
 
     st.markdown("### Part 1 – Self-assessment")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.slider(
-            "Finding and understanding customers",
-            1, 5,
-            st.session_state.get("s_skill_mkt", 3),
-            key="s_skill_mkt",
-        )
-        st.slider(
-            "Keeping day-to-day work running smoothly",
-            1, 5,
-            st.session_state.get("s_skill_ops", 3),
-            key="s_skill_ops",
-        )
-        st.slider(
-            "Budgeting, runway, and unit economics",
-            1, 5,
-            st.session_state.get("s_skill_fin", 3),
-            key="s_skill_fin",
-        )
-    with col2:
-        st.slider(
-            "Shaping and building products people can use",
-            1, 5,
-            st.session_state.get("s_skill_prod", 3),
-            key="s_skill_prod",
-        )
-        st.slider(
-            "Selling and building relationships",
-            1, 5,
-            st.session_state.get("s_skill_sales", 3),
-            key="s_skill_sales",
-        )
-        st.slider(
-            "Aligning people and priorities toward a plan",
-            1, 5,
-            st.session_state.get("s_skill_team", 3),
-            key="s_skill_team",
-        )
+
+    @fragment
+    def skill_self_ratings():
+        # First half of the skills in the left column, the rest in the right.
+        cols = st.columns(2)
+        half = (len(bank.SKILL_SLIDER_MAP) + 1) // 2
+        for i, (skill, key) in enumerate(bank.SKILL_SLIDER_MAP.items()):
+            with cols[i >= half]:
+                answer_slider(key, bank.SKILL_SLIDER_PROMPTS[skill])
+
+    skill_self_ratings()
 
     st.markdown("---")
     st.markdown("### Part 2 – Scenario Rounds")
 
-    for skill in SKILL_AREAS:
-        for qid in SKILL_SCENARIO_MAP[skill]:
-            q = SKILL_QUESTIONS[qid]
+    for skill in bank.SKILL_AREAS:
+        for qid in bank.SKILL_SCENARIO_MAP[skill]:
+            q = bank.SKILL_QUESTIONS[qid]
             render_choice_cards(qid, q["prompt"], q["options"])
 
     c1, c2 = st.columns(2)
     with c1:
-        if st.button("◂ Back"):
+        if button("◂ Back"):
             go_to(5)
     with c2:
-        if st.button("Next ▸"):
+        if button("Next ▸"):
             missing = [
-                qid for qid in SKILL_QUESTIONS.keys()
-                if st.session_state.get(f"{qid}_choice") is None
+                qid for qid in bank.SKILL_QUESTIONS.keys()
+                if answers.get(f"{qid}_choice") is None
             ]
             if missing:
                 st.error("Please play through all skill scenarios before continuing.")
@@ -1100,100 +685,40 @@ elif page == 7:
 
     st.markdown("**Access to key resources (today):**")
 
-    st.slider(
-        "Money you could direct toward a venture.",
-        1, 5,
-        st.session_state.get("res_fin_level", 3),
-        key="res_fin_level",
-    )
-    st.slider(
-        "Tools, platforms, or infrastructure you already have access to.",
-        1, 5,
-        st.session_state.get("res_tech_level", 3),
-        key="res_tech_level",
-    )
-    st.slider(
-        "People you could involve (co-founders, contractors, employees).",
-        1, 5,
-        st.session_state.get("res_talent_level", 3),
-        key="res_talent_level",
-    )
-    st.slider(
-        "Connections to customers, partners, mentors, or gatekeepers.",
-        1, 5,
-        st.session_state.get("res_network_level", 3),
-        key="res_network_level",
-    )
+    @fragment
+    def resource_levels():
+        for sd, key in bank.RESOURCE_LEVEL_KEYS.items():
+            answer_slider(key, bank.RESOURCE_LEVEL_PROMPTS[sd])
+
+    resource_levels()
 
     st.markdown("---")
     st.markdown("**Time pattern:**")
-
-    def set_time_choice(value: str):
-        st.session_state["res_time_pattern"] = value
-
-    time_options = [
-        "25+ hours most weeks",
-        "10–25 hours most weeks",
-        "5–10 hours in irregular pockets",
-        "Rarely have focused time",
-    ]
-    current_time = st.session_state.get("res_time_pattern", None)
-    cols = st.columns(2)
-    for i, opt in enumerate(time_options):
-        col = cols[i % 2]
-        with col:
-            selected = (current_time == opt)
-            label = f"✅ {opt}" if selected else opt
-            st.button(
-                label,
-                key=f"time_opt_{i}",
-                use_container_width=True,
-                on_click=set_time_choice,
-                args=(opt,),
-            )
+    render_option_buttons("res_time_pattern", list(bank.TIME_PATTERN_SCORES), "time", 2)
 
     st.markdown("---")
     st.markdown("**Support for ambitious goals:**")
-    sup_cols = st.columns(2)
-    with sup_cols[0]:
-        st.checkbox("Someone I can brainstorm with on strategy or decisions.", key="sup_brainstorm")
-        st.checkbox("Someone who will give me honest feedback without shutting me down.", key="sup_tactical")
-    with sup_cols[1]:
-        st.checkbox("Someone who is emotionally in my corner when things get rough.", key="sup_emotional")
-        st.checkbox("Someone willing to make intros or open doors.", key="sup_intros")
 
-    st.markdown("**Typical reaction when you share an ambitious plan:**")
+    @fragment
+    def support_checkboxes():
+        sup_cols = st.columns(2)
+        for i, key in enumerate(bank.SUPPORT_KEYS):
+            with sup_cols[i % 2]:
+                answer_checkbox(key, bank.SUPPORT_PROMPTS[key])
 
-    def set_reaction_choice(value: str):
-        st.session_state["sup_reaction"] = value
-
-    react_options = [
-        "Mostly encouraging and try to help",
-        "Neutral or politely interested",
-        "Often skeptical or discouraging",
-    ]
-    current_react = st.session_state.get("sup_reaction", None)
-    cols_r = st.columns(3)
-    for i, opt in enumerate(react_options):
-        col = cols_r[i]
-        with col:
-            selected = (current_react == opt)
-            label = f"✅ {opt}" if selected else opt
-            st.button(
-                label,
-                key=f"react_opt_{i}",
-                use_container_width=True,
-                on_click=set_reaction_choice,
-                args=(opt,),
-            )
+    support_checkboxes()
+
+    st.markdown("**Typical reaction when you share an ambitious plan:**")
+    react_options = list(bank.SUPPORT_REACTION_SCORES)
+    render_option_buttons("sup_reaction", react_options, "react", len(react_options))
 
     c1, c2 = st.columns(2)
     with c1:
-        if st.button("◂ Back"):
+        if button("◂ Back"):
             go_to(6)
     with c2:
-        if st.button("Next ▸"):
-            if st.session_state.get("res_time_pattern") is None or st.session_state.get("sup_reaction") is None:
+        if button("Next ▸"):
+            if answers.get("res_time_pattern") is None or answers.get("sup_reaction") is None:
                 st.error("Please choose your time pattern and typical reaction before continuing.")
             else:
                 go_to(8)
@@ -1203,19 +728,23 @@ elif page == 8:
     st.subheader("Venture-Building Knowledge")
     st.caption("Quick questions on how you think about problems, markets, models, and scaling.")
 
-    for qid, q in ACUMEN_QUESTIONS.items():
+    for qid, q in bank.ACUMEN_QUESTIONS.items():
         render_choice_cards(qid, q["prompt"], q["options"])
 
     c1, c2 = st.columns(2)
     with c1:
-        if st.button("◂ Back"):
+        if button("◂ Back"):
             go_to(7)
     with c2:
-        if st.button("Submit & see readiness profile ▸"):
-            missing = [qid for qid in ACUMEN_QUESTIONS if st.session_state.get(f"{qid}_choice") is None]
+        if button("Submit & see readiness profile ▸"):
+            missing = [qid for qid in bank.ACUMEN_QUESTIONS if answers.get(f"{qid}_choice") is None]
             if missing:
                 st.error("Please answer all questions before continuing.")
             else:
+                # Going back and submitting again shows the updated profile
+                # but does not store a second response for the session.
+                if not st.session_state.submitted:
+                    record_submission()
                 st.session_state.submitted = True
                 go_to(9)
 
@@ -1225,45 +754,68 @@ elif page == 9:
     if not st.session_state.submitted:
         st.info("Work through the earlier games and click **Submit & see readiness profile** to view your results.")
     else:
-        total_score, comp_scores, sub_scores = compute_overall_scores()
+        total_score, comp_scores, sub_scores, chart_spec = build_results_view(
+            answers.answer_bytes(), bank.VERSION
+        )
+        norm_table = get_norms(tenant).table()
+        if norm_table is not None and norm_table.size < MIN_NORM_GROUP:
+            norm_table = None
+
         st.metric("Entrepreneurial Readiness Score", f"{total_score} / 100")
+        if norm_table is not None:
+            group = f" in the {tenant} cohort" if tenant else ""
+            st.caption(
+                f"{percentile_text(norm_table, 'total', total_score)} among {norm_table.size:,} respondents{group}"
+            )
         st.write(f"**Interpretation:** {readiness_label(total_score)}")
         st.write(suggestion_for_user(total_score, comp_scores))
 
         st.markdown("### Component Scores")
-        df_comp = pd.DataFrame({
-            "Component": COMPONENTS,
-            "Score (1–5)": [comp_scores[c] for c in COMPONENTS],
-            "Weight": [COMP_WEIGHTS[c] for c in COMPONENTS],
-        })
-        chart = (
-            alt.Chart(df_comp)
-            .mark_bar()
-            .encode(
-                x=alt.X("Score (1–5):Q", scale=alt.Scale(domain=[0, 5])),
-                y=alt.Y("Component:N", sort="-x"),
-                tooltip=["Component", "Score (1–5)", "Weight"],
-            )
-            .properties(height=320)
-        )
-        st.altair_chart(chart, use_container_width=True)
+        st.vega_lite_chart(chart_spec, use_container_width=True)
+        if norm_table is not None:
+            for comp in bank.COMPONENTS:
+                note = percentile_note(norm_table, comp, comp_scores[comp])
+                st.write(f"- **{comp} – {comp_scores[comp]:.2f}/5**{note}")
 
         st.markdown("### Subdimension Details")
         st.markdown("**Mindset**")
-        for sd in MINDSET_SUBDIMS:
-            st.write(f"- **{sd} – {sub_scores['mindset'][sd]:.2f}/5** · {MINDSET_DESCRIPTIONS[sd]}")
+        for sd in bank.MINDSET_SUBDIMS:
+            note = percentile_note(norm_table, f"mindset.{sd}", sub_scores["mindset"][sd])
+            st.write(f"- **{sd} – {sub_scores['mindset'][sd]:.2f}/5**{note} · {bank.MINDSET_DESCRIPTIONS[sd]}")
 
         st.markdown("**Skills**")
-        for sk in SKILL_AREAS:
-            st.write(f"- **{sk} – {sub_scores['skills'][sk]:.2f}/5** · {SKILL_DESCRIPTIONS[sk]}")
+        for sk in bank.SKILL_AREAS:
+            note = percentile_note(norm_table, f"skills.{sk}", sub_scores["skills"][sk])
+            st.write(f"- **{sk} – {sub_scores['skills'][sk]:.2f}/5**{note} · {bank.SKILL_DESCRIPTIONS[sk]}")
 
         st.markdown("**Resources**")
-        for rs in RESOURCE_SUBDIMS:
-            st.write(f"- **{rs} – {sub_scores['resources'][rs]:.2f}/5** · {RESOURCE_DESCRIPTIONS[rs]}")
+        for rs in bank.RESOURCE_SUBDIMS:
+            note = percentile_note(norm_table, f"resources.{rs}", sub_scores["resources"][rs])
+            st.write(f"- **{rs} – {sub_scores['resources'][rs]:.2f}/5**{note} · {bank.RESOURCE_DESCRIPTIONS[rs]}")
 
         st.markdown("**Entrepreneurship / Business Acumen**")
-        for ac in ACUMEN_SUBDIMS:
-            st.write(f"- **{ac} – {sub_scores['acumen'][ac]:.2f}/5** · {ACUMEN_DESCRIPTIONS[ac]}")
+        for ac in bank.ACUMEN_SUBDIMS:
+            note = percentile_note(norm_table, f"acumen.{ac}", sub_scores["acumen"][ac])
+            st.write(f"- **{ac} – {sub_scores['acumen'][ac]:.2f}/5**{note} · {bank.ACUMEN_DESCRIPTIONS[ac]}")
+
+        renderer = get_report_renderer()
+        report_key = renderer.request((total_score, comp_scores, sub_scores), bank)
+        report = renderer.get(report_key)
+        if report is None and renderer.failed(report_key):
+            st.error("The downloadable report could not be generated.")
+            if button("Try again", key="retry_report"):
+                renderer.request((total_score, comp_scores, sub_scores), bank, retry=True)
+                st.rerun()
+        elif report is None:
+            wait_for_report(report_key)
+        else:
+            report_download_button(report)
 
-        if st.button("◂ Back to previous page"):
+        if button("◂ Back to previous page"):
             go_to(8)
+
+# Rendered last so it includes slider/checkbox values written during this run.
+if coach_mode and 1 <= page <= 7:
+    render_live_scores(st.session_state.live_scores)
+
+instrumentation.end_rerun(page, section="branch")
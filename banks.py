@@ -0,0 +1,461 @@
+"""Assessment content: components, subdimensions and question banks.
+
+The content itself lives in ``content/banks.json`` (override the path with
+``READINESS_BANKS``). It is parsed and validated when this module is first
+imported, and compiled into a read-only :class:`Bank` (tuples and
+``MappingProxyType``) that every session in the process shares.
+
+The running server picks up edits to that file without a restart:
+:func:`current_bank` re-checks its mtime every few seconds, compiles a new
+version when it changed and swaps it in for sessions that start afterwards.
+Sessions already in progress keep the version they started with
+(:func:`get_bank`). Write the file atomically (write elsewhere, then rename)
+and bump its ``version`` so the new revision is easy to tell apart.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from knapsack import efficiency_frontier
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BANKS_PATH = os.environ.get(
+    "READINESS_BANKS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "content", "banks.json"),
+)
+
+# Seconds between checks of the content file for edits (negative disables).
+RELOAD_INTERVAL = float(os.environ.get("READINESS_BANKS_RELOAD", "2"))
+
+# Option indices are packed into signed bytes per session (answer_buffer.py).
+MAX_OPTIONS = 127
+# Multiple-choice options are shuffled, and each order is stored and analysed
+# as its Lehmer rank in an int64 (orders.py); 20! is the largest that fits.
+MAX_QUESTION_OPTIONS = 20
+
+# Names the scorers (scoring.py, cohort.py) build on: the components in total
+# order, the mindset subdims with dedicated games, and the resource subdims
+# scored from their own answers rather than a level slider.
+SCORED_COMPONENTS = (
+    "Entrepreneurial Mindset",
+    "Entrepreneurial Skills",
+    "Resource Availability",
+    "Entrepreneurship / Business Acumen",
+)
+SCORED_MINDSET_SUBDIMS = ("Opportunity Recognition", "Value Creation Focus", "Execution Bias")
+DERIVED_RESOURCE_SUBDIMS = ("Time", "Support")
+
+REQUIRED_SECTIONS = [
+    "components",
+    "component_weights",
+    "mindset_subdims",
+    "opp_scenarios",
+    "feature_budget",
+    "value_features",
+    "mindset_questions",
+    "resourcefulness_qids",
+    "resil_qids",
+    "skill_areas",
+    "skill_questions",
+    "skill_slider_map",
+    "skill_scenario_map",
+    "resource_subdims",
+    "resource_level_keys",
+    "time_pattern_scores",
+    "support_keys",
+    "support_reaction_scores",
+    "acumen_subdims",
+    "acumen_questions",
+]
+
+# ============== VALIDATION ==============
+
+
+def _is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _is_whole(x):
+    return _is_number(x) and float(x).is_integer()
+
+
+def _check_choice_bank(errors, name, questions, group_field, known_groups):
+    for qid, q in questions.items():
+        where = f"{name}.{qid}"
+        options = q.get("options") or []
+        scores = q.get("scores") or []
+        if not q.get("prompt"):
+            errors.append(f"{where}: missing prompt")
+        if not options:
+            errors.append(f"{where}: no options")
+        if len(options) > MAX_QUESTION_OPTIONS:
+            errors.append(f"{where}: more than {MAX_QUESTION_OPTIONS} options")
+        if len(options) != len(scores):
+            errors.append(f"{where}: {len(options)} options but {len(scores)} scores")
+        if not all(_is_number(s) for s in scores):
+            errors.append(f"{where}: scores must be numbers")
+        if q.get(group_field) not in known_groups:
+            errors.append(f"{where}: unknown {group_field} {q.get(group_field)!r}")
+
+
+def _check_known(errors, where, values, known):
+    for v in values:
+        if v not in known:
+            errors.append(f"{where}: unknown {v!r}")
+
+
+def validate_banks(raw):
+    """Return a list of problems with parsed bank content (empty if valid)."""
+    missing = [k for k in REQUIRED_SECTIONS if k not in raw]
+    if missing:
+        return [f"missing section(s): {', '.join(missing)}"]
+    errors = []
+
+    components = raw["components"]
+    if list(components) != list(SCORED_COMPONENTS):
+        errors.append(f"components: must be {', '.join(SCORED_COMPONENTS)} (in that order)")
+    if set(raw["component_weights"]) != set(components):
+        errors.append("component_weights: keys must match components")
+    _check_known(errors, "mindset_subdims (required)", SCORED_MINDSET_SUBDIMS, raw["mindset_subdims"])
+
+    _check_choice_bank(errors, "mindset_questions", raw["mindset_questions"], "subdim", raw["mindset_subdims"])
+    _check_choice_bank(errors, "skill_questions", raw["skill_questions"], "skill", raw["skill_areas"])
+    _check_choice_bank(errors, "acumen_questions", raw["acumen_questions"], "subdim", raw["acumen_subdims"])
+
+    # {qid}_choice is the answer key, so ids must be unique across banks.
+    seen = set()
+    for bank in ("mindset_questions", "skill_questions", "acumen_questions"):
+        for qid in raw[bank]:
+            if qid in seen:
+                errors.append(f"{bank}.{qid}: duplicate question id")
+            seen.add(qid)
+
+    _check_known(errors, "resourcefulness_qids", raw["resourcefulness_qids"], raw["mindset_questions"])
+    _check_known(errors, "resil_qids", raw["resil_qids"], raw["mindset_questions"])
+
+    if set(raw["skill_slider_map"]) != set(raw["skill_areas"]):
+        errors.append("skill_slider_map: keys must match skill_areas")
+    if set(raw["skill_scenario_map"]) != set(raw["skill_areas"]):
+        errors.append("skill_scenario_map: keys must match skill_areas")
+    for skill, qids in raw["skill_scenario_map"].items():
+        _check_known(errors, f"skill_scenario_map.{skill}", qids, raw["skill_questions"])
+
+    keys = [sc.get("key") for sc in raw["opp_scenarios"]] + [f.get("key") for f in raw["value_features"]]
+    if len(set(keys)) != len(keys):
+        errors.append("opp_scenarios/value_features: duplicate keys")
+    for sc in raw["opp_scenarios"]:
+        if not sc.get("text") or not isinstance(sc.get("is_opportunity"), bool):
+            errors.append(f"opp_scenarios.{sc.get('key')}: needs text and a boolean is_opportunity")
+    if not any(sc.get("is_opportunity") for sc in raw["opp_scenarios"]):
+        errors.append("opp_scenarios: at least one card must be an opportunity")
+    # Costs and budget are whole units: the Game 5 solver (knapsack.py) works on them.
+    for f in raw["value_features"]:
+        if not f.get("name") or not _is_whole(f.get("cost")) or f["cost"] <= 0 or not _is_number(f.get("ideal_points")):
+            errors.append(f"value_features.{f.get('key')}: needs a name, positive whole-number cost and numeric ideal_points")
+    if not _is_whole(raw["feature_budget"]) or raw["feature_budget"] <= 0:
+        errors.append("feature_budget: must be a positive whole number")
+    elif not any(
+        _is_whole(f.get("cost")) and f["cost"] <= raw["feature_budget"]
+        and _is_number(f.get("ideal_points")) and f["ideal_points"] > 0
+        for f in raw["value_features"]
+    ):
+        errors.append("value_features: no feature with positive ideal_points fits in feature_budget")
+
+    _check_known(errors, "resource_level_keys", raw["resource_level_keys"], raw["resource_subdims"])
+    scored = set(raw["resource_level_keys"]) | set(DERIVED_RESOURCE_SUBDIMS)
+    if set(raw["resource_level_keys"]) & set(DERIVED_RESOURCE_SUBDIMS) or set(raw["resource_subdims"]) != scored:
+        errors.append(
+            "resource_subdims: must be the resource_level_keys subdims plus "
+            + " and ".join(DERIVED_RESOURCE_SUBDIMS)
+        )
+    if not raw["support_keys"] or len(set(raw["support_keys"])) != len(raw["support_keys"]):
+        errors.append("support_keys: needs at least one key, without duplicates")
+    # Optional widget labels; anything without one is labelled by its name.
+    for section, keys in (
+        ("skill_slider_prompts", raw["skill_slider_map"]),
+        ("resource_level_prompts", raw["resource_level_keys"]),
+        ("support_prompts", raw["support_keys"]),
+    ):
+        prompts = raw.get(section, {})
+        _check_known(errors, section, prompts, keys)
+        if not all(isinstance(p, str) and p for p in prompts.values()):
+            errors.append(f"{section}: prompts must be non-empty strings")
+    for section in ("time_pattern_scores", "support_reaction_scores"):
+        if not raw[section] or not all(_is_number(s) for s in raw[section].values()):
+            errors.append(f"{section}: needs at least one option with a numeric score")
+        if len(raw[section]) > MAX_OPTIONS:
+            errors.append(f"{section}: more than {MAX_OPTIONS} options")
+    return errors
+
+
+# ============== COMPILATION ==============
+
+
+def freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class Bank:
+    """One compiled, read-only version of the content.
+
+    Attributes carry the same names as the module-level constants
+    (``bank.MINDSET_QUESTIONS``, ``bank.EXEC_QIDS``, ...) plus ``VERSION``,
+    a content digest that identifies this exact revision, and ``LABEL``, the
+    ``version`` declared in the file.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        object.__setattr__(self, "_data", MappingProxyType(data))
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Bank is read-only")
+
+    def __repr__(self):
+        return f"<Bank {self.LABEL} ({self.VERSION})>"
+
+
+def _index_by(questions, field):
+    index = {}
+    for qid, q in questions.items():
+        index.setdefault(q[field], []).append(qid)
+    return freeze(index)
+
+
+def _prompts(b, section, keys):
+    """Widget label per key of ``keys``, in its order; the key itself where
+    the optional ``section`` has none."""
+    prompts = b.get(section, {})
+    return MappingProxyType({k: prompts.get(k, k) for k in keys})
+
+
+def compile_banks(raw, version):
+    """Freeze validated content and precompute everything derived from it."""
+    b = freeze(raw)
+    mindset = b["mindset_questions"]
+    skills = b["skill_questions"]
+    acumen = b["acumen_questions"]
+    features = b["value_features"]
+    frontier = efficiency_frontier(
+        [f["cost"] for f in features], [f["ideal_points"] for f in features], b["feature_budget"]
+    )
+    return Bank({
+        "VERSION": version,
+        "LABEL": str(raw.get("version", "")),
+        "COMPONENTS": b["components"],
+        "COMP_WEIGHTS": b["component_weights"],
+        "MINDSET_DESCRIPTIONS": b["mindset_subdims"],
+        "MINDSET_SUBDIMS": tuple(b["mindset_subdims"]),
+        "OPP_SCENARIOS": b["opp_scenarios"],
+        "FEATURE_BUDGET": b["feature_budget"],
+        "VALUE_FEATURES": b["value_features"],
+        "MINDSET_QUESTIONS": mindset,
+        "RESOURCEFULNESS_QIDS": b["resourcefulness_qids"],
+        "EXEC_QIDS": tuple(qid for qid, q in mindset.items() if q["subdim"] == "Execution Bias"),
+        "RESIL_QIDS": b["resil_qids"],
+        "SKILL_DESCRIPTIONS": b["skill_areas"],
+        "SKILL_AREAS": tuple(b["skill_areas"]),
+        "SKILL_QUESTIONS": skills,
+        "SKILL_SLIDER_MAP": b["skill_slider_map"],
+        "SKILL_SLIDER_PROMPTS": _prompts(b, "skill_slider_prompts", b["skill_slider_map"]),
+        "SKILL_SCENARIO_MAP": b["skill_scenario_map"],
+        "RESOURCE_DESCRIPTIONS": b["resource_subdims"],
+        "RESOURCE_SUBDIMS": tuple(b["resource_subdims"]),
+        "ACUMEN_DESCRIPTIONS": b["acumen_subdims"],
+        "ACUMEN_SUBDIMS": tuple(b["acumen_subdims"]),
+        "ACUMEN_QUESTIONS": acumen,
+        # Question ids per subdimension, in bank order.
+        "MINDSET_QIDS_BY_SUBDIM": _index_by(mindset, "subdim"),
+        "ACUMEN_QIDS_BY_SUBDIM": _index_by(acumen, "subdim"),
+        "RESOURCE_LEVEL_KEYS": b["resource_level_keys"],
+        "RESOURCE_LEVEL_PROMPTS": _prompts(b, "resource_level_prompts", b["resource_level_keys"]),
+        "TIME_PATTERN_SCORES": b["time_pattern_scores"],
+        "SUPPORT_KEYS": b["support_keys"],
+        "SUPPORT_PROMPTS": _prompts(b, "support_prompts", b["support_keys"]),
+        "SUPPORT_REACTION_SCORES": b["support_reaction_scores"],
+        # Scorer constants, computed once per version rather than per respondent.
+        "OPP_TOTAL_TRUE": sum(1 for sc in b["opp_scenarios"] if sc["is_opportunity"]),
+        # Game 5 is scored against the best selection that fits the budget.
+        "VALUE_FRONTIER": freeze([
+            {"cost": cost, "points": points, "keys": [features[i]["key"] for i in picked]}
+            for cost, points, picked in frontier
+        ]),
+        "VALUE_MAX_POINTS": frontier[-1][1],
+        # Every state key the scorers read, in a stable order.
+        "ANSWER_KEYS": tuple(
+            [sc["key"] for sc in b["opp_scenarios"]]
+            + [f["key"] for f in b["value_features"]]
+            + [f"{qid}_choice" for qid in mindset]
+            + list(b["skill_slider_map"].values())
+            + [f"{qid}_choice" for qid in skills]
+            + list(b["resource_level_keys"].values())
+            + ["res_time_pattern"]
+            + list(b["support_keys"])
+            + ["sup_reaction"]
+            + [f"{qid}_choice" for qid in acumen]
+        ),
+    })
+
+
+def load_banks(path=DEFAULT_BANKS_PATH):
+    """Parse, validate and compile a bank file; raises ValueError if invalid."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    raw = json.loads(data)
+    errors = validate_banks(raw)
+    if errors:
+        raise ValueError(f"invalid question banks in {path}:\n  " + "\n  ".join(errors))
+    return compile_banks(raw, hashlib.sha256(data).hexdigest()[:12])
+
+
+# ============== HOT RELOAD ==============
+
+# Every version compiled by this process, by digest. Versions are never
+# dropped: sessions stay pinned to the one they started with, so their
+# {qid}_choice indices and packed answer layout keep their meaning.
+_VERSIONS = {}
+_reload_lock = threading.Lock()
+_current = None
+_file_sig = None
+_next_check = 0.0
+
+
+def _signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _register(bank):
+    return _VERSIONS.setdefault(bank.VERSION, bank)
+
+
+def _check_scorable(bank):
+    """Score an empty answer set against ``bank`` and lay out its answer
+    buffer, so content the validator missed cannot reach new sessions."""
+    # Both modules import this one, so import them only once a reload runs.
+    from answer_buffer import layout_for
+    from scoring import compute_overall_scores
+
+    compute_overall_scores({}, bank)
+    layout_for(bank)
+
+
+def _reload_if_changed(path):
+    global _current, _file_sig
+    try:
+        sig = _signature(path)
+    except OSError as exc:
+        log.warning("question banks: cannot stat %s (%s); keeping version %s", path, exc, _current.LABEL)
+        return
+    if sig == _file_sig:
+        return
+    _file_sig = sig
+    try:
+        bank = load_banks(path)
+        _check_scorable(bank)
+    except Exception as exc:
+        # Any failure, not just a validation error: a bad edit must never
+        # replace the bank every new session starts with.
+        log.warning("question banks: not reloading %s; keeping version %s:\n%s", path, _current.LABEL, exc)
+        return
+    if bank.VERSION != _current.VERSION:
+        # A single assignment: readers see either the old or the new bank.
+        _current = _register(bank)
+        log.info("question banks: now serving version %s (%s)", bank.LABEL, bank.VERSION)
+
+
+def current_bank(path=DEFAULT_BANKS_PATH):
+    """The newest valid bank. Re-checks the content file's mtime and size at
+    most every ``RELOAD_INTERVAL`` seconds and compiles it only if they
+    changed; an invalid edit is logged and the previous version kept."""
+    global _next_check
+    now = time.monotonic()
+    if RELOAD_INTERVAL >= 0 and now >= _next_check:
+        with _reload_lock:
+            if now >= _next_check:
+                _next_check = now + RELOAD_INTERVAL
+                _reload_if_changed(path)
+    return _current
+
+
+def get_bank(version):
+    """The bank a session pinned with ``current_bank().VERSION``."""
+    return _VERSIONS[version]
+
+
+BANK = _register(load_banks())
+_current = BANK
+_file_sig = _signature(DEFAULT_BANKS_PATH)
+
+# ============== GLOBAL CONSTANTS ==============
+
+# The version loaded at import. Offline tools (cohort, simulate) and scorers
+# called without an explicit bank use these.
+
+COMPONENTS = BANK.COMPONENTS
+COMP_WEIGHTS = BANK.COMP_WEIGHTS
+
+MINDSET_SUBDIMS = BANK.MINDSET_SUBDIMS
+MINDSET_DESCRIPTIONS = BANK.MINDSET_DESCRIPTIONS
+
+# ============== GAME 1: CUSTOMER SIGNAL CARDS ==============
+
+OPP_SCENARIOS = BANK.OPP_SCENARIOS
+
+# ============== GAME 5: FEATURE BUDGET ==============
+
+FEATURE_BUDGET = BANK.FEATURE_BUDGET  # total cost budget (cannot exceed)
+VALUE_FEATURES = BANK.VALUE_FEATURES
+VALUE_FRONTIER = BANK.VALUE_FRONTIER  # best selection per cost, last is the optimum
+VALUE_MAX_POINTS = BANK.VALUE_MAX_POINTS  # points of the optimum selection
+
+# ============== MINDSET GAMES 2–4 ==============
+
+MINDSET_QUESTIONS = BANK.MINDSET_QUESTIONS
+RESOURCEFULNESS_QIDS = BANK.RESOURCEFULNESS_QIDS
+EXEC_QIDS = BANK.EXEC_QIDS
+RESIL_QIDS = BANK.RESIL_QIDS
+
+# ============== SKILLS GAME ==============
+
+SKILL_AREAS = BANK.SKILL_AREAS
+SKILL_DESCRIPTIONS = BANK.SKILL_DESCRIPTIONS
+SKILL_QUESTIONS = BANK.SKILL_QUESTIONS
+SKILL_SLIDER_MAP = BANK.SKILL_SLIDER_MAP
+SKILL_SCENARIO_MAP = BANK.SKILL_SCENARIO_MAP
+
+# ============== RESOURCES ==============
+
+RESOURCE_SUBDIMS = BANK.RESOURCE_SUBDIMS
+RESOURCE_DESCRIPTIONS = BANK.RESOURCE_DESCRIPTIONS
+
+# ============== ACUMEN QUIZ ==============
+
+ACUMEN_SUBDIMS = BANK.ACUMEN_SUBDIMS
+ACUMEN_DESCRIPTIONS = BANK.ACUMEN_DESCRIPTIONS
+ACUMEN_QUESTIONS = BANK.ACUMEN_QUESTIONS
+
+# ============== RESOURCE SCORING MAPS ==============
+
+RESOURCE_LEVEL_KEYS = BANK.RESOURCE_LEVEL_KEYS
+TIME_PATTERN_SCORES = BANK.TIME_PATTERN_SCORES
+SUPPORT_KEYS = BANK.SUPPORT_KEYS
+SUPPORT_REACTION_SCORES = BANK.SUPPORT_REACTION_SCORES
@@ -0,0 +1,65 @@
+"""Measure cold-start time to the first rendered page (Intro).
+
+Each sample runs in a fresh interpreter, as a freshly started container would:
+import Streamlit, execute ``app.py`` once and stop at the Intro page. The
+"eager" variant pre-imports pandas and altair first, which is what the app
+paid before those imports were deferred to the results/analytics views.
+
+    python bench_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import sys, time
+t0 = time.perf_counter()
+if {eager}:
+    import pandas, altair
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.run()
+assert not at.exception, at.exception
+elapsed = time.perf_counter() - t0
+print(elapsed, int("pandas" in sys.modules), int("altair" in sys.modules))
+"""
+
+
+def sample(eager):
+    code = PROBE.format(eager=eager, app=os.path.join(APP_DIR, "app.py"))
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(out[0]), bool(int(out[1])), bool(int(out[2]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for label, eager in (("lazy (current)", False), ("eager pandas+altair", True)):
+        samples = [sample(eager) for _ in range(args.runs)]
+        times = [s[0] for s in samples]
+        results[label] = statistics.median(times)
+        print(
+            f"{label:>22}: median {statistics.median(times) * 1000:7.1f} ms  "
+            f"min {min(times) * 1000:7.1f} ms  "
+            f"pandas loaded={samples[0][1]} altair loaded={samples[0][2]}"
+        )
+    saved = results["eager pandas+altair"] - results["lazy (current)"]
+    print(f"{'saved':>22}: {saved * 1000:7.1f} ms per cold start")
+
+
+if __name__ == "__main__":
+    main()
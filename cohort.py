@@ -0,0 +1,309 @@
+"""Vectorized cohort scorer.
+
+The question banks are compiled once into lookup arrays so a whole cohort of
+raw answers (one row per respondent, columns named by the app's state keys) is
+scored with column-wise array operations. Results match
+:func:`scoring.compute_overall_scores` exactly, including Python's rounding.
+"""
+
+import numpy as np
+import pandas as pd
+
+from banks import (
+    ACUMEN_QUESTIONS,
+    ACUMEN_SUBDIMS,
+    COMP_WEIGHTS,
+    COMPONENTS,
+    MINDSET_QUESTIONS,
+    MINDSET_SUBDIMS,
+    OPP_SCENARIOS,
+    RESOURCE_LEVEL_KEYS,
+    RESOURCE_SUBDIMS,
+    SKILL_AREAS,
+    SKILL_QUESTIONS,
+    SKILL_SCENARIO_MAP,
+    SKILL_SLIDER_MAP,
+    SUPPORT_KEYS,
+    SUPPORT_REACTION_SCORES,
+    TIME_PATTERN_SCORES,
+    VALUE_FEATURES,
+    VALUE_MAX_POINTS,
+)
+
+SUBDIM_GROUPS = {
+    "mindset": MINDSET_SUBDIMS,
+    "skills": SKILL_AREAS,
+    "resources": RESOURCE_SUBDIMS,
+    "acumen": ACUMEN_SUBDIMS,
+}
+GROUP_COMPONENTS = dict(zip(SUBDIM_GROUPS, COMPONENTS))
+
+# ============== COMPILED LOOKUP TABLES ==============
+
+
+def _compile_mc(qdict, subdims, subdim_of):
+    """Compile a multiple-choice bank into a padded score table and a
+    question-by-subdimension membership matrix."""
+    qids = list(qdict)
+    width = max(len(q["scores"]) for q in qdict.values())
+    table = np.zeros((len(qids), width))
+    n_opts = np.zeros(len(qids), dtype=np.int64)
+    member = np.zeros((len(qids), len(subdims)))
+    for i, qid in enumerate(qids):
+        scores = qdict[qid]["scores"]
+        table[i, :len(scores)] = scores
+        n_opts[i] = len(scores)
+        member[i, subdims.index(subdim_of(qid))] = 1.0
+    padded = [np.append(table[i, :n_opts[i]], 0.0) for i in range(len(qids))]
+    return {"qids": qids, "table": table, "n_opts": n_opts, "padded": padded, "member": member}
+
+
+_SKILL_OF = {sid: skill for skill, sids in SKILL_SCENARIO_MAP.items() for sid in sids}
+
+MINDSET_TABLE = _compile_mc(MINDSET_QUESTIONS, MINDSET_SUBDIMS, lambda q: MINDSET_QUESTIONS[q]["subdim"])
+# Scenarios outside SKILL_SCENARIO_MAP are not scored, so they are left out.
+SKILL_TABLE = _compile_mc(
+    {qid: q for qid, q in SKILL_QUESTIONS.items() if qid in _SKILL_OF},
+    SKILL_AREAS,
+    _SKILL_OF.get,
+)
+ACUMEN_TABLE = _compile_mc(ACUMEN_QUESTIONS, ACUMEN_SUBDIMS, lambda q: ACUMEN_QUESTIONS[q]["subdim"])
+
+OPP_KEYS = [sc["key"] for sc in OPP_SCENARIOS]
+OPP_TRUTH = np.array([sc["is_opportunity"] for sc in OPP_SCENARIOS])
+OPP_TOTAL_TRUE = int(OPP_TRUTH.sum())
+
+FEATURE_KEYS = [f["key"] for f in VALUE_FEATURES]
+FEATURE_POINTS = np.array([f["ideal_points"] for f in VALUE_FEATURES], dtype=float)
+
+TIME_SCORE_TABLE = np.array(list(TIME_PATTERN_SCORES.values()), dtype=float)
+REACTION_SCORE_TABLE = np.array(list(SUPPORT_REACTION_SCORES.values()), dtype=float)
+
+# ============== ROUNDING ==============
+
+
+def py_round(x, ndigits):
+    """Round like the builtin ``round`` does, element-wise.
+
+    ``np.round`` scales, rounds and unscales, which disagrees with Python on
+    values sitting on a decimal midpoint (e.g. 2.675 is stored just below the
+    midpoint, so ``round`` gives 2.67). Near-midpoint elements are resolved by
+    comparing the *exact* product ``x * 10**ndigits`` with the midpoint, so
+    batch output is bit-identical to the per-user scorers.
+    """
+    scale = 10.0 ** ndigits
+    y = x * scale
+    out = np.rint(y)
+    k = np.floor(y)
+    near_tie = np.abs(y - k - 0.5) < 1e-6
+    if near_tie.any():
+        xt, kt = x[near_tie], k[near_tie]
+        # Veltkamp split: xt == hi + lo with hi * scale and lo * scale exact,
+        # so the sign of (hi*scale - mid) + lo*scale is the sign of x*scale - mid.
+        c = 134217729.0 * xt
+        hi = c - (c - xt)
+        lo = xt - hi
+        diff = (hi * scale - (kt + 0.5)) + lo * scale
+        half_even = np.where(np.fmod(kt, 2) == 0, kt, kt + 1)
+        out[near_tie] = np.where(diff > 0, kt + 1, np.where(diff < 0, kt, half_even))
+    return out / scale
+
+
+def _mean_or_one(total, count):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, py_round(total / np.maximum(count, 1), 2), 1.0)
+
+
+def _sum_in_order(columns):
+    # Left-to-right accumulation reproduces sum() on the per-user dicts.
+    acc = columns[0]
+    for col in columns[1:]:
+        acc = acc + col
+    return acc
+
+# ============== COLUMN EXTRACTION ==============
+
+
+def _as_array(col):
+    if isinstance(col, pd.Series) and not isinstance(col.dtype, np.dtype):
+        # Nullable extension dtypes (Int64, boolean, ...) carry pd.NA.
+        return col.to_numpy(dtype=float, na_value=np.nan)
+    return np.asarray(col)
+
+
+def answer_flags(cols, keys, n):
+    """``(n, len(keys))`` bool array: whether each key is set (true or nonzero)
+    per row; a missing column counts as unset."""
+    out = np.zeros((n, len(keys)), dtype=bool)
+    for j, key in enumerate(keys):
+        if key in cols:
+            raw = _as_array(cols[key])
+            if raw.dtype == bool:
+                out[:, j] = raw
+            else:
+                out[:, j] = np.nan_to_num(raw.astype(float)) != 0
+    return out
+
+
+def numeric_column(cols, key, n):
+    """Column ``key`` as floats, or all NaN if it is missing."""
+    if key not in cols:
+        return np.full(n, np.nan)
+    return _as_array(cols[key]).astype(float, copy=False)
+
+
+def choice_scores(cols, compiled, n):
+    """Per-question scores of the ``{qid}_choice`` columns for one compiled
+    bank (``MINDSET_TABLE``, ...), as ``(scores, valid)`` ``(n, questions)``
+    arrays; unanswered or out-of-range choices count as 0 with a validity
+    mask of 0."""
+    qids = compiled["qids"]
+    scores = np.zeros((n, len(qids)))
+    valid = np.zeros((n, len(qids)))
+    for j, qid in enumerate(qids):
+        key = f"{qid}_choice"
+        if key not in cols:
+            continue
+        n_opts = compiled["n_opts"][j]
+        raw = _as_array(cols[key])
+        if raw.dtype.kind in "iu":
+            ok = (raw >= 0) & (raw < n_opts)
+            idx = raw
+        else:
+            raw = raw.astype(float, copy=False)
+            ok = (raw >= 0) & (raw < n_opts)
+            idx = np.where(ok, raw, 0).astype(np.int64)
+        # Out-of-range choices land on the padded zero slot past the last option.
+        scores[:, j] = compiled["padded"][j][np.where(ok, idx, n_opts)]
+        valid[:, j] = ok
+    return scores, valid
+
+
+def _lookup_choice(cols, key, labels, table, default, n):
+    """Score a single-choice column given either option labels or indices."""
+    if key not in cols:
+        return np.full(n, default)
+    raw = pd.Series(cols[key]) if not isinstance(cols[key], pd.Series) else cols[key]
+    if not pd.api.types.is_numeric_dtype(raw):
+        return raw.map(dict(zip(labels, table))).fillna(default).to_numpy(dtype=float)
+    idx = np.asarray(raw, dtype=float)
+    ok = (idx >= 0) & (idx < len(table))
+    return np.where(ok, table[np.where(ok, idx, 0).astype(np.int64)], default)
+
+# ============== SCORING ==============
+
+
+def score_columns(cols, n):
+    """Score ``n`` respondents from a mapping of state key -> column array.
+
+    Missing keys behave like keys absent from a session. Returns a dict of
+    float arrays keyed ``total``, component name and ``"{group}.{subdim}"``.
+    """
+    out = {}
+
+    # Mindset
+    opp = answer_flags(cols, OPP_KEYS, n)
+    tp = (opp & OPP_TRUTH).sum(axis=1)
+    fp = (opp & ~OPP_TRUTH).sum(axis=1)
+    fn = (~opp & OPP_TRUTH).sum(axis=1)
+    if OPP_TOTAL_TRUE == 0:
+        opp_score = np.ones(n)
+    else:
+        raw = tp - 0.5 * fp - fn
+        opp_score = py_round(1 + 4 * np.clip(raw / OPP_TOTAL_TRUE, 0.0, 1.0), 2)
+
+    feats = answer_flags(cols, FEATURE_KEYS, n)
+    selected_value = feats @ FEATURE_POINTS
+    value_score = np.where(
+        feats.any(axis=1),
+        py_round(1 + 4 * np.clip(selected_value / VALUE_MAX_POINTS, 0.0, 1.0), 2),
+        1.0,
+    )
+
+    scores, valid = choice_scores(cols, MINDSET_TABLE, n)
+    sums = scores @ MINDSET_TABLE["member"]
+    counts = valid @ MINDSET_TABLE["member"]
+    mindset = {}
+    for j, sd in enumerate(MINDSET_SUBDIMS):
+        if sd == "Opportunity Recognition":
+            mindset[sd] = opp_score
+        elif sd == "Value Creation Focus":
+            mindset[sd] = value_score
+        else:
+            mindset[sd] = _mean_or_one(sums[:, j], counts[:, j])
+
+    # Skills: the self-rating slider counts as one more value in its area.
+    scores, valid = choice_scores(cols, SKILL_TABLE, n)
+    sums = scores @ SKILL_TABLE["member"]
+    counts = valid @ SKILL_TABLE["member"]
+    skills = {}
+    for j, skill in enumerate(SKILL_AREAS):
+        total, count = sums[:, j], counts[:, j]
+        slider_key = SKILL_SLIDER_MAP.get(skill)
+        if slider_key is not None:
+            slider = numeric_column(cols, slider_key, n)
+            has = ~np.isnan(slider)
+            total = total + np.where(has, slider, 0.0)
+            count = count + has
+        skills[skill] = _mean_or_one(total, count)
+
+    # Resources
+    resources = {}
+    for sd, key in RESOURCE_LEVEL_KEYS.items():
+        level = numeric_column(cols, key, n)
+        resources[sd] = np.where(np.isnan(level), 3.0, level)
+    resources["Time"] = _lookup_choice(
+        cols, "res_time_pattern", list(TIME_PATTERN_SCORES), TIME_SCORE_TABLE, 2.0, n
+    )
+    support_count = answer_flags(cols, SUPPORT_KEYS, n).sum(axis=1)
+    react_score = _lookup_choice(
+        cols, "sup_reaction", list(SUPPORT_REACTION_SCORES), REACTION_SCORE_TABLE, 3.0, n
+    )
+    support_base = 1 + (support_count / len(SUPPORT_KEYS)) * 4
+    resources["Support"] = py_round((support_base + react_score) / 2.0, 2)
+
+    # Acumen
+    scores, valid = choice_scores(cols, ACUMEN_TABLE, n)
+    sums = scores @ ACUMEN_TABLE["member"]
+    counts = valid @ ACUMEN_TABLE["member"]
+    acumen = {
+        sd: _mean_or_one(sums[:, j], counts[:, j]) for j, sd in enumerate(ACUMEN_SUBDIMS)
+    }
+
+    total = np.zeros(n)
+    for group, subs in (("mindset", mindset), ("skills", skills), ("resources", resources), ("acumen", acumen)):
+        comp = GROUP_COMPONENTS[group]
+        comp_score = py_round(_sum_in_order(list(subs.values())) / len(subs), 2)
+        out[comp] = comp_score
+        total = total + (comp_score / 5.0) * COMP_WEIGHTS[comp]
+        for sd, values in subs.items():
+            out[f"{group}.{sd}"] = values
+    out["total"] = py_round(total, 1)
+    return out
+
+
+def score_frame(df):
+    """Score a DataFrame of raw answers, one row per respondent.
+
+    Choice columns (``{qid}_choice``, ``res_time_pattern``, ``sup_reaction``)
+    may hold option indices; the last two also accept option labels. Returns a
+    DataFrame on the same index with ``total``, one column per component and
+    one ``"{group}.{subdim}"`` column per subdimension.
+    """
+    cols = {c: df[c] for c in df.columns}
+    out = score_columns(cols, len(df))
+    ordered = ["total"] + list(COMPONENTS) + [
+        f"{group}.{sd}" for group, subdims in SUBDIM_GROUPS.items() for sd in subdims
+    ]
+    return pd.DataFrame({c: out[c] for c in ordered}, index=df.index)
+
+
+def row_to_result(row):
+    """Convert one :func:`score_frame` row back into the
+    ``(total, comp_scores, sub_scores)`` shape used by the app."""
+    comp_scores = {c: float(row[c]) for c in COMPONENTS}
+    sub_scores = {
+        group: {sd: float(row[f"{group}.{sd}"]) for sd in subdims}
+        for group, subdims in SUBDIM_GROUPS.items()
+    }
+    return float(row["total"]), comp_scores, sub_scores
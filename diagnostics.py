@@ -0,0 +1,60 @@
+"""Hidden diagnostics page for the opt-in rerun instrumentation."""
+
+import streamlit as st
+
+import instrumentation
+
+
+def render_diagnostics_page(page_labels):
+    st.subheader("Diagnostics")
+    if not instrumentation.ENABLED:
+        st.info("Instrumentation is off. Start the server with `READINESS_METRICS=1` to record reruns.")
+        return
+
+    summary = instrumentation.summary()
+    st.caption(
+        f"{summary['buffered_reruns']} reruns in the ring buffer "
+        f"(keeps the last {instrumentation.BUFFER_SIZE}, shared by all sessions in this process)."
+    )
+
+    st.markdown("### Reruns by page")
+    st.caption(
+        "Fragment reruns (a widget inside a fragment rerunning just that part of the page) "
+        "are listed under the fragment's name; full reruns have none. A fragment's time "
+        "during a full rerun counts towards the full rerun."
+    )
+    st.table([
+        {
+            "Page": page_labels[row["page"]] if isinstance(row["page"], int) else row["page"],
+            "Fragment": row["fragment"] or "—",
+            "Reruns": row["reruns"],
+            "p50 ms": round(row["p50_ms"], 1),
+            "p95 ms": round(row["p95_ms"], 1),
+            "Max ms": round(row["max_ms"], 1),
+            "Buttons / rerun": round(row["mean_buttons"], 1),
+        }
+        for row in summary["pages"]
+    ])
+
+    st.markdown("### Scorers")
+    if summary["scorers"]:
+        st.table([
+            {
+                "Scorer": row["scorer"],
+                "Calls": row["calls"],
+                "Total ms": round(row["total_ms"], 2),
+                "Mean ms": round(row["mean_ms"], 3),
+            }
+            for row in summary["scorers"]
+        ])
+    else:
+        st.write("No scorer calls recorded yet.")
+
+    st.download_button(
+        "Download JSON dump",
+        instrumentation.dump_json(),
+        file_name="readiness-metrics.json",
+        mime="application/json",
+    )
+    with st.expander("Most recent reruns"):
+        st.json(list(instrumentation.RERUNS)[-20:])
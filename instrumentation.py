@@ -0,0 +1,178 @@
+"""Opt-in rerun and scorer instrumentation.
+
+Enable with ``READINESS_METRICS=1``. Each full script rerun then appends one
+record to a process-wide ring buffer: the page branch that ran, wall time for
+the whole rerun and for each section marked inside it, time spent in every
+``compute_*`` scorer and how many buttons were rendered. A fragment rerun
+(a widget inside an ``st.fragment`` rerunning just that function) gets a
+record of its own, tagged with the fragment's name; see :func:`fragment_run`.
+The buffer is shown on the hidden ``?view=diagnostics`` page and can be
+dumped as JSON.
+
+When disabled, :func:`timed` and :func:`counted` return the wrapped callable
+unchanged and the rerun hooks return immediately, so there is no overhead.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ENABLED = os.environ.get("READINESS_METRICS", "").lower() in ("1", "true", "yes")
+BUFFER_SIZE = int(os.environ.get("READINESS_METRICS_BUFFER", "5000"))
+
+RERUNS = deque(maxlen=BUFFER_SIZE)
+
+# Streamlit runs each session's reruns on that session's script thread, so the
+# in-flight record is thread-local.
+_local = threading.local()
+
+
+def start_rerun():
+    if not ENABLED:
+        return
+    now = time.perf_counter()
+    _local.record = {
+        "ts": time.time(),
+        "page": None,
+        "fragment": None,
+        "total_ms": 0.0,
+        "sections": {},
+        "scorers": {},
+        "counts": {},
+    }
+    _local.start = now
+    _local.mark = now
+
+
+def mark(section):
+    """Attribute the time since the previous mark to ``section``."""
+    record = getattr(_local, "record", None)
+    if record is None:
+        return
+    now = time.perf_counter()
+    record["sections"][section] = record["sections"].get(section, 0.0) + (now - _local.mark) * 1000
+    _local.mark = now
+
+
+def end_rerun(page, section=None):
+    """Close the in-flight record. Safe to call more than once per rerun
+    (e.g. just before ``st.rerun()`` and again at script end)."""
+    record = getattr(_local, "record", None)
+    if record is None:
+        return
+    if section is not None:
+        mark(section)
+    record["page"] = page
+    record["total_ms"] = (time.perf_counter() - _local.start) * 1000
+    RERUNS.append(record)
+    _local.record = None
+
+
+def timed(fn):
+    """Record ``fn``'s wall time in the current rerun's ``scorers`` map."""
+    if not ENABLED:
+        return fn
+    name = fn.__name__
+
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record = getattr(_local, "record", None)
+            if record is not None:
+                calls, ms = record["scorers"].get(name, (0, 0.0))
+                record["scorers"][name] = (calls + 1, ms + (time.perf_counter() - t0) * 1000)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = fn.__doc__
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+def counted(fn, counter):
+    """Count calls to ``fn`` (e.g. ``st.button``) under ``counter`` per rerun."""
+    if not ENABLED:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        record = getattr(_local, "record", None)
+        if record is not None:
+            record["counts"][counter] = record["counts"].get(counter, 0) + 1
+        return fn(*args, **kwargs)
+
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+def fragment_run(fn, page):
+    """Wrap the body of an ``st.fragment`` so that a fragment rerun is
+    recorded, under the fragment's name and the page ``page()`` returns.
+    Called inside a full rerun, ``fn`` just counts towards that rerun."""
+    if not ENABLED:
+        return fn
+
+    # functools.wraps keeps fn's qualified name, which Streamlit uses to
+    # tell fragments apart.
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, "record", None) is not None:
+            return fn(*args, **kwargs)
+        start_rerun()
+        _local.record["fragment"] = fn.__name__
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            end_rerun(page(), section="fragment")
+
+    return wrapper
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1))))]
+
+
+def summary():
+    """Per-page and per-scorer aggregates over the current buffer."""
+    records = list(RERUNS)
+    pages = {}
+    for r in records:
+        pages.setdefault((r["page"], r.get("fragment")), []).append(r)
+    page_rows = []
+    for page, fragment in sorted(pages, key=lambda k: (k[0] is None, str(k[0]), k[1] or "")):
+        rs = pages[page, fragment]
+        totals = sorted(r["total_ms"] for r in rs)
+        page_rows.append({
+            "page": page,
+            "fragment": fragment,
+            "reruns": len(rs),
+            "p50_ms": _percentile(totals, 50),
+            "p95_ms": _percentile(totals, 95),
+            "max_ms": totals[-1],
+            "mean_buttons": sum(r["counts"].get("buttons", 0) for r in rs) / len(rs),
+        })
+    scorers = {}
+    for r in records:
+        for name, (calls, ms) in r["scorers"].items():
+            s = scorers.setdefault(name, [0, 0.0])
+            s[0] += calls
+            s[1] += ms
+    scorer_rows = [
+        {"scorer": name, "calls": calls, "total_ms": ms, "mean_ms": ms / calls}
+        for name, (calls, ms) in sorted(scorers.items(), key=lambda kv: -kv[1][1])
+    ]
+    return {"enabled": ENABLED, "buffered_reruns": len(records), "pages": page_rows, "scorers": scorer_rows}
+
+
+def dump_json(path=None):
+    """Return (and optionally write) the summary plus raw buffered records."""
+    payload = json.dumps({"summary": summary(), "reruns": list(RERUNS)}, indent=2, default=str)
+    if path:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+    return payload
@@ -0,0 +1,326 @@
+"""Item analysis over stored or exported answers.
+
+For every multiple-choice question, Game 1 signal card and Game 5 feature,
+reports:
+
+- option pick rates (selection rate for cards and features);
+- discrimination: the correlation of the item score with the readiness
+  total, and with the rest of its subdimension (item-rest correlation);
+- per subdimension, Cronbach's alpha over its items;
+- per skill area, the correlation of the self-rating slider with the mean
+  score of that area's scenarios.
+
+Item scores are the option's score for multiple-choice questions, and 1/0
+for a signal card classified correctly or a feature chosen in agreement with
+the optimal Game 5 selection.
+
+The input is read once, in chunks. Each chunk adds to pairwise-complete
+cross-product matrices (four matrix products), so a million responses take
+one pass in constant memory, and unanswered items simply drop out of the
+pairs they are in.
+
+    python item_analysis.py data/responses.sqlite3 --out reports/items
+    python item_analysis.py exports/spring.parquet --out reports/items
+
+Only responses to the current question-bank version (and unversioned ones)
+are read from a store, since option indices differ between versions.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from banks import (
+    ACUMEN_SUBDIMS,
+    BANK,
+    MINDSET_SUBDIMS,
+    SKILL_AREAS,
+    SKILL_SCENARIO_MAP,
+    SKILL_SLIDER_MAP,
+    VALUE_FRONTIER,
+)
+from cohort import (
+    ACUMEN_TABLE,
+    FEATURE_KEYS,
+    MINDSET_TABLE,
+    OPP_KEYS,
+    OPP_TRUTH,
+    SKILL_TABLE,
+    answer_flags,
+    choice_scores,
+    numeric_column,
+    score_columns,
+)
+from score_cli import DEFAULT_CHUNK_SIZE, iter_chunks
+
+# Items below this item-rest correlation are flagged for review.
+DEFAULT_MIN_DISCRIMINATION = 0.2
+
+MC_TABLES = [
+    ("mindset", MINDSET_TABLE, MINDSET_SUBDIMS),
+    ("skills", SKILL_TABLE, SKILL_AREAS),
+    ("acumen", ACUMEN_TABLE, ACUMEN_SUBDIMS),
+]
+OPTIMAL_FEATURES = np.array([key in VALUE_FRONTIER[-1]["keys"] for key in FEATURE_KEYS])
+
+# ============== ITEMS ==============
+
+
+def item_catalogue():
+    """``(item, kind, subdimension, n_options)`` for every item, in column order."""
+    items = [(key, "signal card", "mindset.Opportunity Recognition", 1) for key in OPP_KEYS]
+    items += [(key, "feature", "mindset.Value Creation Focus", 1) for key in FEATURE_KEYS]
+    for group, compiled, subdims in MC_TABLES:
+        for qid, n_opts, j in zip(compiled["qids"], compiled["n_opts"], compiled["member"].argmax(axis=1)):
+            items.append((qid, group, f"{group}.{subdims[j]}", int(n_opts)))
+    return items
+
+
+ITEMS = item_catalogue()
+SLIDER_COLUMNS = [SKILL_SLIDER_MAP[skill] for skill in SKILL_AREAS]
+SCENARIO_COLUMNS = [f"scenarios.{skill}" for skill in SKILL_AREAS]
+# Every variable that enters the cross-product matrices.
+COLUMNS = [item for item, *_ in ITEMS] + ["total"] + SLIDER_COLUMNS + SCENARIO_COLUMNS
+_COLUMN_INDEX = {c: i for i, c in enumerate(COLUMNS)}
+_SKILL_ITEMS = {
+    skill: [_COLUMN_INDEX[qid] for qid in SKILL_SCENARIO_MAP[skill] if qid in _COLUMN_INDEX]
+    for skill in SKILL_AREAS
+}
+
+# ============== ACCUMULATION ==============
+
+
+def _choices(cols, qid, n_opts):
+    key = f"{qid}_choice"
+    if key not in cols:
+        return np.zeros(0, dtype=np.int64)
+    raw = pd.to_numeric(pd.Series(cols[key]), errors="coerce").to_numpy(dtype=float)
+    ok = (raw >= 0) & (raw < n_opts)
+    return raw[ok].astype(np.int64)
+
+
+class ItemAccumulator:
+    """Pairwise-complete sums over all :data:`COLUMNS`, built chunk by chunk.
+
+    For columns i and j, ``count[i, j]`` is the number of rows where both are
+    present, ``sums[i, j]`` the sum of i over those rows, ``squares[i, j]``
+    the sum of i squared and ``products[i, j]`` the sum of i * j.
+    """
+
+    def __init__(self):
+        m = len(COLUMNS)
+        self.rows = 0
+        self.count = np.zeros((m, m))
+        self.sums = np.zeros((m, m))
+        self.squares = np.zeros((m, m))
+        self.products = np.zeros((m, m))
+        self.picks = {item: np.zeros(max(n_opts, 1), dtype=np.int64) for item, _, _, n_opts in ITEMS}
+
+    def add(self, cols, n, totals):
+        """Add ``n`` respondents (``state key -> column``) with their totals."""
+        x = np.full((n, len(COLUMNS)), np.nan)
+        opp = answer_flags(cols, OPP_KEYS, n)
+        feat = answer_flags(cols, FEATURE_KEYS, n)
+        k = len(OPP_KEYS)
+        x[:, :k] = opp == OPP_TRUTH
+        x[:, k:k + len(FEATURE_KEYS)] = feat == OPTIMAL_FEATURES
+        for key, col in zip(OPP_KEYS + FEATURE_KEYS, np.hstack([opp, feat]).T):
+            self.picks[key][0] += int(col.sum())
+        for _, compiled, _ in MC_TABLES:
+            scores, valid = choice_scores(cols, compiled, n)
+            idx = [_COLUMN_INDEX[qid] for qid in compiled["qids"]]
+            x[:, idx] = np.where(valid > 0, scores, np.nan)
+            for qid, n_opts in zip(compiled["qids"], compiled["n_opts"]):
+                self.picks[qid] += np.bincount(_choices(cols, qid, n_opts), minlength=n_opts)
+        x[:, _COLUMN_INDEX["total"]] = totals
+        for skill, slider, scenario in zip(SKILL_AREAS, SLIDER_COLUMNS, SCENARIO_COLUMNS):
+            x[:, _COLUMN_INDEX[slider]] = numeric_column(cols, slider, n)
+            with np.errstate(invalid="ignore"):
+                x[:, _COLUMN_INDEX[scenario]] = np.nanmean(x[:, _SKILL_ITEMS[skill]], axis=1)
+
+        present = (~np.isnan(x)).astype(float)
+        x0 = np.nan_to_num(x)
+        self.rows += n
+        self.count += present.T @ present
+        self.sums += x0.T @ present
+        self.squares += (x0 * x0).T @ present
+        self.products += x0.T @ x0
+
+    def pairwise(self):
+        """``(count, cov, var)`` matrices: ``cov[i, j]`` and ``var[i, j]``
+        (the variance of i) over the rows where both i and j are present."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n = self.count
+            mean = self.sums / n
+            var = self.squares / n - mean ** 2
+            cov = self.products / n - mean * mean.T
+        return n, cov, np.maximum(var, 0.0)
+
+    def _corr(self, i, j):
+        n, cov, var = self.pairwise()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return float(cov[i, j] / np.sqrt(var[i, j] * var[j, i]))
+
+    def _subdim_items(self):
+        groups = {}
+        for item, _, subdim, _ in ITEMS:
+            groups.setdefault(subdim, []).append(_COLUMN_INDEX[item])
+        return groups
+
+    def item_table(self, min_discrimination=DEFAULT_MIN_DISCRIMINATION):
+        n, cov, var = self.pairwise()
+        total = _COLUMN_INDEX["total"]
+        groups = self._subdim_items()
+        rows = []
+        for item, kind, subdim, n_opts in ITEMS:
+            i = _COLUMN_INDEX[item]
+            rest = [j for j in groups[subdim] if j != i]
+            item_rest = np.nan
+            if rest:
+                # Variance of the rest score and its covariance with the item,
+                # from the (pairwise) covariance matrix.
+                cov_rest = cov[i, rest].sum()
+                var_rest = cov[np.ix_(rest, rest)].sum()
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    item_rest = cov_rest / np.sqrt(var[i, i] * var_rest)
+            picks = self.picks[item]
+            rates = picks / n[i, i] if n[i, i] else picks * np.nan
+            rows.append({
+                "item": item,
+                "kind": kind,
+                "subdim": subdim,
+                "n": int(n[i, i]),
+                "mean": self.sums[i, i] / n[i, i] if n[i, i] else np.nan,
+                "sd": float(np.sqrt(var[i, i])),
+                "pick_rates": json.dumps([round(float(r), 4) for r in rates]),
+                "r_total": self._corr(i, total),
+                "r_item_rest": float(item_rest),
+                "review": bool(not (item_rest >= min_discrimination)) if rest else False,
+            })
+        return pd.DataFrame(rows)
+
+    def subdim_table(self):
+        n, cov, _ = self.pairwise()
+        rows = []
+        for subdim, idx in self._subdim_items().items():
+            k = len(idx)
+            block = cov[np.ix_(idx, idx)]
+            alpha = np.nan
+            if k > 1:
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    alpha = k / (k - 1) * (1 - np.trace(block) / block.sum())
+            rows.append({
+                "subdim": subdim,
+                "items": k,
+                "n": int(n[np.ix_(idx, idx)].min()),
+                "alpha": float(alpha),
+            })
+        return pd.DataFrame(rows)
+
+    def slider_table(self):
+        n, _, _ = self.pairwise()
+        rows = []
+        for skill, slider, scenario in zip(SKILL_AREAS, SLIDER_COLUMNS, SCENARIO_COLUMNS):
+            i, j = _COLUMN_INDEX[slider], _COLUMN_INDEX[scenario]
+            rows.append({
+                "skill": skill,
+                "slider": slider,
+                "scenarios": len(_SKILL_ITEMS[skill]),
+                "n": int(n[i, j]),
+                "r_slider_scenarios": self._corr(i, j),
+            })
+        return pd.DataFrame(rows)
+
+# ============== READERS ==============
+
+
+def iter_store_chunks(path, chunk_size, bank_version=BANK.VERSION):
+    """Yield ``(answers DataFrame, totals)`` chunks from a response store.
+    Raises FileNotFoundError if ``path`` does not exist and ValueError if it
+    is not a response store."""
+    import sqlite3
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"no response store at {path}")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        try:
+            cur = conn.execute(
+                "SELECT answers, total FROM responses WHERE bank_version = ? OR bank_version IS NULL",
+                (bank_version,),
+            )
+        except sqlite3.DatabaseError as exc:
+            raise ValueError(f"{path} is not a response store ({exc})") from exc
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            frame = pd.DataFrame.from_records([json.loads(answers) for answers, _ in rows])
+            yield frame, np.array([total for _, total in rows], dtype=float)
+    finally:
+        conn.close()
+
+
+def iter_file_chunks(path, chunk_size):
+    """Yield ``(answers DataFrame, totals)`` chunks from a CSV/Parquet export,
+    scoring each chunk for its totals."""
+    for chunk in iter_chunks(path, chunk_size):
+        cols = {c: chunk[c] for c in chunk.columns}
+        yield chunk, score_columns(cols, len(chunk))["total"]
+
+
+def analyse(chunks):
+    acc = ItemAccumulator()
+    for frame, totals in chunks:
+        acc.add({c: frame[c] for c in frame.columns}, len(frame), totals)
+    return acc
+
+# ============== CLI ==============
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Item statistics for the question banks.")
+    parser.add_argument("input", help="response store (.sqlite3) or a CSV/Parquet export of raw answers")
+    parser.add_argument("--out", help="directory for items.csv, subdims.csv and sliders.csv")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk")
+    parser.add_argument("--min-discrimination", type=float, default=DEFAULT_MIN_DISCRIMINATION,
+                        help="flag items whose item-rest correlation is below this")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.input.lower().endswith((".sqlite3", ".sqlite", ".db")):
+        chunks = iter_store_chunks(args.input, args.chunk_size)
+    else:
+        chunks = iter_file_chunks(args.input, args.chunk_size)
+    try:
+        acc = analyse(chunks)
+    except (FileNotFoundError, ValueError) as exc:
+        sys.exit(str(exc))
+    items = acc.item_table(args.min_discrimination)
+    subdims = acc.subdim_table()
+    sliders = acc.slider_table()
+    elapsed = time.perf_counter() - t0
+
+    pd.set_option("display.width", 160)
+    print(f"{acc.rows:,} responses analysed in {elapsed:.1f}s\n")
+    print(subdims.round(3).to_string(index=False), "\n")
+    print(sliders.round(3).to_string(index=False), "\n")
+    flagged = items[items["review"]]
+    print(f"{len(flagged)} of {len(items)} items below item-rest r = {args.min_discrimination}:")
+    if len(flagged):
+        print(flagged[["item", "subdim", "r_total", "r_item_rest", "pick_rates"]].round(3).to_string(index=False))
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        items.to_csv(os.path.join(args.out, "items.csv"), index=False)
+        subdims.to_csv(os.path.join(args.out, "subdims.csv"), index=False)
+        sliders.to_csv(os.path.join(args.out, "sliders.csv"), index=False)
+        print(f"\nwrote items.csv, subdims.csv and sliders.csv to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
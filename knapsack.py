@@ -0,0 +1,56 @@
+"""Feature Budget solver (Game 5).
+
+Game 5 is a 0/1 knapsack: pick features whose total cost stays within the
+budget while maximising ideal points. :func:`efficiency_frontier` solves it
+with dynamic programming over whole cost units, O(features x budget) time and
+memory, so banks with 50+ features and large budgets stay cheap. Costs and
+budget are first divided by their greatest common divisor.
+
+:func:`banks.compile_banks` runs it once per content version; scorers read
+the cached result from the bank (``VALUE_MAX_POINTS``, ``VALUE_FRONTIER``).
+"""
+
+from functools import reduce
+from math import gcd
+
+import numpy as np
+
+
+def efficiency_frontier(costs, points, budget):
+    """Pareto frontier of cost against value for a budget.
+
+    ``costs`` and ``budget`` are positive whole numbers. Returns a list of
+    ``(cost, points, indices)`` with strictly increasing cost and points:
+    each entry is the best selection for any budget from its cost up to the
+    next entry's, and the last one is the optimum. ``(0, 0, ())`` always
+    comes first.
+    """
+    costs = [int(c) for c in costs]
+    budget = int(budget)
+    unit = reduce(gcd, costs, budget) or 1
+    units = [c // unit for c in costs]
+    cap = budget // unit
+
+    # best[c]: most points for a total cost of at most c units.
+    # took[i, c]: feature i is part of the selection behind best[c] after
+    # features 0..i were considered.
+    best = np.zeros(cap + 1)
+    took = np.zeros((len(units), cap + 1), dtype=bool)
+    for i, (w, v) in enumerate(zip(units, points)):
+        if w > cap or v <= 0:
+            continue
+        candidate = best[:-w] + v
+        better = candidate > best[w:]
+        took[i, w:] = better
+        best[w:] = np.where(better, candidate, best[w:])
+
+    frontier = [(0, 0, ())]
+    for c in np.flatnonzero(np.diff(best) > 0) + 1:
+        chosen, left = [], int(c)
+        for i in range(len(units) - 1, -1, -1):
+            if took[i, left]:
+                chosen.append(i)
+                left -= units[i]
+        chosen.reverse()
+        frontier.append((int(c) * unit, sum(points[i] for i in chosen), tuple(chosen)))
+    return frontier
@@ -0,0 +1,309 @@
+"""Headless load test that drives participants through the full flow.
+
+Each simulated participant runs the real ``app.py`` through Streamlit's
+``AppTest`` harness, locally and without a browser: Intro → Games 1–5 →
+Skills → Resources → Knowledge → Submit → Readiness Profile, answering at
+random and clicking the same buttons a person would. Every rerun is timed and
+attributed to the page it was triggered from.
+
+Sessions are spread over worker processes. Inside a worker, every session
+stays alive on its own thread, but reruns go through a lock: ``AppTest`` is
+not safe to run concurrently within one interpreter, and one rerun at a time
+per interpreter is also what the GIL allows a real server. Peak memory per
+session is the worker's RSS growth divided by the sessions it held open.
+
+    python loadtest.py --participants 300 --concurrency 300 --processes 8
+
+Submissions go to a throwaway SQLite file unless ``--db`` is given.
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.testing.v1 import AppTest
+
+from banks import FEATURE_BUDGET, VALUE_FEATURES
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Serialises AppTest reruns within a worker process (see module docstring).
+_RUN_LOCK = threading.Lock()
+
+
+class Recorder:
+    """Thread-safe collector of rerun latencies keyed by page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.state_bytes = []
+        self.errors = []
+
+    def add(self, page, seconds):
+        with self._lock:
+            self.latencies.setdefault(page, []).append(seconds)
+
+    def add_state_size(self, nbytes):
+        with self._lock:
+            self.state_bytes.append(nbytes)
+
+    def add_error(self, message):
+        with self._lock:
+            self.errors.append(message)
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * q / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def max_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class Participant:
+    def __init__(self, seed, recorder, think_time):
+        self.rnd = random.Random(seed)
+        self.recorder = recorder
+        self.think_time = think_time
+        self.at = AppTest.from_file(APP_PATH, default_timeout=120)
+
+    # ---- primitives ----
+
+    def _page(self):
+        return self.at.session_state["page"] if "page" in self.at.session_state else 0
+
+    def _rerun(self, widget_action=None):
+        if self.think_time:
+            time.sleep(self.rnd.expovariate(1.0 / self.think_time))
+        page = self._page()
+        with _RUN_LOCK:
+            if widget_action is not None:
+                widget_action()
+            t0 = time.perf_counter()
+            self.at.run()
+            self.recorder.add(page, time.perf_counter() - t0)
+        if self.at.exception:
+            raise RuntimeError(f"page {page}: {self.at.exception[0].message}")
+
+    def click_key(self, key):
+        self._rerun(self.at.button(key=key).click)
+
+    def click_label(self, label):
+        for b in self.at.button:
+            if b.label == label and not b.disabled:
+                self._rerun(b.click)
+                return
+        raise RuntimeError(f"page {self._page()}: no enabled button {label!r}")
+
+    def option_groups(self):
+        """Map each visible choice question id to its option-button keys."""
+        groups = {}
+        for b in self.at.button:
+            if b.key and "_opt_" in b.key:
+                groups.setdefault(b.key.rsplit("_opt_", 1)[0], []).append(b.key)
+        return groups
+
+    def answer_visible_choices(self):
+        for qid, keys in self.option_groups().items():
+            if qid in ("time", "react"):
+                continue
+            self.click_key(self.rnd.choice(keys))
+        # READINESS_CHOICE_STYLE=radio: one radio per question, whose values
+        # are the option indices.
+        for key in [r.key for r in self.at.radio if r.key and r.key.endswith("_radio")]:
+            radio = self.at.radio(key=key)
+            self._rerun(lambda radio=radio: radio.set_value(self.rnd.randrange(len(radio.options))))
+
+    def set_sliders(self):
+        # Look each widget up again after every rerun: elements from an
+        # earlier run no longer belong to the current tree.
+        for key in [s.key for s in self.at.slider]:
+            slider = self.at.slider(key=key)
+            self._rerun(lambda slider=slider: slider.set_value(self.rnd.randint(1, 5)))
+
+    # ---- flow ----
+
+    def run(self):
+        self._rerun()
+        self.click_label("Start ▸")
+
+        for b in [b.key for b in self.at.button if b.key and b.key.startswith("btn_opp_")]:
+            if self.rnd.random() < 0.5:
+                self.click_key(b)
+        self.click_label("Next ▸")
+
+        while True:
+            self.answer_visible_choices()
+            labels = {b.label: b for b in self.at.button}
+            if "Next decision ▸" in labels and not labels["Next decision ▸"].disabled:
+                self.click_label("Next decision ▸")
+            else:
+                self.click_label("Continue to next game ▸")
+                break
+
+        for _ in (3, 4):
+            self.answer_visible_choices()
+            self.click_label("Next ▸")
+
+        budget_left = FEATURE_BUDGET
+        for f in VALUE_FEATURES:
+            if self.rnd.random() < 0.5 and f["cost"] <= budget_left:
+                self.click_key(f"btn_{f['key']}")
+                budget_left -= f["cost"]
+        self.click_label("Next ▸")
+
+        self.set_sliders()
+        self.answer_visible_choices()
+        self.click_label("Next ▸")
+
+        self.set_sliders()
+        self.click_key(f"time_opt_{self.rnd.randrange(4)}")
+        self.click_key(f"react_opt_{self.rnd.randrange(3)}")
+        for key in [c.key for c in self.at.checkbox]:
+            if self.rnd.random() < 0.5:
+                self._rerun(self.at.checkbox(key=key).check)
+        self.click_label("Next ▸")
+
+        self.answer_visible_choices()
+        self.click_label("Submit & see readiness profile ▸")
+        if self._page() != 9 or not self.at.metric:
+            raise RuntimeError("did not reach the Readiness Profile")
+        # Re-render the profile once more, as a participant scrolling or
+        # resizing would.
+        self._rerun()
+
+        state = {k: v for k, v in self.at.session_state.to_dict().items() if not callable(v)}
+        self.recorder.add_state_size(len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)))
+
+
+def _run_one(seed, recorder, think_time):
+    try:
+        Participant(seed, recorder, think_time).run()
+    except Exception as exc:  # keep the run going and report failures at the end
+        recorder.add_error(f"participant {seed}: {exc}")
+
+
+def _worker(seeds, sessions, think_time, db_path, choice_style):
+    """Run ``seeds`` participants with up to ``sessions`` open at once;
+    returns this process's measurements."""
+    # Read by store.py / sessions.py / reports.py / app.py when the app first
+    # runs, i.e. after this point. Only the response store is shared; resume
+    # tokens and cached reports stay in this worker's own temp dir.
+    work_dir = tempfile.mkdtemp(prefix="loadtest-worker-")
+    os.environ["READINESS_DB"] = db_path
+    os.environ["READINESS_SESSIONS_DB"] = os.path.join(work_dir, "sessions.sqlite3")
+    os.environ["READINESS_REPORTS"] = os.path.join(work_dir, "reports")
+    os.environ["READINESS_CHOICE_STYLE"] = choice_style
+
+    # One warm-up participant so imports and process-wide caches are loaded
+    # before the baseline memory reading.
+    warm = Recorder()
+    _run_one(-1 - seeds[0], warm, 0.0)
+    baseline_mb = max_rss_mb()
+
+    recorder = Recorder()
+    recorder.errors.extend(warm.errors)
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for seed in seeds:
+            pool.submit(_run_one, seed, recorder, think_time)
+    return {
+        "latencies": recorder.latencies,
+        "state_bytes": recorder.state_bytes,
+        "errors": recorder.errors,
+        "baseline_mb": baseline_mb,
+        "peak_mb": max_rss_mb(),
+        "sessions": min(sessions, len(seeds)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent headless load test for app.py.")
+    parser.add_argument("--participants", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20,
+                        help="sessions open at the same time, across all processes")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean seconds between clicks (exponential); 0 = click as fast as possible")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", default=None, help="response store path (default: a temp file)")
+    parser.add_argument("--choice-style", choices=("buttons", "radio"), default="buttons",
+                        help="how app.py renders multiple-choice questions")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "responses.sqlite3")
+    processes = max(1, min(args.processes, args.concurrency, args.participants))
+    seeds = [list(range(args.seed + i, args.seed + args.participants, processes)) for i in range(processes)]
+    sessions = [max(1, args.concurrency // processes + (i < args.concurrency % processes)) for i in range(processes)]
+
+    t0 = time.perf_counter()
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        results = pool.starmap(
+            _worker,
+            [(seeds[i], sessions[i], args.think_time, db_path, args.choice_style) for i in range(processes)],
+        )
+    wall = time.perf_counter() - t0
+
+    latencies = {}
+    errors = []
+    state_bytes = []
+    for r in results:
+        for page, vals in r["latencies"].items():
+            latencies.setdefault(page, []).extend(vals)
+        errors.extend(r["errors"])
+        state_bytes.extend(r["state_bytes"])
+
+    done = args.participants - sum(1 for e in errors if not e.startswith("participant -"))
+    reruns = sum(len(v) for v in latencies.values())
+    print(f"{done}/{args.participants} participants completed in {wall:.1f}s "
+          f"({args.concurrency} concurrent sessions over {processes} processes, {reruns / wall:.0f} reruns/s)")
+    print(f"{'page':<34}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    labels = _page_labels()
+    for page in sorted(latencies):
+        vals = sorted(latencies[page])
+        print(f"{labels.get(page, str(page)):<34}{len(vals):>8}"
+              + "".join(f"{percentile(vals, q) * 1000:>10.1f}" for q in (50, 95, 99))
+              + f"{vals[-1] * 1000:>10.1f}")
+    per_session = max((r["peak_mb"] - r["baseline_mb"]) / r["sessions"] for r in results)
+    print(f"peak RSS per process {max(r['peak_mb'] for r in results):.0f} MiB "
+          f"(baseline {min(r['baseline_mb'] for r in results):.0f} MiB); "
+          f"peak ~{per_session:.2f} MiB per open session")
+    if state_bytes:
+        sizes = sorted(state_bytes)
+        print(f"session state at submit: median {percentile(sizes, 50) / 1024:.1f} KiB pickled, "
+              f"max {sizes[-1] / 1024:.1f} KiB")
+    for err in errors[:10]:
+        print("ERROR", err)
+    return 1 if errors else 0
+
+
+def _page_labels():
+    # PAGE_LABELS lives in app.py, which can't be imported outside Streamlit;
+    # read the literal instead.
+    import ast
+
+    with open(APP_PATH, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "PAGE_LABELS":
+            return {i: f"{i} {label}" for i, label in enumerate(ast.literal_eval(node.value))}
+    return {}
+
+
+if __name__ == "__main__":
+    sys.exit(main())
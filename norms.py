@@ -0,0 +1,98 @@
+"""Percentile norms: where a participant's scores sit in a stored norm group.
+
+A norm group is every submission in one response store (the default store,
+or one tenant's). It is compiled into a :class:`NormTable` from the store's
+per-metric quantile sketches (metrics: total, components,
+``"{group}.{subdim}"``), which the store keeps up to date as submissions are
+written. Building a table reads those few hundred rows, however many people
+are in the group, and never scans the responses. For each metric the table
+holds the sketch's sorted values and cumulative weights, so a lookup is two
+bisects. Percentiles are approximate, typically within half a percentile
+(sketches.py).
+
+:class:`Norms` rebuilds the table on a background thread every
+``NORMS_REFRESH`` seconds. Results pages read the latest table and never
+touch the store themselves.
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+log = logging.getLogger(__name__)
+
+NORMS_REFRESH = float(os.environ.get("READINESS_NORMS_REFRESH", "60"))
+# Percentiles against fewer respondents than this are not shown.
+MIN_NORM_GROUP = int(os.environ.get("READINESS_MIN_NORM_GROUP", "30"))
+
+
+class NormTable:
+    """Sorted values and cumulative weights per metric."""
+
+    def __init__(self, sketches, built_at):
+        total = sketches.get("total")
+        self.size = total.count if total is not None else 0
+        self.built_at = built_at
+        self._values = {}
+        self._cum = {}
+        for metric, sketch in sketches.items():
+            if sketch.count:
+                self._values[metric], self._cum[metric] = sketch.cumulative()
+
+    def percentile(self, metric, value):
+        """Percent of the norm group scoring below ``value``, counting ties
+        as half (mid-rank), or None if the metric has no data."""
+        values = self._values.get(metric)
+        if not values:
+            return None
+        cum = self._cum[metric]
+        i = bisect_left(values, value)
+        j = bisect_right(values, value)
+        under = cum[i - 1] if i else 0
+        upto = cum[j - 1] if j else 0
+        return 100.0 * (under + 0.5 * (upto - under)) / cum[-1]
+
+
+class Norms:
+    """The latest :class:`NormTable` for one response store, rebuilt in the
+    background when it is older than ``refresh`` seconds."""
+
+    def __init__(self, store, refresh=NORMS_REFRESH):
+        self.store = store
+        self.refresh = refresh
+        self._table = None
+        self._building = False
+        self._lock = threading.Lock()
+        self._maybe_rebuild()
+
+    def table(self):
+        """The current table (None until the first build finishes). Starts a
+        rebuild if it is stale; never waits for one."""
+        self._maybe_rebuild()
+        return self._table
+
+    def _maybe_rebuild(self):
+        with self._lock:
+            table = self._table
+            if self._building or (table is not None and time.time() - table.built_at < self.refresh):
+                return
+            self._building = True
+        threading.Thread(target=self._rebuild, name="norms-rebuild", daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            self._table = NormTable(self.store.read_aggregates()["sketches"], time.time())
+        except Exception:
+            # Keep serving the previous table; the next call retries.
+            log.warning("could not rebuild norms for %s", self.store.path, exc_info=True)
+        finally:
+            with self._lock:
+                self._building = False
+
+
+def ordinal(n):
+    n = int(n)
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
@@ -0,0 +1,155 @@
+"""Answer-order (position bias) analysis.
+
+Options are shuffled independently for every participant, so if position did
+not matter, the display position of the option someone picks would be
+uniform whatever the options' content. For each multiple-choice question
+this reports how often the option shown in each position was picked, the
+first-position rate against its expected ``1/k`` (lift, z and two-sided p
+from the normal approximation), and a chi-square statistic against a uniform
+spread over positions.
+
+Orders are read from the ``orders`` column of the response store (Lehmer
+ranks, see orders.py) and decoded with array operations, question by
+question, so the full history is analysed in one pass over the table.
+
+    python order_effects.py data/responses.sqlite3
+    python order_effects.py data/tenants/acme.sqlite3 --out reports/order_effects.csv
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from banks import ACUMEN_QUESTIONS, BANK, MINDSET_QUESTIONS, SKILL_QUESTIONS
+from orders import unrank_many
+
+QUESTIONS = {**MINDSET_QUESTIONS, **SKILL_QUESTIONS, **ACUMEN_QUESTIONS}
+
+# ============== READING ==============
+
+
+def load_choices(path, bank_version=BANK.VERSION, batch_size=10_000):
+    """``{qid: (choices, ranks)}`` int arrays over every stored response to
+    ``bank_version`` that recorded its option orders. Raises
+    FileNotFoundError if there is no store at ``path`` and ValueError if the
+    file is not a response store or predates option-order recording."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"no response store at {path}")
+    choices = {qid: [] for qid in QUESTIONS}
+    ranks = {qid: [] for qid in QUESTIONS}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        try:
+            cur = conn.execute(
+                "SELECT answers, orders FROM responses WHERE bank_version = ? AND orders IS NOT NULL",
+                (bank_version,),
+            )
+        except sqlite3.DatabaseError as exc:
+            raise ValueError(f"{path} is not a response store with option orders ({exc})") from exc
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for answers, orders in rows:
+                answers, orders = json.loads(answers), json.loads(orders)
+                for qid, rank in orders.items():
+                    choice = answers.get(f"{qid}_choice")
+                    if choice is not None and qid in choices:
+                        choices[qid].append(choice)
+                        ranks[qid].append(rank)
+    finally:
+        conn.close()
+    return {
+        qid: (np.array(choices[qid], dtype=np.int64), np.array(ranks[qid], dtype=np.int64))
+        for qid in QUESTIONS
+    }
+
+# ============== ANALYSIS ==============
+
+
+def shown_positions(choices, ranks, n_options):
+    """Display position of each picked option."""
+    orders = unrank_many(ranks, n_options)
+    return np.argmax(orders == choices[:, None], axis=1)
+
+
+def position_bias(data):
+    """One row per question: pick rate by display position and tests of the
+    first-position rate and of uniformity."""
+    rows = []
+    for qid, (choices, ranks) in data.items():
+        k = len(QUESTIONS[qid]["options"])
+        n = len(choices)
+        row = {"qid": qid, "n": n, "options": k}
+        if n:
+            counts = np.bincount(shown_positions(choices, ranks, k), minlength=k)
+            rates = counts / n
+            expected = 1 / k
+            z = (rates[0] - expected) / math.sqrt(expected * (1 - expected) / n)
+            row.update({
+                "position_rates": json.dumps([round(float(r), 4) for r in rates]),
+                "first_rate": float(rates[0]),
+                "first_lift": float(rates[0] / expected),
+                "first_z": float(z),
+                "first_p": math.erfc(abs(z) / math.sqrt(2)),
+                "chi2": float(((counts - n * expected) ** 2 / (n * expected)).sum()),
+                "dof": k - 1,
+            })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def pooled_first_position(data):
+    """Observed and expected first-position picks summed over all questions."""
+    observed = expected = total = 0.0
+    for qid, (choices, ranks) in data.items():
+        if len(choices):
+            k = len(QUESTIONS[qid]["options"])
+            observed += float((shown_positions(choices, ranks, k) == 0).sum())
+            expected += len(choices) / k
+            total += len(choices)
+    return observed, expected, total
+
+# ============== CLI ==============
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Position-bias analysis of shuffled answer options.")
+    parser.add_argument("store", help="response store (.sqlite3)")
+    parser.add_argument("--out", help="CSV file for the per-question table")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        data = load_choices(args.store)
+    except (FileNotFoundError, ValueError) as exc:
+        sys.exit(str(exc))
+    table = position_bias(data)
+    observed, expected, total = pooled_first_position(data)
+    elapsed = time.perf_counter() - t0
+
+    if not total:
+        print("no responses with recorded option orders for the current question bank")
+        return
+    pd.set_option("display.width", 160)
+    print(f"{int(total):,} answers with recorded orders analysed in {elapsed:.1f}s")
+    print(f"first position picked {observed / total:.1%} of the time "
+          f"(expected {expected / total:.1%}, lift {observed / expected:.2f})\n")
+    print(table.round(4).to_string(index=False))
+    if args.out:
+        directory = os.path.dirname(args.out)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        table.to_csv(args.out, index=False)
+        print(f"\nwrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Option orders: seeded shuffles and their compact permutation indices.
+
+Each session shuffles a question's options with an RNG seeded from the
+session id and question id, so an order is reproducible from the stored
+session id alone. Submissions also record each order as its Lehmer rank: a
+single integer in ``[0, n!)``, not a list of positions. :func:`unrank_many`
+turns a column of ranks back into orders with a few array operations, for
+the position-bias analysis in order_effects.py.
+"""
+
+import random
+from math import factorial
+
+import numpy as np
+
+
+def session_order(seed, qid, n):
+    """The option order (display position -> option index) for ``qid``."""
+    order = list(range(n))
+    random.Random(f"{seed}:{qid}").shuffle(order)
+    return order
+
+
+def perm_rank(order):
+    """Lehmer rank of a permutation of ``range(len(order))``."""
+    n = len(order)
+    rank = 0
+    remaining = list(range(n))
+    for i, value in enumerate(order):
+        digit = remaining.index(value)
+        rank += digit * factorial(n - 1 - i)
+        remaining.pop(digit)
+    return rank
+
+
+def perm_unrank(rank, n):
+    """Inverse of :func:`perm_rank`."""
+    remaining = list(range(n))
+    order = []
+    for i in range(n):
+        digit, rank = divmod(rank, factorial(n - 1 - i))
+        order.append(remaining.pop(digit))
+    return order
+
+
+def unrank_many(ranks, n):
+    """:func:`perm_unrank` over an array of ranks; returns an ``(len(ranks), n)``
+    array of orders. Ranks are int64, so ``n`` is at most 20."""
+    if n > 20:
+        raise ValueError("unrank_many supports at most 20 options")
+    ranks = np.asarray(ranks, dtype=np.int64).copy()
+    available = np.ones((len(ranks), n), dtype=bool)
+    orders = np.empty((len(ranks), n), dtype=np.int64)
+    for i in range(n):
+        digit, ranks = np.divmod(ranks, factorial(n - 1 - i))
+        # Index of the (digit+1)-th option still available in each row.
+        pick = np.argmax(np.cumsum(available, axis=1) > digit[:, None], axis=1)
+        orders[:, i] = pick
+        available[np.arange(len(ranks)), pick] = False
+    return orders
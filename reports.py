@@ -0,0 +1,201 @@
+"""Downloadable readiness reports.
+
+A report is a self-contained HTML page (inline CSS and an SVG bar chart, no
+scripts), styled to print cleanly, so "Print → Save as PDF" gives a PDF.
+
+Reports are rendered on a small thread pool, off the Streamlit script thread:
+:meth:`ReportRenderer.request` only queues the job, and the page polls
+:meth:`ReportRenderer.get` until it is done. Finished reports are cached on
+disk under a digest of the score vector and bank version, so identical
+results (common at the end of a workshop) are rendered once and shared by
+every session and process. The cache keeps the ``MAX_CACHED_REPORTS`` most
+recently used reports (by file mtime, which a read refreshes), and older ones
+are deleted after each render.
+
+A render that fails is logged and remembered, and it is not retried until
+the page asks for it with ``request(..., retry=True)``.
+"""
+
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from scoring import readiness_label, suggestion_for_user
+
+log = logging.getLogger(__name__)
+
+DEFAULT_REPORTS_DIR = os.environ.get("READINESS_REPORTS", os.path.join("data", "reports"))
+REPORT_WORKERS = int(os.environ.get("READINESS_REPORT_WORKERS", "2"))
+MAX_CACHED_REPORTS = int(os.environ.get("READINESS_REPORTS_MAX", "2000"))
+
+GROUPS = [
+    ("mindset", "Mindset", "MINDSET_SUBDIMS", "MINDSET_DESCRIPTIONS"),
+    ("skills", "Skills", "SKILL_AREAS", "SKILL_DESCRIPTIONS"),
+    ("resources", "Resources", "RESOURCE_SUBDIMS", "RESOURCE_DESCRIPTIONS"),
+    ("acumen", "Entrepreneurship / Business Acumen", "ACUMEN_SUBDIMS", "ACUMEN_DESCRIPTIONS"),
+]
+
+STYLE = """
+body { font-family: system-ui, -apple-system, "Segoe UI", sans-serif; color: #222; max-width: 46rem;
+       margin: 2rem auto; padding: 0 1rem; line-height: 1.45; }
+h1 { font-size: 1.6rem; margin-bottom: 0.2rem; }
+h2 { font-size: 1.2rem; margin-top: 1.8rem; border-bottom: 1px solid #ddd; }
+.total { font-size: 2.4rem; font-weight: 700; margin: 0.6rem 0 0; }
+.label { font-weight: 600; }
+li { margin: 0.3rem 0; }
+.desc { color: #555; }
+@media print { body { margin: 0; } h2 { break-after: avoid; } li { break-inside: avoid; } }
+"""
+
+
+def report_key(result, bank_version):
+    """Content address of a report: digest of the scores and bank version."""
+    total, comp_scores, sub_scores = result
+    payload = json.dumps([bank_version, total, comp_scores, sub_scores], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _inline_markdown(text):
+    """Escape ``text`` and turn its ``**bold**`` spans into <strong>."""
+    return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", html.escape(text))
+
+
+def _component_chart(comp_scores, components):
+    """Horizontal bars on the 0–5 scale, highest first (like the page's chart)."""
+    rows = sorted(components, key=lambda c: -comp_scores[c])
+    bar_h, gap, label_w, plot_w = 22, 10, 230, 360
+    height = len(rows) * (bar_h + gap) + 24
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{label_w + plot_w + 50}" height="{height}" '
+             'role="img" aria-label="Component scores" font-size="13">']
+    for tick in range(6):
+        x = label_w + plot_w * tick / 5
+        parts.append(f'<line x1="{x:.1f}" y1="0" x2="{x:.1f}" y2="{height - 20}" stroke="#e5e5e5"/>')
+        parts.append(f'<text x="{x:.1f}" y="{height - 6}" text-anchor="middle" fill="#777">{tick}</text>')
+    for i, comp in enumerate(rows):
+        y = i * (bar_h + gap)
+        score = comp_scores[comp]
+        width = plot_w * max(0.0, min(score, 5.0)) / 5
+        parts.append(f'<text x="{label_w - 8}" y="{y + bar_h - 6}" text-anchor="end">{html.escape(comp)}</text>')
+        parts.append(f'<rect x="{label_w}" y="{y}" width="{width:.1f}" height="{bar_h}" fill="#4c78a8"/>')
+        parts.append(f'<text x="{label_w + width + 6:.1f}" y="{y + bar_h - 6}">{score:.2f}</text>')
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def render_report_html(result, bank):
+    """The full report for one scoring result, as an HTML string."""
+    total, comp_scores, sub_scores = result
+    out = [
+        "<!DOCTYPE html>",
+        '<html lang="en"><head><meta charset="utf-8">',
+        "<title>Entrepreneurial Readiness Report</title>",
+        f"<style>{STYLE}</style></head><body>",
+        "<h1>Entrepreneurial Readiness Report</h1>",
+        f'<p class="total">{total} / 100</p>',
+        f'<p><span class="label">Interpretation:</span> {html.escape(readiness_label(total))}</p>',
+        f"<p>{_inline_markdown(suggestion_for_user(total, comp_scores))}</p>",
+        "<h2>Component Scores</h2>",
+        _component_chart(comp_scores, bank.COMPONENTS),
+        "<h2>Subdimension Details</h2>",
+    ]
+    for group, title, subdims, descriptions in GROUPS:
+        out.append(f"<h3>{html.escape(title)}</h3><ul>")
+        for sd in getattr(bank, subdims):
+            out.append(
+                f"<li><strong>{html.escape(sd)} – {sub_scores[group][sd]:.2f}/5</strong> · "
+                f'<span class="desc">{html.escape(getattr(bank, descriptions)[sd])}</span></li>'
+            )
+        out.append("</ul>")
+    out.append("</body></html>")
+    return "\n".join(out)
+
+
+class ReportRenderer:
+    """Background report rendering with a content-addressed disk cache."""
+
+    def __init__(self, directory=DEFAULT_REPORTS_DIR, workers=REPORT_WORKERS, max_cached=MAX_CACHED_REPORTS):
+        self.directory = directory
+        self.max_cached = max_cached
+        os.makedirs(directory, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-renderer")
+        self._pending = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.html")
+
+    def request(self, result, bank, retry=False):
+        """Queue a report for ``result`` unless it is cached, already queued
+        or failed (``retry`` queues a failed one again); returns its key for
+        :meth:`get`. Never waits for rendering."""
+        key = report_key(result, bank.VERSION)
+        with self._lock:
+            if retry:
+                self._failed.discard(key)
+            if key not in self._pending and key not in self._failed and not os.path.exists(self._path(key)):
+                self._pending[key] = self._pool.submit(self._render, key, result, bank)
+        return key
+
+    def get(self, key):
+        """The finished report as bytes, or None while it is rendering, if it
+        failed, or if it is not cached."""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                if not future.done():
+                    return None
+                del self._pending[key]
+                if future.exception() is not None:
+                    self._failed.add(key)
+                    log.error("report %s failed to render", key, exc_info=future.exception())
+                    return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # most recently used, for pruning
+            return data
+        except FileNotFoundError:
+            return None
+
+    def pending(self, key):
+        with self._lock:
+            return key in self._pending
+
+    def failed(self, key):
+        with self._lock:
+            return key in self._failed
+
+    def _render(self, key, result, bank):
+        data = render_report_html(result, bank).encode("utf-8")
+        # Write-then-rename, so readers never see a partial file.
+        tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        self._prune()
+
+    def _prune(self):
+        """Delete the least recently used reports beyond ``max_cached``."""
+        with os.scandir(self.directory) as it:
+            entries = [e for e in it if e.name.endswith(".html")]
+        if len(entries) <= self.max_cached:
+            return
+        by_age = []
+        for entry in entries:
+            try:
+                by_age.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+        by_age.sort()
+        for _, path in by_age[:len(by_age) - self.max_cached]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,192 @@
+"""Bulk offline scoring of answer exports.
+
+Reads a CSV or Parquet file with one row per respondent and columns named by
+the app's state keys (``opp_N``, ``feat_x``, ``{qid}_choice``, ``s_skill_*``,
+``res_*``, ``sup_*``), scores it with the vectorized cohort scorer and writes
+the Readiness Profile breakdown: ``total``, one column per component and one
+``"{group}.{subdim}"`` column per subdimension (or, with ``--nested``, the
+``comp_scores`` and ``sub_scores`` dicts as JSON, as the app shows them).
+
+The input is streamed in chunks and chunks are scored on a process pool, with
+only a few chunks in flight per worker, so memory stays flat however large
+the file is. Output rows keep the input order.
+
+    python score_cli.py exports/spring.csv scored/spring.csv --keep respondent_id
+    python score_cli.py exports/spring.parquet scored/spring.parquet --workers 8
+
+Parquet needs ``pyarrow``; CSV (optionally ``.gz``/``.bz2``/``.zip``/``.xz``)
+works with pandas alone.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from cohort import SUBDIM_GROUPS, row_to_result, score_frame
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _is_parquet(path):
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        sys.exit("Parquet input/output needs pyarrow (pip install pyarrow); use CSV otherwise.")
+
+
+# ============== READERS / WRITERS ==============
+
+
+def iter_chunks(path, chunk_size):
+    """Yield DataFrame chunks of at most ``chunk_size`` rows."""
+    if _is_parquet(path):
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        if self.header:
+            # Empty input: still leave a file behind.
+            open(self.path, "w").close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        _require_pyarrow()
+        self.path = path
+        self.writer = None
+
+    def write(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return ParquetWriter(path) if _is_parquet(path) else CsvWriter(path)
+
+
+# ============== SCORING ==============
+
+
+def nest(scored):
+    """Collapse :func:`score_frame` columns into ``total``, ``comp_scores``
+    and ``sub_scores`` (JSON strings)."""
+    totals, comps, subs = [], [], []
+    for _, row in scored.iterrows():
+        total, comp_scores, sub_scores = row_to_result(row)
+        totals.append(total)
+        comps.append(json.dumps(comp_scores, ensure_ascii=False))
+        subs.append(json.dumps(sub_scores, ensure_ascii=False))
+    return pd.DataFrame({"total": totals, "comp_scores": comps, "sub_scores": subs}, index=scored.index)
+
+
+def score_chunk(chunk, keep, nested):
+    """Worker entry point: score one chunk and prepend the ``keep`` columns."""
+    scored = score_frame(chunk)
+    if nested:
+        scored = nest(scored)
+    if keep:
+        scored = pd.concat([chunk[keep], scored], axis=1)
+    return scored
+
+
+def _checked(chunks, keep):
+    for chunk in chunks:
+        missing = [c for c in keep if c not in chunk.columns]
+        if missing:
+            raise SystemExit(f"--keep column(s) not in input: {', '.join(missing)}")
+        yield chunk
+
+
+def score_file(src, dst, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, keep=(), nested=False):
+    """Score ``src`` into ``dst``; returns the number of rows written."""
+    workers = workers or os.cpu_count() or 1
+    keep = list(keep)
+    writer = open_writer(dst)
+    rows = 0
+    chunks = _checked(iter_chunks(src, chunk_size), keep)
+    try:
+        if workers == 1:
+            for chunk in chunks:
+                out = score_chunk(chunk, keep, nested)
+                writer.write(out)
+                rows += len(out)
+            return rows
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # A bounded window of submitted chunks keeps memory flat while
+            # letting every worker stay busy; results are written in order.
+            max_in_flight = 2 * workers
+            pending = []
+            for chunk in chunks:
+                pending.append(pool.submit(score_chunk, chunk, keep, nested))
+                if len(pending) >= max_in_flight:
+                    out = pending.pop(0).result()
+                    writer.write(out)
+                    rows += len(out)
+            for future in pending:
+                out = future.result()
+                writer.write(out)
+                rows += len(out)
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet export of raw answers.")
+    parser.add_argument("input", help="CSV or Parquet file, one row per respondent")
+    parser.add_argument("output", help="CSV or Parquet file to write (format from the extension)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="scoring processes")
+    parser.add_argument("--keep", default="", help="comma-separated input columns to copy to the output")
+    parser.add_argument("--nested", action="store_true",
+                        help="write comp_scores/sub_scores as JSON instead of one column per score")
+    args = parser.parse_args(argv)
+
+    keep = [c for c in args.keep.split(",") if c]
+    t0 = time.perf_counter()
+    rows = score_file(args.input, args.output, args.chunk_size, args.workers, keep, args.nested)
+    elapsed = time.perf_counter() - t0
+    groups = ", ".join(SUBDIM_GROUPS)
+    print(f"scored {rows:,} respondents in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f}/s) "
+          f"-> {args.output} (total, components, {groups})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Session-free scoring engine.
+
+Every scorer takes a plain ``answers`` mapping keyed by the same state keys the
+app uses (``opp_N``, ``feat_x``, ``{qid}_choice``, ``s_skill_*``, ``res_*``,
+``sup_*``). The app passes a packed-answer view of the session; offline jobs
+pass dicts loaded from storage.
+
+Scorers also take an optional ``bank`` (a compiled :class:`banks.Bank`); the
+app passes the version a session is pinned to. Without one they score against
+the bank loaded at import.
+"""
+
+from banks import BANK, DERIVED_RESOURCE_SUBDIMS, SCORED_COMPONENTS
+from instrumentation import timed
+
+
+def extract_answers(answers, bank=None):
+    """Copy the scored keys out of ``answers`` (e.g. the session's packed
+    answers) into a plain dict suitable for storage or offline re-scoring."""
+    bank = bank or BANK
+    return {k: answers[k] for k in bank.ANSWER_KEYS if k in answers}
+
+
+@timed
+def compute_opportunity_score(answers, bank=None):
+    bank = bank or BANK
+    tp = fp = fn = 0
+    for sc in bank.OPP_SCENARIOS:
+        selected = answers.get(sc["key"], False)
+        if sc["is_opportunity"]:
+            if selected:
+                tp += 1
+            else:
+                fn += 1
+        else:
+            if selected:
+                fp += 1
+    if bank.OPP_TOTAL_TRUE == 0:
+        return 1.0
+    raw = tp - 0.5 * fp - fn
+    norm = max(0.0, min(1.0, raw / bank.OPP_TOTAL_TRUE))
+    return round(1 + 4 * norm, 2)
+
+
+@timed
+def compute_value_creation_score(answers, bank=None):
+    bank = bank or BANK
+    selected = [f for f in bank.VALUE_FEATURES if answers.get(f["key"], False)]
+    if not selected:
+        return 1.0
+    selected_value = sum(f["ideal_points"] for f in selected)
+    norm = max(0.0, min(1.0, selected_value / bank.VALUE_MAX_POINTS))
+    return round(1 + 4 * norm, 2)
+
+
+def get_mc_score(answers, qdict, qid: str):
+    q = qdict[qid]
+    idx = answers.get(f"{qid}_choice", None)
+    if idx is None:
+        return None
+    if 0 <= idx < len(q["scores"]):
+        return float(q["scores"][idx])
+    return None
+
+
+def _mean_or_one(values):
+    return round(sum(values) / len(values), 2) if values else 1.0
+
+
+# ============== PER-SUBDIMENSION SCORERS ==============
+# Each component is the mean of its subdimensions, and each subdimension
+# depends only on its own answers. The full scorers below are built from these
+# so the incremental scorer can recompute one subdimension with exactly the
+# same arithmetic.
+
+
+def mindset_subdim_score(answers, sd, bank=None):
+    bank = bank or BANK
+    values = []
+    if sd == "Opportunity Recognition":
+        values.append(compute_opportunity_score(answers, bank))
+    elif sd == "Value Creation Focus":
+        values.append(compute_value_creation_score(answers, bank))
+    for qid in bank.MINDSET_QIDS_BY_SUBDIM.get(sd, ()):
+        s = get_mc_score(answers, bank.MINDSET_QUESTIONS, qid)
+        if s is not None:
+            values.append(s)
+    return _mean_or_one(values)
+
+
+def skill_subdim_score(answers, skill, bank=None):
+    bank = bank or BANK
+    vals = []
+    slider_key = bank.SKILL_SLIDER_MAP.get(skill)
+    if slider_key is not None:
+        v = answers.get(slider_key)
+        if v is not None:
+            vals.append(float(v))
+    for sid in bank.SKILL_SCENARIO_MAP.get(skill, []):
+        s = get_mc_score(answers, bank.SKILL_QUESTIONS, sid)
+        if s is not None:
+            vals.append(s)
+    return _mean_or_one(vals)
+
+
+def resource_subdim_score(answers, sd, bank=None):
+    bank = bank or BANK
+    if sd == "Time":
+        return float(bank.TIME_PATTERN_SCORES.get(answers.get("res_time_pattern"), 2))
+    if sd == "Support":
+        support_count = 0
+        for key in bank.SUPPORT_KEYS:
+            if answers.get(key, False):
+                support_count += 1
+        react_score = float(bank.SUPPORT_REACTION_SCORES.get(answers.get("sup_reaction"), 3))
+        support_base = 1 + (support_count / len(bank.SUPPORT_KEYS)) * 4
+        return round((support_base + react_score) / 2.0, 2)
+    return float(answers.get(bank.RESOURCE_LEVEL_KEYS[sd], 3))
+
+
+def acumen_subdim_score(answers, sd, bank=None):
+    bank = bank or BANK
+    values = []
+    for qid in bank.ACUMEN_QIDS_BY_SUBDIM.get(sd, ()):
+        s = get_mc_score(answers, bank.ACUMEN_QUESTIONS, qid)
+        if s is not None:
+            values.append(s)
+    return _mean_or_one(values)
+
+
+def resource_subdims(bank=None):
+    """Resource subdimensions in scoring order: the slider levels, then Time
+    and Support."""
+    bank = bank or BANK
+    return list(bank.RESOURCE_LEVEL_KEYS) + list(DERIVED_RESOURCE_SUBDIMS)
+
+
+# ============== COMPONENT SCORERS ==============
+
+
+@timed
+def compute_mindset_scores(answers, bank=None):
+    bank = bank or BANK
+    sub_scores = {sd: mindset_subdim_score(answers, sd, bank) for sd in bank.MINDSET_SUBDIMS}
+    overall = round(sum(sub_scores.values()) / len(bank.MINDSET_SUBDIMS), 2)
+    return overall, sub_scores
+
+
+@timed
+def compute_skill_scores(answers, bank=None):
+    bank = bank or BANK
+    skill_scores = {skill: skill_subdim_score(answers, skill, bank) for skill in bank.SKILL_AREAS}
+    overall = round(sum(skill_scores.values()) / len(bank.SKILL_AREAS), 2)
+    return overall, skill_scores
+
+
+@timed
+def compute_resource_scores(answers, bank=None):
+    bank = bank or BANK
+    sub_scores = {sd: resource_subdim_score(answers, sd, bank) for sd in resource_subdims(bank)}
+    overall = round(sum(sub_scores.values()) / len(sub_scores), 2)
+    return overall, sub_scores
+
+
+@timed
+def compute_acumen_scores(answers, bank=None):
+    bank = bank or BANK
+    sub_scores = {sd: acumen_subdim_score(answers, sd, bank) for sd in bank.ACUMEN_SUBDIMS}
+    overall = round(sum(sub_scores.values()) / len(bank.ACUMEN_SUBDIMS), 2)
+    return overall, sub_scores
+
+
+# Component name of each sub-score group, in the order they add up to the total.
+GROUP_COMPONENTS = dict(zip(("mindset", "skills", "resources", "acumen"), SCORED_COMPONENTS))
+
+
+def _weighted_total(comp_scores, bank):
+    total = 0.0
+    for comp, score in comp_scores.items():
+        total += (score / 5.0) * bank.COMP_WEIGHTS[comp]
+    return round(total, 1)
+
+
+@timed
+def compute_overall_scores(answers, bank=None):
+    bank = bank or BANK
+    mindset_overall, mindset_sub = compute_mindset_scores(answers, bank)
+    skills_overall, skills_sub = compute_skill_scores(answers, bank)
+    res_overall, res_sub = compute_resource_scores(answers, bank)
+    ac_overall, ac_sub = compute_acumen_scores(answers, bank)
+    comp_scores = dict(zip(SCORED_COMPONENTS, (mindset_overall, skills_overall, res_overall, ac_overall)))
+    total = _weighted_total(comp_scores, bank)
+    return total, comp_scores, {
+        "mindset": mindset_sub,
+        "skills": skills_sub,
+        "resources": res_sub,
+        "acumen": ac_sub,
+    }
+
+
+# ============== INCREMENTAL SCORING ==============
+
+SUBDIM_SCORERS = {
+    "mindset": mindset_subdim_score,
+    "skills": skill_subdim_score,
+    "resources": resource_subdim_score,
+    "acumen": acumen_subdim_score,
+}
+
+_DEPENDENCIES = {}
+
+
+def answer_dependencies(bank=None):
+    """Map every answer key to the ``(group, subdim)`` it feeds."""
+    bank = bank or BANK
+    deps = _DEPENDENCIES.get(bank.VERSION)
+    if deps is not None:
+        return deps
+    deps = {}
+    for sc in bank.OPP_SCENARIOS:
+        deps[sc["key"]] = ("mindset", "Opportunity Recognition")
+    for f in bank.VALUE_FEATURES:
+        deps[f["key"]] = ("mindset", "Value Creation Focus")
+    for qid, q in bank.MINDSET_QUESTIONS.items():
+        deps[f"{qid}_choice"] = ("mindset", q["subdim"])
+    for skill, key in bank.SKILL_SLIDER_MAP.items():
+        deps[key] = ("skills", skill)
+    for skill, qids in bank.SKILL_SCENARIO_MAP.items():
+        for qid in qids:
+            deps[f"{qid}_choice"] = ("skills", skill)
+    for sd, key in bank.RESOURCE_LEVEL_KEYS.items():
+        deps[key] = ("resources", sd)
+    deps["res_time_pattern"] = ("resources", "Time")
+    for key in list(bank.SUPPORT_KEYS) + ["sup_reaction"]:
+        deps[key] = ("resources", "Support")
+    for qid, q in bank.ACUMEN_QUESTIONS.items():
+        deps[f"{qid}_choice"] = ("acumen", q["subdim"])
+    return _DEPENDENCIES.setdefault(bank.VERSION, deps)
+
+
+class IncrementalScorer:
+    """Keeps a running ``(total, comp_scores, sub_scores)`` for one answer
+    mapping and, after an answer changes, recomputes only the subdimension
+    that key feeds, that subdimension's component and the total.
+
+        scorer = IncrementalScorer(answers, bank)
+        answers.set("ms_res_1_choice", 2)
+        scorer.update("ms_res_1_choice")
+
+    Results are identical to :func:`compute_overall_scores` on the same answers.
+    """
+
+    def __init__(self, answers, bank=None):
+        self.answers = answers
+        self.bank = bank or BANK
+        self.deps = answer_dependencies(self.bank)
+        self.total, self.comp_scores, self.sub_scores = compute_overall_scores(answers, self.bank)
+
+    def update(self, *keys):
+        """Refresh the scores after ``keys`` changed in ``answers``. Returns
+        the new total."""
+        touched = set()
+        for key in keys:
+            dep = self.deps.get(key)
+            if dep is None or dep in touched:
+                continue
+            touched.add(dep)
+            group, sd = dep
+            subs = self.sub_scores[group]
+            subs[sd] = SUBDIM_SCORERS[group](self.answers, sd, self.bank)
+            self.comp_scores[GROUP_COMPONENTS[group]] = round(sum(subs.values()) / len(subs), 2)
+        if touched:
+            self.total = _weighted_total(self.comp_scores, self.bank)
+        return self.total
+
+    def result(self):
+        """A copy in the :func:`compute_overall_scores` shape."""
+        return (
+            self.total,
+            dict(self.comp_scores),
+            {group: dict(subs) for group, subs in self.sub_scores.items()},
+        )
+
+
+def score_batch(cohort, bank=None):
+    """Score an iterable of answer mappings; returns one result per respondent.
+
+    Each result has the same ``(total, comp_scores, sub_scores)`` shape as
+    :func:`compute_overall_scores`.
+    """
+    return [compute_overall_scores(answers, bank) for answers in cohort]
+
+
+# (minimum total, label), highest band first.
+READINESS_BANDS = [
+    (85, "High readiness to pursue or accelerate a venture."),
+    (70, "Strong potential — ready for more serious experiments."),
+    (50, "Early-stage readiness — good time to build specific muscles."),
+    (float("-inf"), "Foundation-building phase — focus on learning and low-risk reps."),
+]
+
+
+def readiness_label(total_score):
+    for threshold, label in READINESS_BANDS:
+        if total_score >= threshold:
+            return label
+
+
+def suggestion_for_user(total_score, comp_scores):
+    sorted_comps = sorted(comp_scores, key=lambda c: comp_scores[c])
+    weakest = sorted_comps[0]
+    second_weakest = sorted_comps[1] if len(sorted_comps) > 1 else None
+    tail = (
+        f"Focus on strengthening **{weakest}**"
+        + (f" and **{second_weakest}**" if second_weakest else "")
+        + " through small, low-risk experiments."
+    )
+    if total_score < 50:
+        return (
+            "You’re in a foundation-building phase; this is a good time to build skills "
+            "without heavy pressure to launch. " + tail
+        )
+    elif total_score < 70:
+        return (
+            "You’re showing early-stage readiness; you can run real experiments while deliberately "
+            "building your thinner areas. " + tail
+        )
+    elif total_score < 85:
+        return (
+            "You have strong potential and a solid base; you can keep advancing a venture while "
+            "watching for bottlenecks. " + tail
+        )
+    else:
+        return (
+            "You’re showing high readiness; focus on building systems around your strengths and "
+            "avoiding blind spots in weaker components. " + tail
+        )
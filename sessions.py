@@ -0,0 +1,131 @@
+"""Server-side session snapshots for resuming after a dropped connection.
+
+The app saves a snapshot on every page transition under a random resume
+token, and puts the token in the URL (``?resume=<token>``) once the
+participant has left the first page. When a tab reconnects with that URL, the
+new Streamlit session starts from the snapshot instead of page 1. Tokens are
+single-use: claiming a snapshot deletes it, and the resumed session carries on
+under a fresh token, so a shared or copied link cannot fork one session into
+two.
+
+A snapshot is one small struct-packed blob: a fixed header (format, session
+id, bank version, page, max page, resource-question index, submitted flag)
+followed by the session's packed answer buffer (answer_buffer.py). Widget
+state is not stored; widgets are rebuilt from the answers. Snapshots expire
+after ``SNAPSHOT_TTL`` seconds, and expired rows are purged as new snapshots
+are written.
+
+Snapshots live in their own database file, apart from the response store and
+its writer thread. A failed read or write is logged and treated as "no
+snapshot"; it never breaks the page.
+"""
+
+import logging
+import os
+import secrets
+import sqlite3
+import struct
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SESSIONS_PATH = os.environ.get("READINESS_SESSIONS_DB", os.path.join("data", "sessions.sqlite3"))
+SNAPSHOT_TTL = float(os.environ.get("READINESS_RESUME_TTL", str(12 * 3600)))
+PURGE_INTERVAL = 300.0  # seconds between sweeps of expired snapshots
+BUSY_TIMEOUT = 5.0  # seconds to wait for a lock held by another process
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS session_snapshots (
+    token TEXT PRIMARY KEY,
+    saved_at REAL NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+FORMAT = 1
+# format, session id (uuid4), bank version (12 hex digits), page, max page,
+# resource-question index, submitted
+HEADER = struct.Struct("<B16s6sHHH?")
+
+
+def new_token():
+    return secrets.token_urlsafe(16)
+
+
+def pack_session(session_id, bank_version, page, max_page, res_q_idx, submitted, answer_buffer):
+    header = HEADER.pack(
+        FORMAT,
+        bytes.fromhex(session_id),
+        bytes.fromhex(bank_version),
+        page,
+        max_page,
+        res_q_idx,
+        submitted,
+    )
+    return header + answer_buffer
+
+
+def unpack_session(data):
+    """Inverse of :func:`pack_session`; returns a dict of session-state values
+    (``answers`` as raw buffer bytes), or None for an unknown format."""
+    if len(data) < HEADER.size or data[0] != FORMAT:
+        return None
+    _, sid, version, page, max_page, res_q_idx, submitted = HEADER.unpack_from(data)
+    return {
+        "session_id": sid.hex(),
+        "bank_version": version.hex(),
+        "page": page,
+        "max_page": max_page,
+        "res_q_idx": res_q_idx,
+        "submitted": submitted,
+        "answers": data[HEADER.size:],
+    }
+
+
+class SessionStore:
+    """Snapshots keyed by resume token, shared by all sessions in the process."""
+
+    def __init__(self, path=DEFAULT_SESSIONS_PATH, ttl=SNAPSHOT_TTL):
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._next_purge = 0.0
+
+    def save(self, token, data):
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO session_snapshots (token, saved_at, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(token) DO UPDATE SET saved_at = excluded.saved_at, data = excluded.data",
+                    (token, now, data),
+                )
+                if now >= self._next_purge:
+                    self._next_purge = now + PURGE_INTERVAL
+                    self._conn.execute("DELETE FROM session_snapshots WHERE saved_at < ?", (now - self.ttl,))
+        except sqlite3.Error:
+            log.warning("could not save session snapshot", exc_info=True)
+
+    def claim(self, token):
+        """Remove and return the snapshot saved under ``token``, or None if
+        missing, expired or unreadable."""
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "DELETE FROM session_snapshots WHERE token = ? RETURNING saved_at, data",
+                    (token,),
+                ).fetchone()
+        except sqlite3.Error:
+            log.warning("could not load session snapshot", exc_info=True)
+            return None
+        if row is None or row[0] < time.time() - self.ttl:
+            return None
+        return unpack_session(row[1])
@@ -0,0 +1,233 @@
+"""Synthetic respondents and Monte Carlo score distributions.
+
+Generates answer columns for every question bank directly as NumPy arrays,
+following configurable answer-propensity profiles, scores them with the
+vectorized cohort scorer and reports how totals fall into the
+``readiness_label`` bands. Use it to calibrate the band thresholds before
+changing them:
+
+    python simulate.py -n 2000000 --mix typical=0.6,novice=0.25,experienced=0.15
+    python simulate.py -n 2000000 --thresholds 45,65,80
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from banks import (
+    ACUMEN_QUESTIONS,
+    FEATURE_BUDGET,
+    MINDSET_QUESTIONS,
+    OPP_SCENARIOS,
+    RESOURCE_LEVEL_KEYS,
+    SKILL_QUESTIONS,
+    SKILL_SLIDER_MAP,
+    SUPPORT_KEYS,
+    SUPPORT_REACTION_SCORES,
+    TIME_PATTERN_SCORES,
+    VALUE_FEATURES,
+)
+from cohort import score_columns
+from scoring import READINESS_BANDS
+
+# Answer-propensity profiles.
+#   choice_skill     softmax sharpness over option scores (0 = pick uniformly)
+#   opp_hit          chance of flagging a real opportunity card
+#   opp_false_alarm  chance of flagging a non-opportunity card
+#   feature_skill    0..1, how strongly feature picks follow value per cost
+#   feature_rate     chance of wanting each feature before the budget is applied
+#   self_rating      distribution over slider values 1..5 (skills self-assessment)
+#   resource_level   distribution over slider values 1..5 (resources page)
+#   time / reaction  distributions over the time-pattern / reaction options
+#   support          chance of ticking each support checkbox
+PROFILES = {
+    "uniform": {
+        "choice_skill": 0.0,
+        "opp_hit": 0.5,
+        "opp_false_alarm": 0.5,
+        "feature_skill": 0.0,
+        "feature_rate": 0.5,
+        "self_rating": [0.2, 0.2, 0.2, 0.2, 0.2],
+        "resource_level": [0.2, 0.2, 0.2, 0.2, 0.2],
+        "time": [0.25, 0.25, 0.25, 0.25],
+        "reaction": [1 / 3, 1 / 3, 1 / 3],
+        "support": 0.5,
+    },
+    "novice": {
+        "choice_skill": 0.2,
+        "opp_hit": 0.55,
+        "opp_false_alarm": 0.45,
+        "feature_skill": 0.2,
+        "feature_rate": 0.6,
+        "self_rating": [0.15, 0.3, 0.35, 0.15, 0.05],
+        "resource_level": [0.25, 0.35, 0.25, 0.1, 0.05],
+        "time": [0.05, 0.2, 0.45, 0.3],
+        "reaction": [0.35, 0.45, 0.2],
+        "support": 0.4,
+    },
+    "typical": {
+        "choice_skill": 0.5,
+        "opp_hit": 0.7,
+        "opp_false_alarm": 0.3,
+        "feature_skill": 0.5,
+        "feature_rate": 0.55,
+        "self_rating": [0.05, 0.2, 0.4, 0.25, 0.1],
+        "resource_level": [0.1, 0.25, 0.35, 0.2, 0.1],
+        "time": [0.15, 0.35, 0.35, 0.15],
+        "reaction": [0.5, 0.35, 0.15],
+        "support": 0.55,
+    },
+    "experienced": {
+        "choice_skill": 1.2,
+        "opp_hit": 0.85,
+        "opp_false_alarm": 0.15,
+        "feature_skill": 0.85,
+        "feature_rate": 0.5,
+        "self_rating": [0.02, 0.08, 0.3, 0.4, 0.2],
+        "resource_level": [0.05, 0.15, 0.3, 0.3, 0.2],
+        "time": [0.35, 0.4, 0.2, 0.05],
+        "reaction": [0.65, 0.3, 0.05],
+        "support": 0.7,
+    },
+}
+
+_MC_BANKS = (MINDSET_QUESTIONS, SKILL_QUESTIONS, ACUMEN_QUESTIONS)
+_FEATURE_COST = np.array([f["cost"] for f in VALUE_FEATURES])
+_FEATURE_DENSITY = np.array([f["ideal_points"] / f["cost"] for f in VALUE_FEATURES])
+_FEATURE_DENSITY = (_FEATURE_DENSITY - _FEATURE_DENSITY.min()) / max(np.ptp(_FEATURE_DENSITY), 1e-9)
+
+
+def _option_probs(scores, skill):
+    w = np.exp(skill * np.asarray(scores, dtype=float))
+    return w / w.sum()
+
+
+def _sample_features(rng, profile, n):
+    """Pick features per row, then fill the budget greedily in each row's
+    priority order so no synthetic respondent is over budget (the app blocks
+    that at Game 5)."""
+    skill = profile["feature_skill"]
+    wanted = rng.random((n, len(VALUE_FEATURES))) < profile["feature_rate"]
+    priority = skill * _FEATURE_DENSITY + (1 - skill) * rng.random((n, len(VALUE_FEATURES)))
+    order = np.argsort(-priority, axis=1)
+    wanted_in_order = np.take_along_axis(wanted, order, axis=1)
+    cost_in_order = _FEATURE_COST[order]
+    # Walk the priority order, skipping any feature that no longer fits, so a
+    # costly pick early on does not rule out cheaper ones after it.
+    left = np.full(n, FEATURE_BUDGET)
+    taken_in_order = np.zeros_like(wanted)
+    for j in range(len(VALUE_FEATURES)):
+        take = wanted_in_order[:, j] & (cost_in_order[:, j] <= left)
+        taken_in_order[:, j] = take
+        left -= np.where(take, cost_in_order[:, j], 0)
+    chosen = np.zeros_like(wanted)
+    np.put_along_axis(chosen, order, taken_in_order, axis=1)
+    return chosen
+
+
+def generate_columns(rng, profile, n):
+    """Sample ``n`` respondents from one profile as ``state key -> array``."""
+    cols = {}
+    for sc in OPP_SCENARIOS:
+        p = profile["opp_hit"] if sc["is_opportunity"] else profile["opp_false_alarm"]
+        cols[sc["key"]] = rng.random(n) < p
+    chosen = _sample_features(rng, profile, n)
+    for j, f in enumerate(VALUE_FEATURES):
+        cols[f["key"]] = chosen[:, j]
+    for bank in _MC_BANKS:
+        for qid, q in bank.items():
+            probs = _option_probs(q["scores"], profile["choice_skill"])
+            cols[f"{qid}_choice"] = rng.choice(len(probs), size=n, p=probs)
+    levels = np.arange(1, 6)
+    for key in SKILL_SLIDER_MAP.values():
+        cols[key] = rng.choice(levels, size=n, p=profile["self_rating"])
+    for key in RESOURCE_LEVEL_KEYS.values():
+        cols[key] = rng.choice(levels, size=n, p=profile["resource_level"])
+    cols["res_time_pattern"] = rng.choice(len(TIME_PATTERN_SCORES), size=n, p=profile["time"])
+    for key in SUPPORT_KEYS:
+        cols[key] = rng.random(n) < profile["support"]
+    cols["sup_reaction"] = rng.choice(len(SUPPORT_REACTION_SCORES), size=n, p=profile["reaction"])
+    return cols
+
+
+def simulate_totals(n, mix, seed=0, chunk_size=500_000):
+    """Generate and score ``n`` respondents drawn from a profile ``mix``
+    (``{profile name: weight}``); returns the array of total scores."""
+    rng = np.random.default_rng(seed)
+    names = list(mix)
+    weights = np.array([mix[k] for k in names], dtype=float)
+    counts = rng.multinomial(n, weights / weights.sum())
+    totals = []
+    for name, count in zip(names, counts):
+        for start in range(0, count, chunk_size):
+            size = min(chunk_size, count - start)
+            cols = generate_columns(rng, PROFILES[name], size)
+            totals.append(score_columns(cols, size)["total"])
+    return np.concatenate(totals) if totals else np.empty(0)
+
+
+def band_distribution(totals, thresholds=None):
+    """Share of totals per readiness band, highest band first.
+
+    ``thresholds`` (strictly increasing) replaces the cut-offs from ``READINESS_BANDS``
+    to preview a recalibration; labels keep their order.
+    """
+    if thresholds is None:
+        thresholds = sorted(t for t, _ in READINESS_BANDS if t != float("-inf"))
+    # A total equal to a threshold belongs to the higher band, as in readiness_label.
+    band_idx = np.searchsorted(np.asarray(thresholds, dtype=float), totals, side="right")
+    counts = np.bincount(band_idx, minlength=len(thresholds) + 1)[::-1]
+    lows = list(reversed(thresholds)) + [float("-inf")]
+    labels = [label for _, label in READINESS_BANDS]
+    return [(low, label, int(c), c / max(len(totals), 1)) for low, label, c in zip(lows, labels, counts)]
+
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in PROFILES:
+            raise argparse.ArgumentTypeError(f"unknown profile {name!r}; choose from {', '.join(PROFILES)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo readiness-band simulator.")
+    parser.add_argument("-n", type=int, default=1_000_000, help="number of synthetic respondents")
+    parser.add_argument("--mix", type=_parse_mix, default={"typical": 1.0},
+                        help="profile weights, e.g. typical=0.6,novice=0.4")
+    parser.add_argument("--thresholds", default=None,
+                        help="comma-separated cut-offs to preview instead of the current ones")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    thresholds = None
+    if args.thresholds:
+        expected = len(READINESS_BANDS) - 1
+        try:
+            thresholds = [float(t) for t in args.thresholds.split(",")]
+        except ValueError:
+            parser.error(f"--thresholds must be numbers, got {args.thresholds!r}")
+        if len(thresholds) != expected:
+            parser.error(f"--thresholds needs {expected} cut-offs (one per band boundary), got {len(thresholds)}")
+        if any(a >= b for a, b in zip(thresholds, thresholds[1:])):
+            parser.error("--thresholds must be strictly increasing")
+    t0 = time.perf_counter()
+    totals = simulate_totals(args.n, args.mix, seed=args.seed)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{len(totals):,} respondents simulated and scored in {elapsed:.1f}s")
+    print("mix: " + ", ".join(f"{k}={v:g}" for k, v in args.mix.items()))
+    q = np.percentile(totals, [5, 10, 25, 50, 75, 90, 95])
+    print("total percentiles: " + "  ".join(
+        f"p{p}={v:.1f}" for p, v in zip((5, 10, 25, 50, 75, 90, 95), q)
+    ))
+    for low, label, count, share in band_distribution(totals, thresholds):
+        bound = "   <" if low == float("-inf") else f"≥{low:4.0f}"
+        print(f"  {bound}  {share:6.1%}  {count:>10,}  {label}")
+
+
+if __name__ == "__main__":
+    main()
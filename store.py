@@ -0,0 +1,523 @@
+"""Persistent response store.
+
+Submissions are appended to a local SQLite database. ``submit`` only puts the
+record on an in-memory queue; a background writer thread drains the queue and
+commits in batches, so a burst of participants finishing at once costs one
+transaction per batch and the Streamlit script never waits on disk I/O.
+
+Each batch also folds into running aggregates (per-metric count/sum/sum of
+squares, fixed histogram bins and per-question answer counts) in the same
+transaction, so dashboards read a few hundred small rows instead of rescanning
+every response. Each writer also keeps a KLL quantile sketch per metric
+(sketches.py) and stores it under its own writer id; readers merge the
+sketches of every writer, so several server processes can share one database.
+A writer that closes folds its sketches into a single compacted row, so the
+table holds one row per metric per running process rather than one per
+process ever started (rows left by a crashed process are folded in by
+:meth:`ResponseStore.rebuild_aggregates`).
+
+Answer counts are kept per question-bank version: a choice index only means
+something against the bank it was answered with, and option order or wording
+can change between versions.
+
+Multi-tenant runs keep one database per tenant (:func:`tenant_db_path`), so a
+cohort's dashboard only ever reads its own, small aggregates.
+
+A session is stored at most once: the first submission under a session id is
+kept and later ones are ignored, aggregates included. A batch that fails to
+commit is retried a few times, then logged and dropped, so one bad batch never
+stops the writer thread.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from sketches import KLLSketch
+
+log = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.environ.get("READINESS_DB", os.path.join("data", "responses.sqlite3"))
+# One database per tenant (client organisation / cohort), next to the default one.
+TENANTS_DIR = os.environ.get(
+    "READINESS_TENANTS_DIR", os.path.join(os.path.dirname(DEFAULT_DB_PATH), "tenants")
+)
+TENANT_ID_PATTERN = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
+
+BATCH_SIZE = 200  # max records per transaction
+FLUSH_INTERVAL = 1.0  # seconds a record may wait for its batch to fill
+WRITE_ATTEMPTS = 3  # tries per batch before it is dropped
+RETRY_DELAY = 0.5  # seconds before the first retry; doubles each time
+COMPACTED_WRITER = ""  # metric_sketches rows folded in from closed writers
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    submitted_at REAL NOT NULL,
+    session_id TEXT,
+    bank_version TEXT,
+    orders TEXT,
+    answers TEXT NOT NULL,
+    total REAL NOT NULL,
+    comp_scores TEXT NOT NULL,
+    sub_scores TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metric_aggregates (
+    metric TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    sum_sq REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metric_histogram (
+    metric TEXT NOT NULL,
+    bin INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (metric, bin)
+);
+CREATE TABLE IF NOT EXISTS metric_sketches (
+    metric TEXT NOT NULL,
+    writer TEXT NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (metric, writer)
+);
+CREATE TABLE IF NOT EXISTS answer_counts (
+    bank_version TEXT NOT NULL,  -- '' for responses from before versioning
+    answer_key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bank_version, answer_key, value)
+);
+"""
+
+# Histogram layout: the total is binned 0–100 in steps of 5; every other
+# metric is on the 1–5 scale, binned in steps of 0.25.
+TOTAL_BIN_WIDTH = 5.0
+TOTAL_BINS = 20
+SCALE_BIN_WIDTH = 0.25
+SCALE_BINS = 16
+
+
+def metric_bin(metric, value):
+    if metric == "total":
+        return min(TOTAL_BINS - 1, max(0, int(value // TOTAL_BIN_WIDTH)))
+    return min(SCALE_BINS - 1, max(0, int((value - 1) // SCALE_BIN_WIDTH)))
+
+
+def bin_start(metric, bin_idx):
+    if metric == "total":
+        return bin_idx * TOTAL_BIN_WIDTH
+    return 1 + bin_idx * SCALE_BIN_WIDTH
+
+
+def result_metrics(total, comp_scores, sub_scores):
+    """Flatten a scoring result into ``metric name -> value`` pairs."""
+    metrics = {"total": total}
+    metrics.update(comp_scores)
+    for group, subs in sub_scores.items():
+        for sd, value in subs.items():
+            metrics[f"{group}.{sd}"] = value
+    return metrics
+
+
+def _aggregate_increments(records):
+    """Reduce a batch of (bank_version, answers, total, comp_scores,
+    sub_scores) into aggregate-table increments."""
+    moments = {}
+    bins = {}
+    answers_seen = {}
+    for version, answers, total, comp_scores, sub_scores in records:
+        for metric, value in result_metrics(total, comp_scores, sub_scores).items():
+            m = moments.setdefault(metric, [0, 0.0, 0.0])
+            m[0] += 1
+            m[1] += value
+            m[2] += value * value
+            b = (metric, metric_bin(metric, value))
+            bins[b] = bins.get(b, 0) + 1
+        for key, value in answers.items():
+            a = (version or "", key, json.dumps(value, ensure_ascii=False))
+            answers_seen[a] = answers_seen.get(a, 0) + 1
+    return (
+        [(metric, c, s, sq) for metric, (c, s, sq) in moments.items()],
+        [(metric, b, c) for (metric, b), c in bins.items()],
+        [(version, key, value, c) for (version, key, value), c in answers_seen.items()],
+    )
+
+
+def _apply_increments(conn, moments, bins, answers_seen):
+    conn.executemany(
+        "INSERT INTO metric_aggregates (metric, count, sum, sum_sq) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(metric) DO UPDATE SET count = count + excluded.count, "
+        "sum = sum + excluded.sum, sum_sq = sum_sq + excluded.sum_sq",
+        moments,
+    )
+    conn.executemany(
+        "INSERT INTO metric_histogram (metric, bin, count) VALUES (?, ?, ?) "
+        "ON CONFLICT(metric, bin) DO UPDATE SET count = count + excluded.count",
+        bins,
+    )
+    conn.executemany(
+        "INSERT INTO answer_counts (bank_version, answer_key, value, count) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(bank_version, answer_key, value) DO UPDATE SET count = count + excluded.count",
+        answers_seen,
+    )
+
+
+def valid_tenant(tenant):
+    return bool(TENANT_ID_PATTERN.fullmatch(tenant))
+
+
+def tenant_db_path(tenant=None):
+    """Database for ``tenant``; ``None`` is the default, untenanted store.
+
+    Each tenant gets its own file, so its submissions and aggregates never
+    share a table (or a write lock) with another tenant's.
+    """
+    if tenant is None:
+        return DEFAULT_DB_PATH
+    if not valid_tenant(tenant):
+        raise ValueError(f"invalid tenant id: {tenant!r}")
+    return os.path.join(TENANTS_DIR, f"{tenant}.sqlite3")
+
+
+def connect(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+    if "bank_version" not in columns:
+        # Databases created before question banks were versioned.
+        conn.execute("ALTER TABLE responses ADD COLUMN bank_version TEXT")
+    if "orders" not in columns:
+        # ... and before option orders were recorded.
+        conn.execute("ALTER TABLE responses ADD COLUMN orders TEXT")
+    return conn
+
+
+class StoreClosed(RuntimeError):
+    """Raised by :meth:`ResponseStore.submit` after the store was closed."""
+
+
+class ResponseStore:
+    """Append-only store with a buffered, batched background writer."""
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._conn = connect(path)
+        # Dashboards refresh every few seconds; they share one read-only
+        # connection instead of opening (and migrating) a new one each time.
+        self._read_conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._read_lock = threading.Lock()
+        self._ensure_unique_sessions()
+        self._ensure_versioned_answer_counts()
+        # This instance's quantile sketches, one per metric. Only the writer
+        # thread (or a rebuild) touches them.
+        self.writer_id = uuid.uuid4().hex[:12]
+        self._sketches = {}
+        if self._needs_backfill():
+            self.rebuild_aggregates()
+        self._closed = False
+        # Held while queueing, so nothing lands behind close()'s sentinel.
+        self._submit_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._run, name="response-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def submit(self, answers, result, session_id=None, bank_version=None, orders=None):
+        """Queue one scored submission; returns immediately.
+
+        ``bank_version`` records which question-bank revision the answers'
+        choice indices refer to; ``orders`` maps question ids to the Lehmer
+        rank of the option order the participant saw (orders.py).
+
+        Raises :class:`StoreClosed` once :meth:`close` has started; the
+        submission was not queued and the caller should retry on a fresh store.
+        """
+        total, comp_scores, sub_scores = result
+        with self._submit_lock:
+            if self._closed:
+                raise StoreClosed(f"response store {self.path} is closed")
+            self._queue.put(
+                (time.time(), session_id, bank_version, orders, answers, total, comp_scores, sub_scores)
+            )
+
+    def flush(self):
+        """Block until everything queued so far has been committed."""
+        self._queue.join()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        atexit.unregister(self.close)
+        self._writer.join()
+        try:
+            self._fold_sketches()
+        except sqlite3.Error:
+            log.warning("could not fold sketches of writer %s", self.writer_id, exc_info=True)
+        self._read_conn.close()
+        self._conn.close()
+
+    def _next_batch(self):
+        first = self._queue.get()
+        batch = [first]
+        if first is None:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is None:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            rows = [r for r in batch if r is not None]
+            try:
+                if rows:
+                    self._write_with_retry(rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(rows) < len(batch):
+                return
+
+    def _write_with_retry(self, rows):
+        delay = RETRY_DELAY
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self._write(rows)
+                return
+            except sqlite3.Error:
+                if attempt == WRITE_ATTEMPTS:
+                    log.exception("dropping %d responses after %d failed writes to %s",
+                                  len(rows), attempt, self.path)
+                    return
+                log.warning("write to %s failed, retrying", self.path, exc_info=True)
+                time.sleep(delay)
+                delay *= 2
+
+    def _write(self, rows):
+        with self._conn:
+            # One statement per row, so rows ignored as repeat submissions of
+            # a stored session are left out of the aggregates.
+            stored = []
+            for row in rows:
+                ts, sid, version, orders, answers, total, comp, sub = row
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO responses (submitted_at, session_id, bank_version, orders, "
+                    "answers, total, comp_scores, sub_scores) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        ts,
+                        sid,
+                        version,
+                        json.dumps(orders) if orders is not None else None,
+                        json.dumps(answers, ensure_ascii=False),
+                        total,
+                        json.dumps(comp, ensure_ascii=False),
+                        json.dumps(sub, ensure_ascii=False),
+                    ),
+                )
+                if cur.rowcount:
+                    stored.append(row)
+            if not stored:
+                return
+            _apply_increments(self._conn, *_aggregate_increments([(r[2],) + r[4:] for r in stored]))
+            sketches = self._updated_sketches(r[5:] for r in stored)
+            self._save_sketches(sketches, self.writer_id)
+        # Only once committed, so a failed (and retried) batch is not counted twice.
+        self._sketches.update(sketches)
+
+    def _updated_sketches(self, results):
+        """Copies of this writer's sketches for the metrics in ``results``,
+        updated with them."""
+        updated = {}
+        for total, comp_scores, sub_scores in results:
+            for metric, value in result_metrics(total, comp_scores, sub_scores).items():
+                sketch = updated.get(metric)
+                if sketch is None:
+                    current = self._sketches.get(metric)
+                    sketch = KLLSketch.from_bytes(current.to_bytes()) if current else KLLSketch()
+                    updated[metric] = sketch
+                sketch.update(value)
+        return updated
+
+    def _save_sketches(self, sketches, writer):
+        self._conn.executemany(
+            "INSERT INTO metric_sketches (metric, writer, sketch) VALUES (?, ?, ?) "
+            "ON CONFLICT(metric, writer) DO UPDATE SET sketch = excluded.sketch",
+            [(m, writer, sketch.to_bytes()) for m, sketch in sketches.items()],
+        )
+
+    def _fold_sketches(self):
+        """Merge this writer's sketches into the compacted row and delete its own."""
+        if not self._sketches:
+            return
+        with self._conn:
+            # Take the write lock before reading, so two writers closing at
+            # once cannot both fold into the same old compacted row.
+            self._conn.execute("BEGIN IMMEDIATE")
+            compacted = dict(self._conn.execute(
+                "SELECT metric, sketch FROM metric_sketches WHERE writer = ?", (COMPACTED_WRITER,)
+            ))
+            merged = {}
+            for metric, sketch in self._sketches.items():
+                base = KLLSketch.from_bytes(compacted[metric]) if metric in compacted else KLLSketch(sketch.k)
+                merged[metric] = base.merge(sketch)
+            self._save_sketches(merged, COMPACTED_WRITER)
+            self._conn.execute("DELETE FROM metric_sketches WHERE writer = ?", (self.writer_id,))
+        self._sketches = {}
+
+    def _ensure_unique_sessions(self):
+        """Index session ids as unique. Databases from before submissions
+        were deduplicated keep each session's first response; the rest are
+        deleted and the aggregates rebuilt."""
+        if self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'responses_session'"
+        ).fetchone():
+            return
+        with self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE session_id IS NOT NULL AND id NOT IN "
+                "(SELECT MIN(id) FROM responses WHERE session_id IS NOT NULL GROUP BY session_id)"
+            ).rowcount
+            self._conn.execute(
+                "CREATE UNIQUE INDEX responses_session ON responses (session_id) WHERE session_id IS NOT NULL"
+            )
+            if removed:
+                self._conn.execute("DELETE FROM metric_aggregates")
+
+    def _ensure_versioned_answer_counts(self):
+        """Databases from before answer counts were kept per bank version
+        get the new table, refilled by the aggregate rebuild."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(answer_counts)")}
+        if "bank_version" in columns:
+            return
+        with self._conn:
+            self._conn.execute("DROP TABLE answer_counts")
+            self._conn.execute("DELETE FROM metric_aggregates")
+        self._conn.executescript(SCHEMA)
+
+    def _needs_backfill(self):
+        has_rows = self._conn.execute("SELECT 1 FROM responses LIMIT 1").fetchone()
+        has_aggs = self._conn.execute("SELECT 1 FROM metric_aggregates LIMIT 1").fetchone()
+        # Databases from before sketches were kept have aggregates but no sketches.
+        has_sketches = self._conn.execute("SELECT 1 FROM metric_sketches LIMIT 1").fetchone()
+        return bool(has_rows) and not (has_aggs and has_sketches)
+
+    def rebuild_aggregates(self):
+        """Recompute every aggregate from the raw responses (one full scan).
+
+        The sketches of every writer are replaced by one compacted sketch of
+        all rows, so run this while no other process is writing to the
+        database.
+        """
+        with self._conn:
+            for table in ("metric_aggregates", "metric_histogram", "answer_counts", "metric_sketches"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._sketches = {}
+            batch = []
+            for rec in self.iter_responses():
+                batch.append(
+                    (rec["bank_version"], rec["answers"], rec["total"], rec["comp_scores"], rec["sub_scores"])
+                )
+                if len(batch) >= 10_000:
+                    _apply_increments(self._conn, *_aggregate_increments(batch))
+                    self._sketches.update(self._updated_sketches(r[2:] for r in batch))
+                    batch = []
+            if batch:
+                _apply_increments(self._conn, *_aggregate_increments(batch))
+                self._sketches.update(self._updated_sketches(r[2:] for r in batch))
+            self._save_sketches(self._sketches, COMPACTED_WRITER)
+            # This writer's own sketches start again from empty.
+            self._sketches = {}
+
+    def read_aggregates(self):
+        """Return the precomputed aggregates.
+
+        ``{"metrics": {metric: (count, mean, sd)}, "histograms": {metric:
+        {bin: count}}, "sketches": {metric: KLLSketch}, "answers":
+        {bank_version: {answer_key: {value: count}}}}``, with answer values
+        decoded from their stored JSON, ``None`` as the version of responses
+        from before versioning, and each metric's sketches merged across
+        writers.
+        """
+        with self._read_lock:
+            conn = self._read_conn
+            metrics = {}
+            for metric, count, total, sum_sq in conn.execute(
+                "SELECT metric, count, sum, sum_sq FROM metric_aggregates"
+            ):
+                mean = total / count
+                var = max(0.0, sum_sq / count - mean * mean)
+                metrics[metric] = (count, mean, var ** 0.5)
+            histograms = {}
+            for metric, b, count in conn.execute("SELECT metric, bin, count FROM metric_histogram"):
+                histograms.setdefault(metric, {})[b] = count
+            sketches = {}
+            for metric, blob in conn.execute("SELECT metric, sketch FROM metric_sketches"):
+                sketch = KLLSketch.from_bytes(blob)
+                if metric in sketches:
+                    sketches[metric].merge(sketch)
+                else:
+                    sketches[metric] = sketch
+            answers = {}
+            for version, key, value, count in conn.execute(
+                "SELECT bank_version, answer_key, value, count FROM answer_counts"
+            ):
+                answers.setdefault(version or None, {}).setdefault(key, {})[json.loads(value)] = count
+        return {"metrics": metrics, "histograms": histograms, "sketches": sketches, "answers": answers}
+
+    def iter_responses(self, batch_size=10_000):
+        """Yield stored submissions as dicts, oldest first."""
+        conn = connect(self.path)
+        try:
+            cur = conn.execute(
+                "SELECT id, submitted_at, session_id, bank_version, orders, answers, total, comp_scores, "
+                "sub_scores FROM responses ORDER BY id"
+            )
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                for rid, ts, sid, version, orders, answers, total, comp, sub in rows:
+                    yield {
+                        "id": rid,
+                        "submitted_at": ts,
+                        "session_id": sid,
+                        "bank_version": version,
+                        "orders": json.loads(orders) if orders else None,
+                        "answers": json.loads(answers),
+                        "total": total,
+                        "comp_scores": json.loads(comp),
+                        "sub_scores": json.loads(sub),
+                    }
+        finally:
+            conn.close()
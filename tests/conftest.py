@@ -0,0 +1,17 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def raw_banks():
+    """A fresh, editable copy of the shipped bank content."""
+    import banks
+
+    with open(banks.DEFAULT_BANKS_PATH, encoding="utf-8") as fh:
+        return json.load(fh)
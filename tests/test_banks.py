@@ -0,0 +1,71 @@
+import json
+
+import banks
+
+
+def test_shipped_content_is_valid(raw_banks):
+    assert banks.validate_banks(raw_banks) == []
+
+
+def test_renamed_component_is_rejected(raw_banks):
+    raw_banks["components"][0] = "Mindset"
+    raw_banks["component_weights"]["Mindset"] = raw_banks["component_weights"].pop("Entrepreneurial Mindset")
+    assert any(e.startswith("components:") for e in banks.validate_banks(raw_banks))
+
+
+def test_reordered_components_are_rejected(raw_banks):
+    raw_banks["components"].reverse()
+    assert any(e.startswith("components:") for e in banks.validate_banks(raw_banks))
+
+
+def test_missing_scored_mindset_subdim_is_rejected(raw_banks):
+    del raw_banks["mindset_subdims"]["Execution Bias"]
+    for q in raw_banks["mindset_questions"].values():
+        if q["subdim"] == "Execution Bias":
+            q["subdim"] = "Resourcefulness"
+    errors = banks.validate_banks(raw_banks)
+    assert any("Execution Bias" in e for e in errors)
+
+
+def test_resource_subdim_without_level_key_is_rejected(raw_banks):
+    raw_banks["resource_subdims"]["Equipment"] = "Physical kit."
+    assert any(e.startswith("resource_subdims:") for e in banks.validate_banks(raw_banks))
+
+
+def test_dropped_time_or_support_is_rejected(raw_banks):
+    for sd in banks.DERIVED_RESOURCE_SUBDIMS:
+        raw = {**raw_banks, "resource_subdims": dict(raw_banks["resource_subdims"])}
+        del raw["resource_subdims"][sd]
+        assert any(e.startswith("resource_subdims:") for e in banks.validate_banks(raw))
+
+
+def test_question_with_too_many_options_is_rejected(raw_banks):
+    q = next(iter(raw_banks["mindset_questions"].values()))
+    q["options"] = [f"o{i}" for i in range(banks.MAX_QUESTION_OPTIONS + 1)]
+    q["scores"] = [1] * len(q["options"])
+    assert any("more than" in e for e in banks.validate_banks(raw_banks))
+
+
+def test_reload_keeps_current_bank_on_bad_edit(raw_banks, tmp_path, monkeypatch):
+    current = banks.current_bank()
+    raw_banks["components"][0] = "Mindset"
+    path = tmp_path / "banks.json"
+    path.write_text(json.dumps(raw_banks), encoding="utf-8")
+    monkeypatch.setattr(banks, "_file_sig", None)
+    banks._reload_if_changed(str(path))
+    assert banks.current_bank() is current
+
+
+def test_reload_keeps_current_bank_if_scoring_fails(raw_banks, tmp_path, monkeypatch):
+    current = banks.current_bank()
+    raw_banks["version"] = "unscorable"
+    path = tmp_path / "banks.json"
+    path.write_text(json.dumps(raw_banks), encoding="utf-8")
+    monkeypatch.setattr(banks, "_file_sig", None)
+
+    def fail(bank):
+        raise KeyError("Entrepreneurial Mindset")
+
+    monkeypatch.setattr(banks, "_check_scorable", fail)
+    banks._reload_if_changed(str(path))
+    assert banks.current_bank() is current
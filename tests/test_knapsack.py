@@ -0,0 +1,47 @@
+import random
+from itertools import combinations
+
+import pytest
+
+import banks
+from knapsack import efficiency_frontier
+
+
+def brute_force_best(costs, points, budget):
+    """Most points for each total-cost cap from 0 to ``budget``."""
+    best = [0] * (budget + 1)
+    for r in range(len(costs) + 1):
+        for chosen in combinations(range(len(costs)), r):
+            cost = sum(costs[i] for i in chosen)
+            if cost <= budget:
+                value = sum(points[i] for i in chosen)
+                for cap in range(cost, budget + 1):
+                    best[cap] = max(best[cap], value)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_frontier_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    n = rnd.randint(1, 10)
+    scale = rnd.choice([1, 1, 5])
+    costs = [scale * rnd.randint(1, 8) for _ in range(n)]
+    points = [rnd.randint(0, 9) for _ in range(n)]
+    budget = scale * rnd.randint(1, 30)
+    frontier = efficiency_frontier(costs, points, budget)
+    best = brute_force_best(costs, points, budget)
+
+    assert frontier[0] == (0, 0, ())
+    assert frontier[-1][1] == best[budget]
+    for (cost, value, chosen), nxt in zip(frontier, frontier[1:] + [(budget + 1,)]):
+        assert sum(costs[i] for i in chosen) <= cost
+        assert sum(points[i] for i in chosen) == value
+        # Each entry is the optimum for every cap up to the next entry.
+        assert all(best[cap] == value for cap in range(cost, nxt[0]))
+
+
+def test_shipped_bank_optimum():
+    costs = [f["cost"] for f in banks.VALUE_FEATURES]
+    points = [f["ideal_points"] for f in banks.VALUE_FEATURES]
+    best = brute_force_best(costs, points, banks.FEATURE_BUDGET)
+    assert banks.VALUE_MAX_POINTS == best[banks.FEATURE_BUDGET]
@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+import order_effects
+import store
+
+
+def test_store_without_orders_column_is_rejected(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE responses (id INTEGER PRIMARY KEY, bank_version TEXT, answers TEXT)")
+    conn.close()
+    with pytest.raises(ValueError, match="not a response store"):
+        order_effects.load_choices(path)
+
+
+def test_non_store_file_is_rejected(tmp_path):
+    path = tmp_path / "notes.sqlite3"
+    path.write_text("not a database\n" * 100)
+    with pytest.raises(ValueError, match="not a response store"):
+        order_effects.load_choices(str(path))
+
+
+def test_main_exits_with_message(tmp_path):
+    path = tmp_path / "notes.sqlite3"
+    path.write_text("not a database\n" * 100)
+    with pytest.raises(SystemExit) as exc:
+        order_effects.main([str(path)])
+    assert "not a response store" in str(exc.value.code)
+
+
+def test_load_choices_reads_recorded_orders(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    qid = next(iter(order_effects.QUESTIONS))
+    s = store.ResponseStore(path)
+    s.submit(
+        {f"{qid}_choice": 1},
+        (50.0, {}, {}),
+        session_id="a",
+        bank_version=order_effects.BANK.VERSION,
+        orders={qid: 3},
+    )
+    s.close()
+    choices, ranks = order_effects.load_choices(path)[qid]
+    assert choices.tolist() == [1]
+    assert ranks.tolist() == [3]
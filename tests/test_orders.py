@@ -0,0 +1,44 @@
+import random
+from itertools import permutations
+from math import factorial
+
+import numpy as np
+import pytest
+
+from orders import perm_rank, perm_unrank, session_order, unrank_many
+
+
+@pytest.mark.parametrize("n", range(1, 6))
+def test_rank_is_a_bijection(n):
+    ranks = [perm_rank(list(p)) for p in permutations(range(n))]
+    assert sorted(ranks) == list(range(factorial(n)))
+    for p in permutations(range(n)):
+        assert perm_unrank(perm_rank(list(p)), n) == list(p)
+
+
+def test_round_trip_large_orders():
+    rnd = random.Random(5)
+    for n in (8, 13, 20):
+        for _ in range(50):
+            order = list(range(n))
+            rnd.shuffle(order)
+            assert perm_unrank(perm_rank(order), n) == order
+
+
+@pytest.mark.parametrize("n", [1, 4, 7, 20])
+def test_unrank_many_matches_perm_unrank(n):
+    rnd = random.Random(n)
+    ranks = [rnd.randrange(factorial(n)) for _ in range(200)] + [0, factorial(n) - 1]
+    expected = np.array([perm_unrank(r, n) for r in ranks])
+    assert (unrank_many(ranks, n) == expected).all()
+
+
+def test_unrank_many_rejects_more_than_20_options():
+    with pytest.raises(ValueError):
+        unrank_many([0], 21)
+
+
+def test_session_order_is_reproducible():
+    order = session_order("abc", "ms_res_1", 4)
+    assert order == session_order("abc", "ms_res_1", 4)
+    assert sorted(order) == [0, 1, 2, 3]
@@ -0,0 +1,78 @@
+import math
+import random
+
+import pandas as pd
+import pytest
+
+import banks
+from cohort import row_to_result, score_frame
+from scoring import IncrementalScorer, compute_overall_scores
+
+
+def random_answers(rnd, partial=False):
+    """A plausible session's answers; ``partial`` leaves some unanswered."""
+    answers = {}
+    for item in banks.OPP_SCENARIOS + banks.VALUE_FEATURES:
+        if rnd.random() < 0.5:
+            answers[item["key"]] = rnd.random() < 0.5
+    for questions in (banks.MINDSET_QUESTIONS, banks.SKILL_QUESTIONS, banks.ACUMEN_QUESTIONS):
+        for qid, q in questions.items():
+            if not partial or rnd.random() < 0.8:
+                answers[f"{qid}_choice"] = rnd.randrange(len(q["options"]))
+    for key in list(banks.SKILL_SLIDER_MAP.values()) + list(banks.RESOURCE_LEVEL_KEYS.values()):
+        if not partial or rnd.random() < 0.8:
+            answers[key] = rnd.randint(1, 5)
+    answers["res_time_pattern"] = rnd.choice([None, *banks.TIME_PATTERN_SCORES])
+    answers["sup_reaction"] = rnd.choice([None, *banks.SUPPORT_REACTION_SCORES])
+    for key in banks.SUPPORT_KEYS:
+        answers[key] = rnd.random() < 0.5
+    return answers
+
+
+def assert_same_result(got, want):
+    total, comp, sub = got
+    assert total == pytest.approx(want[0], abs=1e-9)
+    assert comp == pytest.approx(want[1], abs=1e-9)
+    assert sub.keys() == want[2].keys()
+    for group in sub:
+        assert sub[group] == pytest.approx(want[2][group], abs=1e-9)
+
+
+@pytest.mark.parametrize("partial", [False, True])
+def test_score_frame_matches_compute_overall_scores(partial):
+    rnd = random.Random(7)
+    cohort = [random_answers(rnd, partial) for _ in range(300)]
+    # Unanswered keys become NaN (numbers) or None (labels) in the frame.
+    scored = score_frame(pd.DataFrame.from_records(cohort))
+    for answers, (_, row) in zip(cohort, scored.iterrows()):
+        assert_same_result(row_to_result(row), compute_overall_scores(answers))
+
+
+def test_score_frame_treats_blank_answers_as_unanswered():
+    rnd = random.Random(3)
+    answers = random_answers(rnd)
+    blank = dict(answers, res_time_pattern="", sup_reaction="")
+    blank[next(iter(banks.SKILL_SLIDER_MAP.values()))] = math.nan
+    blank[f"{next(iter(banks.MINDSET_QUESTIONS))}_choice"] = math.nan
+    unanswered = {
+        k: v for k, v in blank.items()
+        if v != "" and not (isinstance(v, float) and math.isnan(v))
+    }
+    row = score_frame(pd.DataFrame.from_records([blank])).iloc[0]
+    assert_same_result(row_to_result(row), compute_overall_scores(unanswered))
+
+
+def test_incremental_scorer_matches_full_recompute():
+    rnd = random.Random(11)
+    answers = random_answers(rnd, partial=True)
+    scorer = IncrementalScorer(answers)
+    fresh = random_answers(rnd)
+    keys = sorted(set(answers) | set(fresh))
+    for _ in range(200):
+        key = rnd.choice(keys)
+        if key in fresh and rnd.random() < 0.9:
+            answers[key] = random_answers(rnd).get(key, fresh[key])
+        else:
+            answers.pop(key, None)
+        scorer.update(key)
+        assert scorer.result() == compute_overall_scores(answers)
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+
+import simulate
+
+
+@pytest.mark.parametrize("name", list(simulate.PROFILES))
+def test_sampled_features_fill_the_budget_greedily(name):
+    rng = np.random.default_rng(0)
+    # Every feature wanted: the only reason to leave one out is the budget.
+    profile = dict(simulate.PROFILES[name], feature_rate=1.0)
+    chosen = simulate._sample_features(rng, profile, 2000)
+    spent = chosen @ simulate._FEATURE_COST
+    assert (spent <= simulate.FEATURE_BUDGET).all()
+    cheapest_left_out = np.where(chosen, np.inf, simulate._FEATURE_COST).min(axis=1)
+    assert (cheapest_left_out > simulate.FEATURE_BUDGET - spent).all()
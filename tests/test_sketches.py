@@ -0,0 +1,72 @@
+import random
+from bisect import bisect_right
+
+import pytest
+
+from sketches import KLLSketch
+
+# With k = 200 ranks are typically within half a percentile; allow a margin
+# so the randomised compaction does not make these tests flaky.
+RANK_TOLERANCE = 0.02
+
+
+def max_rank_error(sketch, values):
+    values = sorted(values)
+    probes = values[:: max(1, len(values) // 200)]
+    return max(abs(sketch.rank(v) - bisect_right(values, v) / len(values)) for v in probes)
+
+
+def filled(values):
+    sketch = KLLSketch()
+    for v in values:
+        sketch.update(v)
+    return sketch
+
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+    assert sketch.rank(1.0) is None
+    assert sketch.quantiles([0.5]) == [None]
+
+
+def test_rank_error_is_bounded():
+    rnd = random.Random(1)
+    values = [rnd.gauss(60, 15) for _ in range(50_000)]
+    sketch = filled(values)
+    assert sketch.count == len(values)
+    assert sum(len(level) for level in sketch.levels) < 3 * sketch.k + len(sketch.levels)
+    assert max_rank_error(sketch, values) < RANK_TOLERANCE
+
+
+def test_merged_sketch_matches_union():
+    rnd = random.Random(2)
+    parts = [[rnd.uniform(0, 100) + 10 * i for _ in range(rnd.randint(1, 20_000))] for i in range(5)]
+    merged = KLLSketch()
+    for part in parts:
+        merged.merge(filled(part))
+    union = [v for part in parts for v in part]
+    assert merged.count == len(union)
+    assert max_rank_error(merged, union) < RANK_TOLERANCE
+
+
+def test_serialization_round_trip():
+    rnd = random.Random(3)
+    values = [rnd.expovariate(0.1) for _ in range(20_000)]
+    sketch = filled(values)
+    restored = KLLSketch.from_bytes(sketch.to_bytes())
+    assert restored.count == sketch.count
+    assert restored.levels == sketch.levels
+    assert restored.cumulative() == sketch.cumulative()
+    assert max_rank_error(restored, values) < RANK_TOLERANCE
+    # A restored sketch keeps accepting updates and merges.
+    restored.merge(filled(values))
+    restored.update(1.0)
+    assert restored.count == 2 * len(values) + 1
+
+
+def test_quantiles_are_monotone():
+    rnd = random.Random(4)
+    sketch = filled(rnd.random() for _ in range(10_000))
+    qs = sketch.quantiles([0.0, 0.1, 0.5, 0.9, 1.0])
+    assert qs == sorted(qs)
+    assert qs[2] == pytest.approx(0.5, abs=RANK_TOLERANCE)
@@ -0,0 +1,114 @@
+import json
+import sqlite3
+from collections import Counter
+
+import pytest
+
+import store
+
+
+def result(total, mindset=3.0):
+    return total, {"Entrepreneurial Mindset": mindset}, {"mindset": {"Resourcefulness": mindset}}
+
+
+@pytest.fixture
+def response_store(tmp_path):
+    s = store.ResponseStore(str(tmp_path / "responses.sqlite3"))
+    yield s
+    s.close()
+
+
+def test_answer_counts_are_kept_per_bank_version(response_store):
+    response_store.submit({"q_choice": 0}, result(50.0), session_id="a", bank_version="v1")
+    response_store.submit({"q_choice": 0}, result(60.0), session_id="b", bank_version="v2")
+    response_store.submit({"q_choice": 1}, result(70.0), session_id="c", bank_version="v2")
+    response_store.submit({"q_choice": 1}, result(80.0), session_id="d")
+    response_store.flush()
+    answers = response_store.read_aggregates()["answers"]
+    assert answers == {
+        "v1": {"q_choice": {0: 1}},
+        "v2": {"q_choice": {0: 1, 1: 1}},
+        None: {"q_choice": {1: 1}},
+    }
+
+
+def test_unversioned_answer_counts_are_migrated(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript(store.SCHEMA.replace(
+        "bank_version TEXT NOT NULL,  -- '' for responses from before versioning\n", ""
+    ).replace("PRIMARY KEY (bank_version, answer_key, value)", "PRIMARY KEY (answer_key, value)"))
+    conn.execute(
+        "INSERT INTO responses (submitted_at, session_id, bank_version, answers, total, comp_scores, sub_scores) "
+        "VALUES (0, 's', 'v1', ?, 55.0, ?, ?)",
+        (json.dumps({"q_choice": 2}), json.dumps(result(55.0)[1]), json.dumps(result(55.0)[2])),
+    )
+    conn.execute("INSERT INTO answer_counts VALUES ('q_choice', '2', 1)")
+    conn.execute("INSERT INTO metric_aggregates VALUES ('total', 1, 55.0, 3025.0)")
+    conn.commit()
+    conn.close()
+
+    s = store.ResponseStore(path)
+    try:
+        aggregates = s.read_aggregates()
+    finally:
+        s.close()
+    assert aggregates["answers"] == {"v1": {"q_choice": {2: 1}}}
+    assert aggregates["metrics"]["total"][0] == 1
+
+
+def test_submit_after_close_raises(tmp_path):
+    s = store.ResponseStore(str(tmp_path / "responses.sqlite3"))
+    s.close()
+    with pytest.raises(store.StoreClosed):
+        s.submit({}, result(50.0), session_id="late")
+
+
+def test_resubmitted_session_is_stored_once(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    s = store.ResponseStore(path)
+    s.submit({"q_choice": 0}, result(50.0), session_id="a", bank_version="v1")
+    s.submit({"q_choice": 1}, result(90.0), session_id="a", bank_version="v1")
+    s.flush()
+    # A second writer (another process) retrying the same session.
+    other = store.ResponseStore(path)
+    other.submit({"q_choice": 1}, result(90.0), session_id="a", bank_version="v1")
+    other.close()
+    s.submit({"q_choice": 1}, result(70.0), session_id=None)
+    s.submit({"q_choice": 1}, result(70.0), session_id=None)
+    s.flush()
+
+    responses = list(s.iter_responses())
+    assert [r["total"] for r in responses] == [50.0, 70.0, 70.0]
+    aggregates = s.read_aggregates()
+    s.close()
+    assert aggregates["metrics"]["total"][0] == 3
+    assert aggregates["answers"] == {"v1": {"q_choice": {0: 1}}, None: {"q_choice": {1: 2}}}
+
+
+def test_aggregate_tables_match_a_rebuild(response_store):
+    totals = [12.0, 48.5, 50.0, 77.25, 99.0, 100.0]
+    for i, total in enumerate(totals):
+        response_store.submit(
+            {"q_choice": i % 3}, result(total, 1 + i * 0.5), session_id=str(i), bank_version="v1"
+        )
+    response_store.flush()
+    live = response_store.read_aggregates()
+
+    count, mean, sd = live["metrics"]["total"]
+    assert count == len(totals)
+    assert mean == pytest.approx(sum(totals) / len(totals))
+    assert sd == pytest.approx((sum(t * t for t in totals) / len(totals) - mean * mean) ** 0.5)
+    assert sum(live["histograms"]["total"].values()) == len(totals)
+    assert live["histograms"]["total"] == Counter(store.metric_bin("total", t) for t in totals)
+    assert live["sketches"]["total"].count == len(totals)
+    assert live["sketches"]["total"].quantiles([0.0, 1.0]) == [min(totals), max(totals)]
+    assert set(live["metrics"]) == {"total", "Entrepreneurial Mindset", "mindset.Resourcefulness"}
+    assert live["answers"] == {"v1": {"q_choice": {0: 2, 1: 2, 2: 2}}}
+
+    response_store.rebuild_aggregates()
+    rebuilt = response_store.read_aggregates()
+    assert rebuilt["metrics"] == pytest.approx(live["metrics"])
+    assert rebuilt["histograms"] == live["histograms"]
+    assert rebuilt["answers"] == live["answers"]
+    assert rebuilt["sketches"]["total"].cumulative() == live["sketches"]["total"].cumulative()